@@ -0,0 +1,62 @@
+import numpy as np
+
+
+def kelly_fraction(probs, returns, iterations=40):
+    """
+    Full-Kelly stake (fraction of bankroll) for many bets with several
+    outcomes each. `probs` and `returns` are (n_bets, n_outcomes): the chance
+    of each outcome and the total amount paid back per unit staked (0 for a
+    loss). Solves d/df E[log(1 + f * (R - 1))] = 0 by bisection on all bets
+    at once; bets with no positive edge get 0.
+    """
+    probs = np.asarray(probs, dtype=float)
+    net = np.asarray(returns, dtype=float) - 1.0
+
+    # Growth is finite only while 1 + f * net > 0 for every possible outcome
+    worst = np.where(probs > 0, net, 0.0).min(axis=1)
+    hi = np.where(worst < 0, -1.0 / np.minimum(worst, -1e-12), 1.0) * (1 - 1e-9)
+    lo = np.zeros(len(probs))
+
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        slope = (probs * net / (1 + mid[:, None] * net)).sum(axis=1)
+        lo = np.where(slope > 0, mid, lo)
+        hi = np.where(slope > 0, hi, mid)
+
+    edge = (probs * net).sum(axis=1)
+    return np.where(edge > 0, lo, 0.0)
+
+
+def allocate_stakes(slips, bankroll, kelly_multiplier=0.25, max_exposure=0.2, max_slips=10,
+                    max_leg_uses=2, min_stake=1.0, max_slip_fraction=0.05):
+    """
+    Pick slips and stakes under a bankroll constraint.
+
+    Slips (score_slips output, best first) are taken greedily by fractional
+    Kelly stake, skipping any slip that would use a leg more than
+    `max_leg_uses` times. Each stake is `kelly_multiplier` x full Kelly,
+    capped at `max_slip_fraction` of the bankroll, and all stakes are scaled
+    down together if they would exceed `max_exposure` of the bankroll.
+    Stakes are rounded to cents; slips below `min_stake` are dropped.
+    """
+    slips = slips[slips['kelly'] > 0]
+    slips = slips.assign(
+        stake_fraction=np.minimum(slips['kelly'] * kelly_multiplier, max_slip_fraction)
+    ).sort_values('stake_fraction', ascending=False, kind='stable')
+
+    uses, chosen = {}, []
+    for row, legs in zip(slips.index, slips['legs']):
+        if len(chosen) >= max_slips:
+            break
+        if any(uses.get(leg, 0) >= max_leg_uses for leg in legs):
+            continue
+        chosen.append(row)
+        for leg in legs:
+            uses[leg] = uses.get(leg, 0) + 1
+
+    picked = slips.loc[chosen]
+    total = picked['stake_fraction'].sum()
+    scale = min(1.0, max_exposure / total) if total > 0 else 0.0
+    picked = picked.assign(stake=(picked['stake_fraction'] * scale * bankroll).round(2))
+    return picked[picked['stake'] >= min_stake]
+
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+from betslips.slips import hit_distribution
+
+# Simulations run in blocks, each with its own stream spawned from the seed;
+# results for a seed do not depend on the memory budget because memory
+# chunks are whole numbers of blocks
+BLOCK_SIMS = 2 ** 14
+
+
+def _leg_arrays(legs, game_corr, league_k_pct):
+    """Per-leg latent thresholds, loadings and game codes, as flat arrays."""
+    from scipy import stats
+    n_legs = len(legs)
+    loading = legs['loading'].to_numpy(dtype=float) if 'loading' in legs.columns else np.ones(n_legs)
+    weight = np.clip(loading * np.sqrt(game_corr), -1.0, 1.0)
+
+    # Legs with no game id are their own game
+    own_game = np.array([f"leg-{i}" for i in range(n_legs)], dtype=object)
+    if 'game' in legs.columns:
+        games = np.where(legs['game'].isna().to_numpy(), own_game, legs['game'].to_numpy(dtype=object))
+    else:
+        games = own_game
+    game_codes, game_ids = pd.factorize(games)
+
+    # Environment shift, in latent standard deviations, for legs whose
+    # probability was not built from opponent K% and park factor
+    shift = np.zeros(n_legs)
+    if {'env_adjusted', 'opponent_k_pct', 'park_factor_K', 'k_pred_mean', 'k_pred_std'} <= set(legs.columns):
+        opp = legs['opponent_k_pct'].to_numpy(dtype=float)
+        league = league_k_pct if league_k_pct is not None else np.nanmean(opp)
+        log_env = np.log(opp / league) + np.log(legs['park_factor_K'].to_numpy(dtype=float))
+        in_sds = log_env * legs['k_pred_mean'].to_numpy(dtype=float) / legs['k_pred_std'].to_numpy(dtype=float)
+        shift = np.where(legs['env_adjusted'].to_numpy(dtype=bool), 0.0, np.nan_to_num(in_sds)) * loading
+
+    # The latent stat is standard normal: an over wins above its (1 - p) quantile, an under below its p quantile
+    p_win = legs['p_win'].to_numpy(dtype=float)
+    over = (legs['side'] == 'over').to_numpy()
+    threshold = np.where(over, stats.norm.ppf(1 - p_win), stats.norm.ppf(p_win))
+    return {
+        'weight': weight, 'noise': np.sqrt(1 - weight ** 2), 'shift': shift,
+        'threshold': threshold, 'over': over, 'game': game_codes, 'n_games': len(game_ids),
+    }
+
+
+def _simulate_hits(params, rng, n_sims):
+    """(n_sims, n_legs) bool: did each leg win in each simulated slate."""
+    z = rng.standard_normal((n_sims, params['n_games']))
+    latent = rng.standard_normal((n_sims, len(params['weight'])))
+    latent *= params['noise']
+    latent += z[:, params['game']] * params['weight'] + params['shift']
+    return np.where(params['over'], latent > params['threshold'], latent < params['threshold'])
+
+
+def simulate_hit_distribution(legs, slips, n_sims=1_000_000, seed=0, game_corr=0.1, league_k_pct=None,
+                              memory_mb=256):
+    """
+    Monte Carlo distribution of the number of winning legs for `slips`
+    (int array (n_slips, n_legs) of row positions in `legs`), with legs from
+    the same game correlated through a shared game factor.
+
+    Every leg has a standard normal latent stat. Legs of one game share a
+    factor z with weight loading * sqrt(game_corr): loading defaults to 1
+    and is negative for props that move against strikeouts, such as hits.
+    Thresholds come from each leg's p_win, so alone every leg still wins
+    with its own probability. Legs flagged env_adjusted=False also move
+    with their game's opponent_k_pct (relative to `league_k_pct`, default
+    the slate average) and park_factor_K, scaled by k_pred_mean /
+    k_pred_std, for props whose model never saw them.
+    `legs` needs p_win and side (legs_from_slate); optional columns are
+    game, loading, env_adjusted, opponent_k_pct, park_factor_K,
+    k_pred_mean and k_pred_std.
+    """
+    slips = np.asarray(slips)
+    return simulate_hit_distributions(
+        legs, {slips.shape[1]: slips}, n_sims, seed, game_corr, league_k_pct, memory_mb
+    )[slips.shape[1]]
+
+
+def simulate_hit_distributions(legs, candidates, n_sims=1_000_000, seed=0, game_corr=0.1, league_k_pct=None,
+                               memory_mb=256):
+    """
+    simulate_hit_distribution for every slip size of `candidates`
+    ({n_legs: int array (n_slips, n_legs)}, as from candidate_slips) in one
+    pass: each block of BLOCK_SIMS leg outcomes is drawn once, from its own
+    stream spawned from `seed`, and scored for all sizes.
+
+    Hits are counted one leg position at a time into an int8 accumulator per
+    slice of slips, so memory stays near `memory_mb` however many
+    simulations or slips are asked for. Results for a seed do not depend on
+    the memory budget or on which other sizes are scored alongside.
+    """
+    params = _leg_arrays(legs, game_corr, league_k_pct)
+    candidates = {n_legs: np.asarray(idx) for n_legs, idx in candidates.items()}
+    counts = {n_legs: np.zeros((len(idx), n_legs + 1), dtype=np.int64) for n_legs, idx in candidates.items()}
+
+    # Per slip and simulation: the int8 accumulator, one gathered leg column and one comparison
+    slice_size = max(1, memory_mb * 2 ** 20 // (3 * BLOCK_SIMS))
+    n_blocks = -(-n_sims // BLOCK_SIMS)
+    streams = np.random.SeedSequence(seed).spawn(n_blocks)
+    wins = np.empty((min(slice_size, max(map(len, candidates.values()), default=0)), BLOCK_SIMS), np.int8)
+
+    for block, stream in enumerate(streams):
+        block_sims = min(BLOCK_SIMS, n_sims - block * BLOCK_SIMS)
+        # Leg-major, so gathering a leg for a slice of slips reads whole rows
+        hits = np.ascontiguousarray(_simulate_hits(params, np.random.default_rng(stream), block_sims).T)
+        for n_legs, idx in candidates.items():
+            for lo in range(0, len(idx), slice_size):
+                part = idx[lo:lo + slice_size]
+                acc = wins[:len(part), :block_sims]
+                acc[:] = 0
+                for j in range(n_legs):
+                    acc += hits[part[:, j]]
+                for k in range(n_legs + 1):
+                    counts[n_legs][lo:lo + len(part), k] += np.count_nonzero(acc == k, axis=1)
+
+    return {n_legs: count / n_sims for n_legs, count in counts.items()}
+
+
+def same_game_hit_fn(legs, candidates, n_sims=200_000, seed=0, game_corr=0.1, league_k_pct=None,
+                     memory_mb=256):
+    """
+    hit_fn for score_slips over `candidates`: the exact independent
+    distribution for slips whose legs all come from different games, and
+    simulate_hit_distributions, run once for every size, for slips with two
+    or more legs from one game (legs' `game` column).
+    """
+    p_win = legs['p_win'].to_numpy(dtype=float)
+    if 'game' not in legs.columns or not legs['game'].dropna().duplicated().any():
+        return lambda idx: hit_distribution(p_win[idx])
+    games = _leg_arrays(legs, game_corr, league_k_pct)['game']
+
+    shared = {}
+    for n_legs, idx in candidates.items():
+        slip_games = np.sort(games[idx], axis=1)
+        shared[n_legs] = (slip_games[:, 1:] == slip_games[:, :-1]).any(axis=1)
+    simulated = simulate_hit_distributions(
+        legs, {n_legs: candidates[n_legs][mask] for n_legs, mask in shared.items() if mask.any()},
+        n_sims, seed, game_corr, league_k_pct, memory_mb,
+    )
+
+    def hit_fn(idx):
+        dist = hit_distribution(p_win[idx])
+        n_legs = idx.shape[1]
+        if n_legs in simulated:
+            dist[shared[n_legs]] = simulated[n_legs]
+        return dist
+    return hit_fn
@@ -0,0 +1,144 @@
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from bankroll.kelly import kelly_fraction
+
+# Entry multiplier by number of legs and number of winning legs. Standard
+# entries pay only when every leg wins; flex entries also pay near-misses.
+STANDARD_PAYOUTS = {
+    2: {2: 3.0},
+    3: {3: 6.0},
+    4: {4: 10.0},
+    5: {5: 20.0},
+    6: {6: 37.5},
+}
+FLEX_PAYOUTS = {
+    3: {3: 3.25, 2: 1.09},
+    4: {4: 6.0, 3: 1.5},
+    5: {5: 10.0, 4: 2.5},
+    6: {6: 25.0, 5: 2.6, 4: 0.25},
+}
+ENTRY_TYPES = {'standard': STANDARD_PAYOUTS, 'flex': FLEX_PAYOUTS}
+
+
+def legs_from_slate(priced, key_col='player', game_col='match_id'):
+    """
+    One candidate leg per line: the side with the better edge, its win
+    probability and Underdog's per-leg payout multiplier (1.0 when the
+    lines file has none). `priced` is a slate with p_over and p_under that
+    also carries the over/under_payout_multiplier columns from
+    parse_strikeout_lines. When it has `game_col`, legs get a `game`
+    column for same_game_hit_fn.
+    """
+    over_mult = priced.get('over_payout_multiplier', pd.Series(1.0, index=priced.index)).fillna(1.0)
+    under_mult = priced.get('under_payout_multiplier', pd.Series(1.0, index=priced.index)).fillna(1.0)
+    over = priced['p_over'] * over_mult >= priced['p_under'] * under_mult
+    legs = pd.DataFrame({
+        key_col: priced[key_col],
+        'k_line': priced['k_line'],
+        'side': np.where(over, 'over', 'under'),
+        'p_win': np.where(over, priced['p_over'], priced['p_under']),
+        'multiplier': np.where(over, over_mult, under_mult),
+    })
+    if game_col in priced.columns:
+        legs['game'] = priced[game_col]
+    # Underdog allows one pick per player per entry
+    legs = legs.sort_values('p_win', ascending=False, kind='stable').drop_duplicates(key_col)
+    return legs.reset_index(drop=True)
+
+
+def hit_distribution(p):
+    """
+    Exact distribution of the number of winning legs for many slips at once.
+    `p` is (n_slips, n_legs) with independent leg win probabilities; the
+    result is (n_slips, n_legs + 1). The Poisson-binomial convolution runs
+    one leg at a time across every slip, so the cost is n_legs vector ops.
+    """
+    p = np.asarray(p, dtype=float)
+    dist = np.zeros((p.shape[0], p.shape[1] + 1))
+    dist[:, 0] = 1.0
+    for j in range(p.shape[1]):
+        q = p[:, j:j + 1]
+        dist[:, 1:j + 2] = dist[:, 1:j + 2] * (1 - q) + dist[:, :j + 1] * q
+        dist[:, 0] *= 1 - q[:, 0]
+    return dist
+
+
+def payout_table(n_legs, entry='standard'):
+    """Entry multiplier for 0..n_legs winning legs."""
+    table = np.zeros(n_legs + 1)
+    for hits, multiplier in ENTRY_TYPES[entry].get(n_legs, {}).items():
+        table[hits] = multiplier
+    return table
+
+
+@lru_cache(maxsize=32)
+def _combinations(n, k):
+    combos = np.fromiter((i for combo in combinations(range(n), k) for i in combo), dtype=np.int32)
+    combos = combos.reshape(-1, k)
+    combos.flags.writeable = False
+    return combos
+
+
+def candidate_slips(legs, sizes=(2, 3, 4, 5, 6), pool=24):
+    """
+    Leg index combinations to evaluate: every combination of `sizes` legs
+    drawn from the `pool` legs with the largest edge (p_win * multiplier).
+    Returns {n_legs: int array (n_slips, n_legs)} of row positions in `legs`.
+    """
+    edge = (legs['p_win'] * legs['multiplier']).to_numpy()
+    top = np.sort(np.argsort(-edge, kind='stable')[:pool])
+    candidates = {}
+    for n_legs in sizes:
+        if n_legs <= len(top):
+            candidates[n_legs] = top[_combinations(len(top), n_legs)]
+    return candidates
+
+
+def score_slips(legs, candidates, entry='standard', min_ev=0.0, hit_fn=None):
+    """
+    Exact hit distribution, expected value (per unit staked) and full-Kelly
+    stake of every candidate slip, keeping those with ev > `min_ev`. Returns
+    one row per slip: leg positions ('legs'), n_legs, p_all (every leg
+    wins), ev and kelly, best ev first.
+
+    Legs are treated as independent unless `hit_fn(idx)` is given to supply
+    the (n_slips, n_legs + 1) hit distributions instead, e.g.
+    simulate_hit_distribution for same-game slips.
+    """
+    p_win = legs['p_win'].to_numpy(dtype=float)
+    multiplier = legs['multiplier'].to_numpy(dtype=float)
+
+    frames = []
+    for n_legs, idx in candidates.items():
+        table = payout_table(n_legs, entry)
+        if not table.any():
+            continue
+        dist = hit_distribution(p_win[idx]) if hit_fn is None else hit_fn(idx)
+        # Hit counts that pay the same are one outcome for staking purposes
+        levels = np.unique(table)
+        probs = np.stack([dist[:, table == level].sum(axis=1) for level in levels], axis=1)
+        # Leg multipliers scale the whole entry payout
+        returns = levels[None, :] * multiplier[idx].prod(axis=1)[:, None]
+        ev = (probs * returns).sum(axis=1) - 1.0
+        keep = ev > min_ev
+        frames.append(pd.DataFrame({
+            'legs': list(idx[keep]),
+            'n_legs': n_legs,
+            'p_all': dist[keep, -1],
+            'ev': ev[keep],
+            'kelly': kelly_fraction(probs[keep], returns[keep]),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=['legs', 'n_legs', 'p_all', 'ev', 'kelly'])
+    slips = pd.concat(frames, ignore_index=True)
+    return slips.sort_values('ev', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def describe_slips(slips, legs, key_col='player'):
+    """Human-readable legs ('Name o5.5 / Name u4.5') for a slips frame."""
+    labels = (legs[key_col] + ' ' + legs['side'].str[0] + legs['k_line'].astype(str)).to_numpy()
+    return slips['legs'].map(lambda idx: ' / '.join(labels[idx]))
@@ -0,0 +1,45 @@
+import argparse
+import time
+
+from models.backtest import (
+    historical_lines, load_backtest_frame, run_backtest, score_backtest, summarize_backtest
+)
+from props.pricing import DISTRIBUTIONS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the strikeout model against historical lines")
+    parser.add_argument("--seasons", type=int, nargs="+", required=True, help="Processed seasons, training history first")
+    parser.add_argument("--start", required=True, help="First date to predict (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last date to predict (default: last game)")
+    parser.add_argument("--step-days", type=int, default=7)
+    parser.add_argument("--retrain-every", type=int, default=4, help="Refit from scratch every N windows")
+    parser.add_argument("--warm-rounds", type=int, default=25)
+    parser.add_argument("--n-models", type=int, default=10)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--dist", choices=DISTRIBUTIONS, default="normal")
+    parser.add_argument("--min-ev", type=float, default=0.0)
+    parser.add_argument("--out", help="Write priced lines to this CSV")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    games = load_backtest_frame(args.seasons)
+    predictions = run_backtest(
+        games, args.start, args.end, step_days=args.step_days, retrain_every=args.retrain_every,
+        n_models=args.n_models, warm_rounds=args.warm_rounds, n_jobs=args.n_jobs,
+    )
+    end = args.end or predictions['game_date'].max()
+    priced = score_backtest(predictions, historical_lines(games, args.start, end), args.dist)
+    summary = summarize_backtest(priced, args.min_ev)
+
+    print(f"📊 {len(predictions)} games predicted in {predictions['fold'].nunique()} windows")
+    for key, value in summary.items():
+        print(f"   {key:>9}: {value:.3f}" if isinstance(value, float) else f"   {key:>9}: {value}")
+    print(f"⏱️ Backtest finished in {time.perf_counter() - start:.1f}s")
+
+    if args.out:
+        priced.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import time
+
+import pandas as pd
+
+from bankroll.kelly import allocate_stakes
+from betslips.simulate import same_game_hit_fn
+from betslips.slips import ENTRY_TYPES, candidate_slips, describe_slips, legs_from_slate, score_slips
+from models.ensemble import latest_ensemble_path
+from models.predict import SlateScorer
+from props.pricing import DISTRIBUTIONS, prob_over_under
+
+
+def pick_slips(scored, lines, bankroll, entry="standard", sizes=(2, 3, 4, 5, 6), pool=24, dist="normal",
+               kelly=0.25, max_exposure=0.2, max_slips=10, same_game=False, n_sims=200_000):
+    """
+    Legs, every +EV slip and the staked picks for a scored slate and its
+    lines, with legs treated as independent. With `same_game`, slips with
+    two legs from one game (lines with match_id) are scored from `n_sims`
+    correlated simulations instead; that costs seconds to minutes on a full
+    slate rather than milliseconds.
+    """
+    columns = ['player', 'k_line', 'over_payout_multiplier', 'under_payout_multiplier']
+    multipliers = lines[columns + (['match_id'] if 'match_id' in lines.columns else [])]
+    priced = scored.merge(multipliers, on=['player', 'k_line'], how='left')
+    priced['p_over'], priced['p_under'], _ = prob_over_under(
+        priced['k_line'], priced['k_pred_mean'], priced['k_pred_std'], dist
+    )
+
+    legs = legs_from_slate(priced)
+    candidates = candidate_slips(legs, sizes, pool)
+    hit_fn = same_game_hit_fn(legs, candidates, n_sims) if same_game else None
+    slips = score_slips(legs, candidates, entry, hit_fn=hit_fn)
+    picked = allocate_stakes(slips, bankroll, kelly, max_exposure, max_slips)
+    return legs, slips, picked
+
+
+def print_slips(picked, legs):
+    print(f"{'Stake':>8} {'EV':>6} {'P(all)':>7}  Legs")
+    print("-" * 70)
+    for row, desc in zip(picked.itertuples(index=False), describe_slips(picked, legs)):
+        print(f"{row.stake:>8.2f} {row.ev:>6.2f} {row.p_all:>7.3f}  {desc}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick Underdog pick'em entries and stakes for a lines file")
+    parser.add_argument("--season", type=int, required=True)
+    parser.add_argument("--lines", required=True, help="Lines CSV from parse_ud_strikeouts")
+    parser.add_argument("--model", help="Ensemble artifact (default: newest in models/)")
+    parser.add_argument("--bankroll", type=float, required=True)
+    parser.add_argument("--entry", choices=sorted(ENTRY_TYPES), default="standard")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 3, 4, 5, 6])
+    parser.add_argument("--pool", type=int, default=24, help="Only combine the N legs with the best edge")
+    parser.add_argument("--dist", choices=DISTRIBUTIONS, default="normal")
+    parser.add_argument("--kelly", type=float, default=0.25, help="Fraction of full Kelly to stake")
+    parser.add_argument("--max-exposure", type=float, default=0.2, help="Most of the bankroll to stake in total")
+    parser.add_argument("--max-slips", type=int, default=10)
+    parser.add_argument("--same-game", action="store_true",
+                        help="Simulate correlated outcomes for slips with two legs from one game")
+    parser.add_argument("--n-sims", type=int, default=200_000, help="Simulations for --same-game")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    lines = pd.read_csv(args.lines)
+    scored = SlateScorer(args.model or latest_ensemble_path(), args.season).score(lines)
+    legs, slips, picked = pick_slips(
+        scored, lines, args.bankroll, args.entry, args.sizes, args.pool, args.dist,
+        args.kelly, args.max_exposure, args.max_slips, args.same_game, args.n_sims,
+    )
+    elapsed = time.perf_counter() - start
+
+    print_slips(picked, legs)
+    print(f"⏱️ Scored {len(slips)} +EV slips from {len(legs)} legs in {elapsed:.3f}s; "
+          f"staking {picked['stake'].sum():.2f} of {args.bankroll:.2f}")
+
+
+if __name__ == "__main__":
+    main()
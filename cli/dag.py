@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from instrumentation import stage
+
+DAG_STATE_PATH = "data/logs/dag_state.json"
+
+
+class Task:
+    """
+    One pipeline stage. `run(**deps)` gets the results of the tasks named
+    in `deps` as keyword arguments. When `fingerprint(**deps)` returns the
+    same value as on the last successful run the task is skipped, and
+    `restore()` (if given) supplies its result to dependents instead.
+    """
+
+    def __init__(self, name, run, deps=(), fingerprint=None, restore=None):
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.fingerprint = fingerprint
+        self.restore = restore
+
+
+def content_hash(*parts):
+    """Stable hash of frames (by content), paths (by size and mtime) and plain values."""
+    import pandas as pd
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            digest.update(repr(list(part.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+        elif isinstance(part, str) and os.path.exists(part):
+            stat = os.stat(part)
+            digest.update(f"{part}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def _read_state(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_state(state, path):
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _check(tasks):
+    names = {task.name for task in tasks}
+    for task in tasks:
+        unknown = set(task.deps) - names
+        if unknown:
+            raise ValueError(f"Task {task.name} depends on unknown tasks {sorted(unknown)}")
+    done, remaining = set(), list(tasks)
+    while remaining:
+        ready = [t for t in remaining if set(t.deps) <= done]
+        if not ready:
+            raise ValueError(f"Dependency cycle among {[t.name for t in remaining]}")
+        done.update(t.name for t in ready)
+        remaining = [t for t in remaining if t.name not in done]
+
+
+def run_dag(tasks, max_workers=4, state_path=DAG_STATE_PATH, force=()):
+    """
+    Run `tasks` in one process, each as soon as its dependencies finish, up
+    to `max_workers` at a time, passing results between them in memory.
+    Tasks whose fingerprint is unchanged are skipped unless named in
+    `force`; tasks downstream of a failure are not run. Each task is timed
+    as an instrumentation stage. Returns ({name: result}, {name: status})
+    with status 'ran', 'skipped', 'failed' or 'blocked'.
+    """
+    _check(tasks)
+    state = _read_state(state_path)
+    results, status = {}, {}
+    pending = {task.name: task for task in tasks}
+    running = {}
+
+    def start(task, pool):
+        deps = {name: results[name] for name in task.deps}
+        fingerprint = task.fingerprint(**deps) if task.fingerprint else None
+        if (fingerprint is not None and task.name not in force
+                and state.get(task.name, {}).get('fingerprint') == fingerprint):
+            print(f"⏭️ {task.name}: inputs unchanged")
+            status[task.name] = 'skipped'
+            results[task.name] = task.restore() if task.restore else None
+            return
+
+        def call():
+            with stage(task.name):
+                return task.run(**deps)
+        running[pool.submit(call)] = (task, fingerprint)
+        print(f"▶️ {task.name}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            progressed = True
+            while progressed:
+                progressed = False
+                for name in list(pending):
+                    task = pending[name]
+                    if any(status.get(d) in ('failed', 'blocked') for d in task.deps):
+                        status[name] = 'blocked'
+                    elif all(d in results for d in task.deps):
+                        try:
+                            start(task, pool)
+                        except Exception as e:
+                            print(f"❌ {name}: {e}")
+                            status[name] = 'failed'
+                    else:
+                        continue
+                    del pending[name]
+                    progressed = True
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task, fingerprint = running.pop(future)
+                try:
+                    results[task.name] = future.result()
+                except Exception as e:
+                    print(f"❌ {task.name}: {e}")
+                    status[task.name] = 'failed'
+                    continue
+                status[task.name] = 'ran'
+                if fingerprint is not None:
+                    state[task.name] = {'fingerprint': fingerprint,
+                                        'finished_at': datetime.now().isoformat(timespec='seconds')}
+                    _write_state(state, state_path)
+    return results, status
@@ -0,0 +1,99 @@
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+
+from cli.dag import Task, content_hash
+
+PREDICTIONS_PATH = "data/predictions"
+
+
+def daily_tasks(season, model=None, bankroll=None, entry="standard", fetch_days=1, lines_json=None,
+                predictions_path=PREDICTIONS_PATH):
+    """
+    The daily run as a DAG:
+
+        starters ─┐
+                  ├─ update ─┐
+        fetch ────┘          ├─ score ─ slips
+        lines ───────────────┘
+
+    fetch and lines hit the network every run (fetch is incremental on
+    its own). starters refreshes once a day; update, score and slips are
+    skipped while their inputs hash the same. Starters, the new games, the
+    lines and the scored slate are handed on in memory. slips only runs
+    when a `bankroll` is given.
+    """
+    today = date.today().isoformat()
+    yesterday = date.today() - timedelta(days=1)
+    scored_file = os.path.join(predictions_path, f"slate_{today}.csv")
+    slips_file = os.path.join(predictions_path, f"slips_{today}.csv")
+
+    def model_path():
+        from models.ensemble import latest_ensemble_path
+        return model or latest_ensemble_path()
+
+    def starters():
+        from ingest.player_ids import load_pitcher_ids
+        from scripts.get_top_starters import top_starters, top_starters_path
+        path = top_starters_path(season)
+        top_starters(season).to_csv(path, index=False)
+        return load_pitcher_ids(path)
+
+    def restore_starters():
+        from ingest.player_ids import load_pitcher_ids
+        from scripts.get_top_starters import top_starters_path
+        return load_pitcher_ids(top_starters_path(season))
+
+    def fetch():
+        from features.team_context import raw_fingerprints
+        from ingest.statcast_store import RAW_PATH
+        from scripts.fetch_statcast_raw import fetch_statcast_range
+        failed = fetch_statcast_range(yesterday - timedelta(days=fetch_days - 1), yesterday, season)
+        if failed:
+            raise RuntimeError(f"{len(failed)} Statcast chunks failed")
+        return raw_fingerprints(season, RAW_PATH)
+
+    def update(fetch, starters):
+        from scripts.update_pitcher_dataset_from_raw import update_pitcher_dataset
+        return update_pitcher_dataset(season, pitchers=starters)
+
+    def lines():
+        from ingest.parse_ud_strikeouts import get_ud_strikeouts_json, ingest_strikeout_lines, load_json
+        return ingest_strikeout_lines(load_json(lines_json) if lines_json else get_ud_strikeouts_json())
+
+    def score(update, lines):
+        from models.predict import SlateScorer
+        scored = SlateScorer(model_path(), season).score(lines)
+        os.makedirs(predictions_path, exist_ok=True)
+        scored.to_csv(scored_file, index=False)
+        print(f"🎯 Scored {len(scored)} of {len(lines)} lines → {scored_file}")
+        return scored
+
+    def score_inputs(update, lines):
+        from features.latest_index import latest_index_path
+        from models.predict import PROCESSED_PATH
+        return content_hash(today, lines, latest_index_path(season, PROCESSED_PATH), model_path())
+
+    def slips(score, lines):
+        from cli.build_slips import pick_slips, print_slips
+        from betslips.slips import describe_slips
+        legs, _, picked = pick_slips(score, lines, bankroll, entry)
+        print_slips(picked, legs)
+        picked.assign(desc=describe_slips(picked, legs).to_numpy()).to_csv(slips_file, index=False)
+        return picked
+
+    tasks = [
+        Task("starters", starters, fingerprint=lambda: content_hash(season, today), restore=restore_starters),
+        Task("fetch", fetch),
+        Task("lines", lines),
+        Task("update", update, deps=("fetch", "starters"),
+             fingerprint=lambda fetch, starters: content_hash(fetch, starters)),
+        Task("score", score, deps=("update", "lines"), fingerprint=score_inputs,
+             restore=lambda: pd.read_csv(scored_file)),
+    ]
+    if bankroll is not None:
+        tasks.append(Task("slips", slips, deps=("score", "lines"),
+                          fingerprint=lambda score, lines: content_hash(score_inputs(None, lines), bankroll, entry),
+                          restore=lambda: pd.read_csv(slips_file)))
+    return tasks
@@ -1,16 +1,16 @@
 import pandas as pd
 
 from features.mlb_features import aggregate_pitcher_games
+from ingest.statcast_store import load_statcast
 
 
 def main():
     pitcher_id = 670102  # Bowden Francis
-    statcast_path = "../data/raw/statcast/statcast_raw_2025.parquet"
+    statcast_root = "../data/raw/statcast"
     enriched_path = "../data/processed/pitcher_game_data_2025.parquet"
 
-    # Load raw statcast and filter
-    df = pd.read_parquet(statcast_path)
-    pitcher = df[df['pitcher'] == pitcher_id]
+    # Load only this pitcher's raw statcast rows
+    pitcher = load_statcast(2025, pitchers=[pitcher_id], root=statcast_root)
     new_df = aggregate_pitcher_games(pitcher)
     print(new_df[["whiff_rate", "csw_pct"]])
 
@@ -1,3 +1,86 @@
-# Entry point CLI stub
+"""
+sportsbalf: one entry point for the pipeline.
+
+    python -m cli.main daily --season 2025 --bankroll 100
+    python -m cli.main <command> [command options]
+
+`daily` runs the whole day (starters, Statcast fetch, dataset update,
+Underdog lines, scoring, slips) as a DAG in one process. The other
+commands run the existing scripts with their own options.
+"""
+import argparse
+import runpy
+import sys
+from datetime import date
+
+# Subcommand -> module whose __main__ it runs
+COMMANDS = {
+    'fetch': ('scripts.fetch_statcast_raw', "Fetch raw Statcast into the partitioned store"),
+    'starters': ('scripts.get_top_starters', "Save the season's starting pitchers"),
+    'generate': ('scripts.generate_pitcher_dataset_from_raw', "Build a season's pitcher dataset from raw"),
+    'update': ('scripts.update_pitcher_dataset_from_raw', "Append new games to a season's dataset"),
+    'players': ('ingest.player_ids', "Refresh the player id crosswalk"),
+    'lines': ('ingest.parse_ud_strikeouts', "Fetch Underdog strikeout lines"),
+    'board': ('props.board', "Fetch the whole Underdog board"),
+    'store': ('features.feature_store', "Sync processed seasons into the feature store"),
+    'tune': ('cli.tune', "Tune the K model's XGBoost parameters"),
+    'train': ('scripts.train_ks_ensemble', "Train the bootstrap ensemble"),
+    'backtest': ('cli.backtest', "Walk-forward backtest against historical lines"),
+    'predict': ('cli.predict_slate', "Score a lines file, or serve scoring over HTTP"),
+    'slips': ('cli.build_slips', "Pick pick'em entries and stakes"),
+    'live': ('models.live', "Replay a day of pitches through the live K projector"),
+    'bench': ('scripts.benchmark_pipeline', "Benchmark the feature pipeline on synthetic data"),
+}
+
+
+def daily(argv):
+    # Only what the parser needs is imported before parsing, so --help stays fast
+    from cli.dag import DAG_STATE_PATH, run_dag
+    from instrumentation import add_arguments, configure_from_args, summary
+
+    parser = argparse.ArgumentParser(prog="sportsbalf daily", description="Run the daily pipeline")
+    parser.add_argument("--season", type=int, default=date.today().year)
+    parser.add_argument("--model", help="Ensemble artifact (default: newest in models/)")
+    parser.add_argument("--bankroll", type=float, help="Also pick and stake slips")
+    parser.add_argument("--entry", default="standard", help="Entry type: standard or flex")
+    parser.add_argument("--fetch-days", type=int, default=1, help="Refetch this many days of Statcast")
+    parser.add_argument("--lines-json", help="Use a saved Underdog payload instead of fetching lines")
+    parser.add_argument("--workers", type=int, default=4, help="Stages to run at once")
+    parser.add_argument("--force", nargs="+", default=[], help="Run these stages even if unchanged")
+    parser.add_argument("--state", default=DAG_STATE_PATH)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_from_args(args)
+
+    from betslips.slips import ENTRY_TYPES
+    from cli.daily import daily_tasks
+    if args.entry not in ENTRY_TYPES:
+        parser.error(f"--entry must be one of {sorted(ENTRY_TYPES)}")
+    tasks = daily_tasks(args.season, args.model, args.bankroll, args.entry, args.fetch_days, args.lines_json)
+    _, status = run_dag(tasks, args.workers, args.state, force=set(args.force))
+    summary()
+    print("📋 " + ", ".join(f"{name}: {s}" for name, s in status.items()))
+    if any(s in ('failed', 'blocked') for s in status.values()):
+        sys.exit(1)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(prog="sportsbalf", description="Strikeout prop pipeline",
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="commands:\n  daily       Run the daily pipeline as a DAG\n" + "\n".join(
+                                         f"  {name:<11} {help_text}" for name, (_, help_text) in COMMANDS.items()))
+    parser.add_argument("command", choices=['daily', *COMMANDS], metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv[:1])
+
+    if args.command == 'daily':
+        daily(argv[1:])
+        return
+    module, _ = COMMANDS[args.command]
+    sys.argv = [f"sportsbalf {args.command}", *argv[1:]]
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+
+
 if __name__ == '__main__':
-    print("sportsbalf CLI running...")
+    main()
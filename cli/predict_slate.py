@@ -0,0 +1,45 @@
+import argparse
+import time
+
+import pandas as pd
+
+from models.ensemble import latest_ensemble_path
+from models.predict import SlateScorer, serve
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a strikeout lines file with the bootstrap ensemble")
+    parser.add_argument("--season", type=int, required=True)
+    parser.add_argument("--lines", help="Lines CSV from parse_ud_strikeouts (player, k_line, ...)")
+    parser.add_argument("--model", help="Ensemble artifact (default: newest in models/)")
+    parser.add_argument("--out", help="Write scored slate to this CSV")
+    parser.add_argument("--serve", action="store_true", help="Stay resident and answer HTTP scoring requests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    scorer = SlateScorer(args.model or latest_ensemble_path(), args.season)
+
+    if args.serve:
+        serve(scorer, args.host, args.port)
+        return
+
+    if not args.lines:
+        parser.error("--lines is required unless --serve is given")
+
+    scored = scorer.score(pd.read_csv(args.lines))
+    elapsed = time.perf_counter() - start
+
+    print(f"{'Player':24} {'K':>5} {'Mean':>6} {'Std':>6}")
+    print("-" * 44)
+    for row in scored.itertuples(index=False):
+        print(f"{row.player:24} {row.k_line:>5} {row.k_pred_mean:>6.2f} {row.k_pred_std:>6.2f}")
+    print(f"⏱️ Scored {len(scored)} pitchers in {elapsed:.3f}s")
+
+    if args.out:
+        scored.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
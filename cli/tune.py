@@ -0,0 +1,52 @@
+import argparse
+import time
+
+from features.feature_store import export_training_matrix, load_feature_store, sync_feature_store
+from models.ensemble import FEATURE_COLS, TARGET_COL
+from models.tuning import TUNING_PATH, best_params, save_params, successive_halving
+
+PARAMS_PATH = "models/ks_params.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the strikeout model's XGBoost parameters on time-ordered folds")
+    parser.add_argument("--seasons", type=int, nargs="+", required=True, help="Processed seasons, oldest first")
+    parser.add_argument("--candidates", type=int, default=27)
+    parser.add_argument("--eta", type=int, default=3, help="Keep the best 1/eta of candidates per rung")
+    parser.add_argument("--min-rounds", type=int, default=50)
+    parser.add_argument("--max-rounds", type=int, default=800)
+    parser.add_argument("--folds", type=int, default=3)
+    parser.add_argument("--metric", default="mae", help="XGBoost eval_metric, lower is better")
+    parser.add_argument("--early-stopping", type=int, default=30)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--threads-per-trial", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", default=TUNING_PATH)
+    parser.add_argument("--out", default=PARAMS_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    seasons = sorted(args.seasons)
+    sync_feature_store(seasons)
+    X, y, meta = export_training_matrix(seasons, FEATURE_COLS, TARGET_COL)
+    dates = load_feature_store(seasons, columns=['game_date'])['game_date']
+
+    trials = successive_halving(
+        X, y, dates, n_candidates=args.candidates, eta=args.eta, min_rounds=args.min_rounds,
+        max_rounds=args.max_rounds, n_folds=args.folds, metric=args.metric,
+        early_stopping_rounds=args.early_stopping, n_jobs=args.n_jobs,
+        threads_per_trial=args.threads_per_trial, seed=args.seed,
+        feature_version=meta['feature_version'], cache_path=args.cache,
+    )
+    params = best_params(trials)
+    save_params(params, {'seasons': seasons, 'metric': args.metric, 'score': float(trials['score'].iloc[0]),
+                         'feature_version': meta['feature_version']}, args.out)
+
+    print(f"{'Score':>8} {'Rounds':>6}  Params")
+    for row in trials.head(5).itertuples(index=False):
+        print(f"{row.score:>8.4f} {row.best_rounds:>6}  {row.params}")
+    print(f"✅ Saved best params to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
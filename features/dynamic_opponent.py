@@ -1,42 +1,85 @@
+import numpy as np
 import pandas as pd
 from features.team_abbr_map import team_fix_map
 
-def compute_opponent_k_pct_dynamic(start_date: str, end_date: str, default_k_pct = 0.055, source_df=None) -> pd.DataFrame:
+
+def team_day_counts(pbp: pd.DataFrame) -> pd.DataFrame:
+    """
+    Strikeouts and plate appearances per batting team and date:
+        ['game_date', 'Team', 'so', 'pa']
+    """
+    # The home team bats in the bottom half of the inning
+    is_bot = (pbp['inning_topbot'] == 'Bot').to_numpy()
+    team = np.where(is_bot, pbp['home_team'].astype(object), pbp['away_team'].astype(object))
+    events = pbp['events']
+
+    counts = pd.DataFrame({
+        'game_date': pbp['game_date'].to_numpy(),
+        'Team': pd.Series(team).replace(team_fix_map).to_numpy(),
+        'so': (events == 'strikeout').to_numpy(),
+        'pa': events.notna().to_numpy(),
+    })
+    return counts.groupby(['game_date', 'Team'], as_index=False).sum()
+
+
+def extend_team_day_counts(team_days: pd.DataFrame, pbp: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the dates in `pbp` to a team_day_counts table. Dates already in the
+    table are recounted from `pbp`, so a partially loaded day can be refreshed.
+    """
+    new_days = team_day_counts(pbp)
+    if team_days is None or team_days.empty:
+        return new_days
+    kept = team_days[~team_days['game_date'].isin(new_days['game_date'].unique())]
+    return pd.concat([kept, new_days], ignore_index=True)
+
+
+def opponent_k_pct_from_team_days(team_days: pd.DataFrame, default_k_pct=0.055) -> pd.DataFrame:
+    daily = team_days.sort_values(['Team', 'game_date'])
+    by_team = daily.groupby('Team')
+
+    # Totals over prior dates only
+    cum_so = by_team['so'].cumsum() - daily['so']
+    cum_pa = by_team['pa'].cumsum() - daily['pa']
+
+    daily = daily[['game_date', 'Team']].copy()
+    daily['K_pct_so_far'] = (cum_so / cum_pa).fillna(default_k_pct)
+    return daily
+
+
+def compute_opponent_k_pct_dynamic(start_date: str, end_date: str, default_k_pct = 0.055, source_df=None,
+                                   team_days=None) -> pd.DataFrame:
     """
     Returns a DataFrame with one row per team & date, containing:
         ['game_date', 'Team', 'K_pct_so_far']
     where K_pct_so_far is the team's strikeout % over all prior dates.
+
+    If `team_days` (a team_day_counts table) is given, only pitches dated
+    after its last date are counted and added to it. Use
+    update_opponent_k_pct to keep the extended table.
+    """
+    k_pct, _ = update_opponent_k_pct(start_date, end_date, team_days, default_k_pct, source_df)
+    return k_pct
+
+
+def update_opponent_k_pct(start_date: str, end_date: str, team_days=None, default_k_pct=0.055, source_df=None):
+    """
+    compute_opponent_k_pct_dynamic that also returns the extended
+    `team_days`, to pass back in on the next call: (k_pct, team_days).
     """
+    if team_days is not None and not team_days.empty:
+        start_date = max(pd.Timestamp(start_date), pd.Timestamp(team_days['game_date'].max()) + pd.Timedelta(days=1))
+        start_date = start_date.strftime("%Y-%m-%d")
+        if start_date > str(end_date):
+            return opponent_k_pct_from_team_days(team_days, default_k_pct), team_days
+
     if source_df is None:
         from pybaseball import statcast
         print("⚠️ No source_df provided — fetching from Statcast live.")
         pbp = statcast(start_date, end_date)
     else:
-        pbp = source_df[
-            (source_df['game_date'] >= start_date) &
-            (source_df['game_date'] <= end_date)
-        ].copy()
-
-    pbp['pa'] = pbp['events'].notna()
-    pbp['Team'] = pbp.apply(
-        lambda r: r['home_team'] if r['inning_topbot'] == 'Bot' else r['away_team'],
-        axis=1
-    )
-    pbp['Team'] = pbp['Team'].replace(team_fix_map)
-
-    # Game-level team aggregation
-    daily = (
-        pbp.groupby(['game_date', 'Team'])
-        .agg(so=('events', lambda x: x.eq('strikeout').sum()),
-             pa=('pa', 'sum'))
-        .reset_index()
-    )
-
-    daily = daily.sort_values(['Team', 'game_date'])
-    daily['cum_so'] = daily.groupby('Team')['so'].cumsum().shift(1).fillna(0)
-    daily['cum_pa'] = daily.groupby('Team')['pa'].cumsum().shift(1).fillna(0)
-
-    daily['K_pct_so_far'] = daily['cum_so'] / daily['cum_pa']
-    daily['K_pct_so_far'] = daily['K_pct_so_far'].fillna(default_k_pct)
-
-    return daily[['game_date', 'Team', 'K_pct_so_far']]
\ No newline at end of file
+        in_range = (source_df['game_date'] >= start_date) & (source_df['game_date'] <= end_date)
+        pbp = source_df.loc[in_range, ['game_date', 'home_team', 'away_team', 'inning_topbot', 'events']]
+
+    team_days = extend_team_day_counts(team_days, pbp)
+    return opponent_k_pct_from_team_days(team_days, default_k_pct), team_days
@@ -8,4 +8,13 @@ def add_park_factor(games, park_df):
     games = games.merge(
         park_df, left_on='home_team', right_on='Team_abbr', how='left'
     ).rename(columns={'K_park_factor': 'park_factor_K'})
-    return games.drop(columns=['Team_abbr'])
\ No newline at end of file
+    return games.drop(columns=['Team_abbr'])
+
+def add_dynamic_opponent_k_pct(games, opponent_k_df):
+    games = games.merge(
+        opponent_k_df,
+        left_on=['game_date', 'opponent_team'],
+        right_on=['game_date', 'Team'],
+        how='left'
+    ).rename(columns={'K_pct_so_far': 'opponent_k_pct'})
+    return games.drop(columns=['Team'])
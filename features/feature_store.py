@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from features.mlb_features import EXPANDING_RATES
+from features.rolling import ROLLING_CONFIG
+
+PROCESSED_PATH = "data/processed"
+STORE_PATH = "data/processed/feature_store"
+# Bump when a feature changes in a way ROLLING_CONFIG and EXPANDING_RATES don't show
+FEATURE_SCHEMA = 1
+BATCH_ROWS = 1 << 16
+
+
+def feature_version():
+    """
+    Short hash of the current feature definitions. Processed dataset parts
+    are stamped with it when written (dataset_feature_version reads it back).
+    """
+    spec = repr((FEATURE_SCHEMA, ROLLING_CONFIG, sorted(EXPANDING_RATES.items())))
+    return hashlib.sha1(spec.encode()).hexdigest()[:12]
+
+
+def _source_path(season, processed_path):
+    return os.path.join(processed_path, f"pitcher_game_data_{season}.parquet")
+
+
+def _season_file(season, store_path):
+    return os.path.join(store_path, f"season={season}", "part-0.parquet")
+
+
+def _source_fingerprint(path):
+    """File names, sizes and mtimes of a processed dataset (part directory or legacy file)."""
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+    files = sorted((f for f in os.scandir(path) if f.name.endswith('.parquet')), key=lambda f: f.name)
+    return ';'.join(f"{f.name}:{f.stat().st_size}:{f.stat().st_mtime_ns}" for f in files)
+
+
+def dataset_feature_version(path):
+    """
+    The feature_version a processed dataset was built with, from the stamp
+    on each part: 'a+b' when its parts were built under several versions
+    and 'unknown' for parts written before parts were stamped.
+    """
+    if os.path.isdir(path):
+        files = sorted(f.path for f in os.scandir(path) if f.name.startswith('part-'))
+    else:
+        files = [path]
+    versions = set()
+    for file in files:
+        metadata = pq.read_schema(file).metadata or {}
+        versions.add(metadata.get(b'feature_version', b'unknown').decode())
+    return '+'.join(sorted(versions)) or 'unknown'
+
+
+def _read_manifest(store_path):
+    manifest_file = os.path.join(store_path, "manifest.json")
+    if not os.path.exists(manifest_file):
+        return {'seasons': {}}
+    with open(manifest_file) as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest, store_path):
+    os.makedirs(store_path, exist_ok=True)
+    manifest_file = os.path.join(store_path, "manifest.json")
+    with open(manifest_file + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_file + ".tmp", manifest_file)
+
+
+def sync_feature_store(seasons, processed_path=PROCESSED_PATH, store_path=STORE_PATH):
+    """
+    Bring the store up to date with the processed datasets of `seasons`:
+    a season is rewritten (as season=YYYY/part-0.parquet, in game_date
+    order) only when its source parts changed since the last sync. The
+    manifest records each season's source fingerprint, rows, column schema
+    and the feature_version its processed data was built with (not the
+    version of the code syncing it). Returns the manifest.
+    """
+    manifest = _read_manifest(store_path)
+    for season in seasons:
+        source = _source_path(season, processed_path)
+        if not os.path.exists(source):
+            print(f"⚠️ No processed dataset for {season} at {source}")
+            continue
+        fingerprint = _source_fingerprint(source)
+        entry = manifest['seasons'].get(str(season))
+        if entry and entry['fingerprint'] == fingerprint and os.path.exists(_season_file(season, store_path)):
+            continue
+
+        version = dataset_feature_version(source)
+        games = pd.read_parquet(source)
+        games['game_date'] = pd.to_datetime(games['game_date'])
+        sort_cols = ['game_date', 'pitcher_id'] if 'pitcher_id' in games.columns else ['game_date']
+        games = games.sort_values(sort_cols, kind='stable').reset_index(drop=True)
+        table = pa.Table.from_pandas(games, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'feature_version': version.encode(), b'season': str(season).encode(),
+        })
+
+        path = _season_file(season, store_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pq.write_table(table, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        manifest['seasons'][str(season)] = {
+            'fingerprint': fingerprint,
+            'rows': table.num_rows,
+            'feature_version': version,
+            'schema': {field.name: str(field.type) for field in table.schema},
+        }
+        print(f"🗄️ Synced {season}: {table.num_rows} rows")
+    _write_manifest(manifest, store_path)
+    return manifest
+
+
+def load_feature_store(seasons, columns=None, store_path=STORE_PATH):
+    """Stored games of `seasons`, in season then game_date order."""
+    frames = [pd.read_parquet(_season_file(season, store_path), columns=columns) for season in seasons]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _fill_matrix(paths, columns, X, y):
+    """Stream `columns` (features then target) from `paths` into X and y in record batches."""
+    lo = 0
+    for path in paths:
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_ROWS, columns=columns):
+            hi = lo + batch.num_rows
+            for j, col in enumerate(columns[:-1]):
+                X[lo:hi, j] = batch.column(col).to_numpy(zero_copy_only=False)
+            y[lo:hi] = batch.column(columns[-1]).to_numpy(zero_copy_only=False)
+            lo = hi
+
+
+def export_training_matrix(seasons, features, target, store_path=STORE_PATH, keep=2):
+    """
+    The training matrix of `seasons` as float32, C-contiguous .npy files
+    memory-mapped read-only: X (n_rows, len(features)) and y (n_rows,),
+    plus a meta dict (features, target, seasons, rows per season,
+    feature_version). Rows follow the store order.
+
+    The matrix is written once per store content, streaming record batches
+    straight into the memmaps, and reused until a season is re-synced.
+    Worker processes handed these arrays (joblib passes np.memmap by file
+    reference) share the page cache instead of each getting a copy. Only
+    the `keep` most recently used matrices are kept.
+    """
+    manifest = _read_manifest(store_path)
+    missing = [s for s in seasons if str(s) not in manifest['seasons']]
+    if missing:
+        raise KeyError(f"Seasons {missing} are not in the feature store at {store_path}; run sync_feature_store")
+    entries = [manifest['seasons'][str(s)] for s in seasons]
+    versions = sorted({e['feature_version'] for e in entries})
+    if len(versions) > 1 or versions[0] != feature_version():
+        print(f"⚠️ Seasons {list(seasons)} were built under feature versions {versions}; "
+              f"current is {feature_version()}")
+
+    key = hashlib.sha1(repr((list(features), target, [(s, e['fingerprint'], e['feature_version'])
+                                                      for s, e in zip(seasons, entries)])).encode())
+    matrix_root = os.path.join(store_path, "matrices")
+    matrix_dir = os.path.join(matrix_root, key.hexdigest()[:16])
+    x_file, y_file, meta_file = (os.path.join(matrix_dir, name) for name in ("X.npy", "y.npy", "meta.json"))
+
+    if not os.path.exists(meta_file):
+        n_rows = sum(e['rows'] for e in entries)
+        tmp_dir = matrix_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        X = np.lib.format.open_memmap(os.path.join(tmp_dir, "X.npy"), mode='w+', dtype=np.float32,
+                                      shape=(n_rows, len(features)))
+        y = np.lib.format.open_memmap(os.path.join(tmp_dir, "y.npy"), mode='w+', dtype=np.float32,
+                                      shape=(n_rows,))
+        _fill_matrix([_season_file(s, store_path) for s in seasons], list(features) + [target], X, y)
+        X.flush()
+        y.flush()
+        del X, y
+        meta = {
+            'features': list(features), 'target': target, 'seasons': list(seasons),
+            'rows': {str(s): e['rows'] for s, e in zip(seasons, entries)}, 'feature_version': versions[-1],
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+        shutil.rmtree(matrix_dir, ignore_errors=True)
+        os.replace(tmp_dir, matrix_dir)
+
+    os.utime(matrix_dir)
+    stale = sorted((d for d in os.scandir(matrix_root) if d.is_dir() and not d.name.endswith('.tmp')),
+                   key=lambda d: d.stat().st_mtime_ns, reverse=True)[keep:]
+    for d in stale:
+        shutil.rmtree(d.path, ignore_errors=True)
+
+    with open(meta_file) as f:
+        meta = json.load(f)
+    return np.load(x_file, mmap_mode='r'), np.load(y_file, mmap_mode='r'), meta
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Sync processed seasons into the feature store")
+    parser.add_argument("--seasons", type=int, nargs="+", required=True)
+    parser.add_argument("--processed", default=PROCESSED_PATH)
+    parser.add_argument("--store", default=STORE_PATH)
+    args = parser.parse_args()
+    manifest = sync_feature_store(args.seasons, args.processed, args.store)
+    print(f"✅ Store holds {sum(e['rows'] for e in manifest['seasons'].values())} rows "
+          f"over seasons {sorted(manifest['seasons'])}")
@@ -0,0 +1,125 @@
+import os
+import re
+import unicodedata
+
+import pandas as pd
+
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv'}
+
+
+def latest_index_path(season, processed_path="data/processed"):
+    return os.path.join(processed_path, f"pitcher_latest_{season}.parquet")
+
+
+def latest_rows(games):
+    """The most recent processed game row of each pitcher_id."""
+    return (
+        games.sort_values('game_date', kind='stable')
+        .drop_duplicates('pitcher_id', keep='last')
+        .sort_values('pitcher_id')
+        .reset_index(drop=True)
+    )
+
+
+def pregame_rows(games, columns):
+    """
+    For every row of `games`, `columns` from the same pitcher's latest row
+    dated strictly before it: latest_rows cut off at each game's date, so
+    nothing from that day's games leaks in. NaN for a pitcher's first date.
+    Aligned to `games` row by row.
+    """
+    keys = games[['pitcher_id', 'game_date']].reset_index(drop=True)
+    history = games[['pitcher_id', 'game_date'] + list(columns)].sort_values('game_date', kind='stable')
+    order = keys.sort_values('game_date', kind='stable').index
+    matched = pd.merge_asof(
+        keys.loc[order].reset_index(), history, on='game_date', by='pitcher_id', allow_exact_matches=False,
+    )
+    return matched.set_index('index').sort_index()[list(columns)].set_axis(games.index)
+
+
+def write_latest_index(games, path):
+    latest_rows(games).to_parquet(path, index=False)
+
+
+def update_latest_index(new_games, path, dataset_path=None):
+    """
+    Fold newly processed games into the latest-row table at `path`. When the
+    table does not exist yet it is seeded from the processed dataset once.
+    """
+    if os.path.exists(path):
+        previous = pd.read_parquet(path)
+    elif dataset_path is not None and os.path.exists(dataset_path):
+        previous = pd.read_parquet(dataset_path)
+    else:
+        previous = None
+
+    games = new_games if previous is None else pd.concat([previous, new_games], ignore_index=True)
+    write_latest_index(games, path)
+
+
+def load_latest_index(path, columns=None):
+    """Latest-row table indexed by pitcher_id, for O(1) lookups by id."""
+    if columns is not None:
+        columns = list(dict.fromkeys(['pitcher_id', 'pitcher_name', 'game_date'] + list(columns)))
+    return pd.read_parquet(path, columns=columns).set_index('pitcher_id')
+
+
+def lookup_latest(index, pitcher_ids):
+    """Rows for `pitcher_ids`, in that order; ids with no games come back empty (NaN)."""
+    return index.reindex(pd.Index(pitcher_ids, name='pitcher_id'))
+
+
+def normalize_name(name):
+    """
+    Accent-, case- and punctuation-insensitive name key:
+    'José Berríos' -> 'jose berrios', 'Luis L. Ortiz Jr.' -> 'luis l ortiz'.
+    """
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    tokens = re.sub(r"[^a-z ]", " ", name.lower().replace("'", "").replace(".", " ")).split()
+    return " ".join(t for t in tokens if t not in NAME_SUFFIXES)
+
+
+def short_name_key(key):
+    tokens = key.split()
+    return f"{tokens[0]} {tokens[-1]}" if len(tokens) > 2 else key
+
+
+def _unique_ids(keys, ids):
+    """{key: id} for keys naming exactly one player, and the set of keys naming several."""
+    pairs = pd.DataFrame({'key': keys, 'id': ids}).drop_duplicates()
+    shared = pairs['key'].duplicated(keep=False)
+    return pairs[~shared].set_index('key')['id'], set(pairs.loc[shared, 'key'])
+
+
+def match_name_keys(players, keys, ids):
+    """
+    Ids for display names `players` among candidates with normalize_name
+    `keys` and `ids`: on the full key, or on first + last name when middle
+    initials differ. A name that fits several candidates is ambiguous: it
+    maps to <NA> and is reported. Unresolved names map to <NA>.
+    """
+    keys = pd.Series(keys, dtype=object).to_numpy()
+    by_key, ambiguous = _unique_ids(keys, ids)
+    by_short_key, ambiguous_short = _unique_ids([short_name_key(k) for k in keys], ids)
+
+    players = pd.Series(players, dtype=object)
+    player_keys = players.map(normalize_name)
+    short_keys = player_keys.map(short_name_key)
+    matched = player_keys.map(by_key)
+    # The short key is only a fallback for full names that fit no one
+    matched = matched.fillna(short_keys.where(~player_keys.isin(ambiguous)).map(by_short_key))
+
+    unsure = players[player_keys.isin(ambiguous) | (matched.isna() & short_keys.isin(ambiguous_short))]
+    if len(unsure):
+        print(f"⚠️ Ambiguous player names left unresolved: {', '.join(map(str, unsure.unique()))}")
+    return matched.astype('Int64').reset_index(drop=True)
+
+
+def resolve_player_ids(players, index):
+    """
+    Map display names (e.g. Underdog `player` strings) to MLBAM ids using the
+    names in a latest-row table, with match_name_keys: names that fit
+    several pitchers stay unresolved rather than being guessed.
+    """
+    known = index.reset_index()[['pitcher_id', 'pitcher_name']]
+    return match_name_keys(players, known['pitcher_name'].map(normalize_name), known['pitcher_id'])
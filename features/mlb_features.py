@@ -1,66 +1,90 @@
+import numpy as np
 import pandas as pd
 
 from features.team_abbr_map import team_fix_map
 
-def aggregate_pitcher_games(df: pd.DataFrame) -> pd.DataFrame:
-    # Aggregate pitch-level data to game-level
-    games = df.groupby(['pitcher', 'game_date']).agg({
-        'description': 'count',
-        'events': lambda x: (x == 'strikeout').sum(),
-        'inning': 'max',
-        'pitch_type': pd.Series.nunique
-    }).reset_index()
-
-    games.rename(columns={
-        'description': 'pitch_count',
-        'events': 'strikeouts',
-        'inning': 'max_inning',
-        'pitch_type': 'num_pitch_types'
-    }, inplace=True)
-
-    # Extract metadata (one pitch per game)
-    meta = df.groupby(['pitcher', 'game_date']).first().reset_index()
-    games['home_team'] = meta['home_team']
-    games['away_team'] = meta['away_team']
-    games['rest_days'] = meta['pitcher_days_since_prev_game'].fillna(5).astype(int)
-
-    # Infer opponent team
-    games['pitcher_team'] = meta.apply(
-        lambda row: row['home_team'] if row['inning_topbot'] == 'Top' else row['away_team'], axis=1
-    )
-    games['opponent_team'] = meta.apply(
-        lambda row: row['away_team'] if row['inning_topbot'] == 'Top' else row['home_team'], axis=1
-    )
+WHIFF_DESCRIPTIONS = ['swinging_strike', 'swinging_strike_blocked']
+SWING_DESCRIPTIONS = WHIFF_DESCRIPTIONS + ['foul', 'foul_tip', 'hit_into_play']
+COUNT_COLS = ['whiff_count', 'swing_count', 'called_count', 'cum_whiffs', 'cum_called', 'cum_pitches']
 
-    for col in ['pitcher_team', 'opponent_team', 'home_team', 'away_team']:
-        games[col] = games[col].replace(team_fix_map)
 
-    whiff_count = df.groupby(['pitcher', 'game_date'])['description'].apply(
-        lambda x: x.isin(['swinging_strike', 'swinging_strike_blocked']).sum()
-    ).rename('whiff_count')
-    swing_count = df.groupby(['pitcher', 'game_date'])['description'].apply(
-        lambda x: x.isin(['swinging_strike', 'swinging_strike_blocked', 'foul', 'foul_tip', 'hit_into_play']).sum()
-    ).rename('swing_count')
+# Season-to-date rates: sum of the numerator cumulative counts over the denominator
+EXPANDING_RATES = {
+    'whiff_rate_expanding': (['cum_whiffs'], 'cum_pitches'),
+    'csw_pct_expanding': (['cum_whiffs', 'cum_called'], 'cum_pitches'),
+}
+
+
+def add_expanding_rates(games: pd.DataFrame) -> pd.DataFrame:
+    for name, (numerators, denominator) in EXPANDING_RATES.items():
+        games[name] = (games[numerators].sum(axis=1) / games[denominator]).fillna(0)
+    return games
+
 
-    called_count = df.groupby(['pitcher','game_date'])['description'].apply(
-        lambda x: (x == 'called_strike').sum()
-    ).rename('called_count')
+def aggregate_pitcher_games(df: pd.DataFrame, keep_counts: bool = False) -> pd.DataFrame:
+    # keep_counts leaves the raw and cumulative counts (COUNT_COLS) on the frame
+    # Precompute per-pitch flags so every count is a plain grouped sum
+    description = df['description']
+    pitches = pd.DataFrame({
+        # int64 whatever the raw storage width, so game-level files stay stable
+        'pitcher': df['pitcher'].astype('int64'),
+        'game_date': df['game_date'],
+        'is_pitch': description.notna(),
+        'is_k': df['events'] == 'strikeout',
+        'is_whiff': description.isin(WHIFF_DESCRIPTIONS),
+        'is_swing': description.isin(SWING_DESCRIPTIONS),
+        'is_called': description == 'called_strike',
+        'inning': df['inning'],
+        'pitch_type': df['pitch_type'],
+        'home_team': df['home_team'],
+        'away_team': df['away_team'],
+        'inning_topbot': df['inning_topbot'],
+        'pitcher_days_since_prev_game': df['pitcher_days_since_prev_game'],
+    })
 
-    # Merge in counts
-    games = games.merge(whiff_count, on=['pitcher', 'game_date'], how='left')
-    games = games.merge(swing_count, on=['pitcher', 'game_date'], how='left')
-    games = games.merge(called_count, on=['pitcher', 'game_date'], how='left')
+    # Aggregate pitch-level data to game-level in a single pass
+    games = pitches.groupby(['pitcher', 'game_date']).agg(
+        pitch_count=('is_pitch', 'sum'),
+        strikeouts=('is_k', 'sum'),
+        max_inning=('inning', 'max'),
+        num_pitch_types=('pitch_type', 'nunique'),
+        home_team=('home_team', 'first'),
+        away_team=('away_team', 'first'),
+        rest_days=('pitcher_days_since_prev_game', 'first'),
+        inning_topbot=('inning_topbot', 'first'),
+        whiff_count=('is_whiff', 'sum'),
+        swing_count=('is_swing', 'sum'),
+        called_count=('is_called', 'sum'),
+    ).reset_index()
+
+    games['rest_days'] = games['rest_days'].fillna(5).astype(int)
+
+    # Infer pitcher/opponent team from the half-inning of the first pitch
+    is_top = (games['inning_topbot'] == 'Top').to_numpy()
+    games.insert(
+        games.columns.get_loc('rest_days') + 1, 'pitcher_team',
+        np.where(is_top, games['home_team'], games['away_team'])
+    )
+    games.insert(
+        games.columns.get_loc('pitcher_team') + 1, 'opponent_team',
+        np.where(is_top, games['away_team'], games['home_team'])
+    )
+
+    for col in ['pitcher_team', 'opponent_team', 'home_team', 'away_team']:
+        games[col] = games[col].astype(object).replace(team_fix_map)
 
     # Calculate metrics
     games['whiff_rate'] = (games['whiff_count'] / games['swing_count']).fillna(0)
     games['csw_pct'] = ((games['whiff_count'] + games['called_count']) / games['pitch_count']).fillna(0)
 
-    games['cum_whiffs'] = games['whiff_count'].cumsum().fillna(0)
-    games['cum_called'] = games['called_count'].cumsum().fillna(0)
-    games['cum_pitches'] = games['pitch_count'].cumsum().fillna(0)
-    games['whiff_rate_expanding'] = (games['cum_whiffs'] / games['cum_pitches']).fillna(0)
-    games['csw_pct_expanding'] = ((games['cum_whiffs'] + games['cum_called']) / games['cum_pitches']).fillna(0)
+    by_pitcher = games.groupby('pitcher')
+    games['cum_whiffs'] = by_pitcher['whiff_count'].cumsum()
+    games['cum_called'] = by_pitcher['called_count'].cumsum()
+    games['cum_pitches'] = by_pitcher['pitch_count'].cumsum()
+    games = add_expanding_rates(games)
 
-    games.drop(columns=['whiff_count', 'swing_count', 'called_count', 'cum_whiffs', 'cum_called', 'cum_pitches'], inplace=True)
+    games.drop(columns=['inning_topbot'], inplace=True)
+    if not keep_counts:
+        games.drop(columns=COUNT_COLS, inplace=True)
 
-    return games
\ No newline at end of file
+    return games
@@ -55,6 +55,30 @@ def load_live_park_factors(csv_path: str) -> pd.DataFrame:
     df = pd.read_csv(csv_path)
     return df[['Team_abbr', 'K_park_factor']]
 
+def park_day_counts(df):
+    """
+    Strikeouts and pitches (batter rows) per home park and date:
+        ['game_date', 'home_team', 'k', 'n']
+    """
+    df = df[df['pitch_type'].notnull()]
+    counts = pd.DataFrame({
+        'game_date': df['game_date'].to_numpy(),
+        'home_team': df['home_team'].astype(object).to_numpy(),
+        'k': (df['events'] == 'strikeout').to_numpy(),
+        'n': df['batter'].notna().to_numpy(),
+    })
+    return counts.groupby(['game_date', 'home_team'], as_index=False).sum()
+
+def park_factors_from_park_days(park_days):
+    k_by_park = park_days.groupby('home_team', as_index=False)[['k', 'n']].sum()
+
+    k_by_park['K_pct'] = k_by_park['k'] / k_by_park['n']
+    league_avg = k_by_park['k'].sum() / k_by_park['n'].sum()
+    k_by_park['K_park_factor'] = k_by_park['K_pct'] / league_avg
+    k_by_park['Team_abbr'] = k_by_park['home_team'].replace(team_fix_map).fillna(k_by_park['home_team'])
+
+    return k_by_park[['Team_abbr', 'K_park_factor']]
+
 def compute_k_park_factors(start_date, end_date, source_df=None):
     if source_df is None:
         from pybaseball import statcast
@@ -64,19 +88,6 @@ def compute_k_park_factors(start_date, end_date, source_df=None):
         df = source_df[
             (source_df['game_date'] >= start_date) &
             (source_df['game_date'] <= end_date)
-        ].copy()
-
-    df = df[df['pitch_type'].notnull()]
-    df['is_k'] = df['events'] == 'strikeout'
-
-    k_by_park = df.groupby('home_team').agg({
-        'is_k': 'sum',
-        'batter': 'count'
-    }).reset_index()
-
-    k_by_park['K_pct'] = k_by_park['is_k'] / k_by_park['batter']
-    league_avg = df['is_k'].sum() / df['batter'].count()
-    k_by_park['K_park_factor'] = k_by_park['K_pct'] / league_avg
-    k_by_park['Team_abbr'] = k_by_park['home_team'].replace(team_fix_map).fillna(k_by_park['home_team'])
+        ]
 
-    return k_by_park[['Team_abbr', 'K_park_factor']]
\ No newline at end of file
+    return park_factors_from_park_days(park_day_counts(df))
@@ -1,7 +1,9 @@
+import numpy as np
 import pandas as pd
 
-from features.enrichments import add_park_factor
-from features.mlb_features import aggregate_pitcher_games
+from features.enrichments import add_dynamic_opponent_k_pct, add_park_factor
+from features.mlb_features import COUNT_COLS, aggregate_pitcher_games
+from features.pitcher_state import extend_from_state
 from features.rolling import add_rolling_features
 
 
@@ -9,19 +11,47 @@ def enrich_pitcher_games(player_df, name, mlbam_id, opponent_k_df, park_df):
     if player_df.empty:
         return None
 
-    games = aggregate_pitcher_games(player_df)
-    games['game_date'] = pd.to_datetime(games['game_date'])
+    return enrich_all_pitcher_games(player_df, [(name, mlbam_id)], opponent_k_df, park_df)
+
+
+def enrich_all_pitcher_games(df, pitchers, opponent_k_df, park_df, state=None, keep_counts=False):
+    """
+    Enrich every pitcher in `pitchers` (a list of (name, mlbam_id) pairs) in
+    one grouped pass over the pitch-level frame `df`.
 
-    games = games.merge(
-        opponent_k_df,
-        left_on=['game_date', 'opponent_team'],
-        right_on=['game_date', 'Team'],
-        how='left'
-    ).rename(columns={'K_pct_so_far': 'opponent_k_pct'}).drop(columns=['Team'])
+    Rows come back grouped in the order of `pitchers` and sorted by game_date
+    within each pitcher, matching a per-pitcher loop over enrich_pitcher_games.
+
+    With a pitcher `state` (see features.pitcher_state), `df` holds only games
+    after each pitcher's last state game and the rolling and expanding columns
+    continue from that state. keep_counts leaves COUNT_COLS on the result.
+    """
+    names = {}
+    for name, mlbam_id in pitchers:
+        names.setdefault(mlbam_id, name)
+
+    df = df[df['pitcher'].isin(list(names))]
+    if df.empty:
+        return None
 
+    games = aggregate_pitcher_games(df, keep_counts=True)
+    games['game_date'] = pd.to_datetime(games['game_date'])
+
+    games = add_dynamic_opponent_k_pct(games, opponent_k_df)
     games = add_park_factor(games, park_df)
-    games = add_rolling_features(games)
-    games['pitcher_name'] = name
-    games['pitcher_id'] = mlbam_id
+    if state is None:
+        games = add_rolling_features(games, group_col='pitcher')
+    else:
+        games = extend_from_state(games, state)
+
+    order = {mlbam_id: i for i, mlbam_id in enumerate(names)}
+    games = games.iloc[np.argsort(games['pitcher'].map(order).to_numpy(), kind='stable')]
+    games = games.reset_index(drop=True)
+
+    games['pitcher_name'] = games['pitcher'].map(names)
+    games['pitcher_id'] = games['pitcher']
+
+    if not keep_counts:
+        games = games.drop(columns=COUNT_COLS)
 
-    return games
\ No newline at end of file
+    return games
@@ -0,0 +1,145 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from features.feature_store import feature_version
+from features.mlb_features import add_expanding_rates
+from features.rolling import MAX_WINDOW, ROLLING_FEATURES, ROLLING_INPUTS, add_rolling_features
+
+CUM_COLS = {'cum_whiffs': 'whiff_count', 'cum_called': 'called_count', 'cum_pitches': 'pitch_count'}
+STATE_COLS = ['pitcher', 'game_date'] + ROLLING_INPUTS + list(CUM_COLS)
+
+
+def build_pitcher_state(games, state=None):
+    """
+    Per-pitcher rolling state: the last MAX_WINDOW games of each pitcher with
+    their strikeouts, pitch counts and running whiff/called/pitch totals.
+
+    `games` must carry the count columns (aggregate_pitcher_games with
+    keep_counts=True). Passing the previous `state` extends it.
+    """
+    frames = [games[STATE_COLS]] if state is None else [state, games[STATE_COLS]]
+    combined = pd.concat(frames, ignore_index=True).sort_values(['pitcher', 'game_date'])
+    return combined.groupby('pitcher').tail(MAX_WINDOW).reset_index(drop=True)
+
+
+def extend_from_state(games, state, default_k=5, default_pitch_count=85):
+    """
+    Recompute the cumulative and rolling columns of new `games` (all later
+    than the pitcher's last game in `state`) as a full-season rebuild would.
+    """
+    games = games.sort_values(['pitcher', 'game_date']).reset_index(drop=True)
+    totals = state.groupby('pitcher')[list(CUM_COLS)].last()
+    by_pitcher = games.groupby('pitcher')
+    for cum_col, count_col in CUM_COLS.items():
+        prior = games['pitcher'].map(totals[cum_col]).fillna(0).astype('int64')
+        games[cum_col] = by_pitcher[count_col].cumsum() + prior
+    games = add_expanding_rates(games)
+
+    window_cols = ['pitcher', 'game_date'] + ROLLING_INPUTS
+    combined = pd.concat([
+        state[window_cols].assign(_row=-1),
+        games[window_cols].assign(_row=range(len(games))),
+    ], ignore_index=True)
+    rolled = add_rolling_features(combined, default_k, default_pitch_count, group_col='pitcher')
+    rolled = rolled[rolled['_row'] >= 0].sort_values('_row')
+    for col in ROLLING_FEATURES:
+        games[col] = rolled[col].to_numpy()
+
+    return games
+
+
+def load_pitcher_state(path):
+    if not os.path.exists(path):
+        return None
+    state = pd.read_parquet(path)
+    state['game_date'] = pd.to_datetime(state['game_date'])
+    return state
+
+
+def save_pitcher_state(state, path, dataset_part=None):
+    """`dataset_part` names the last dataset part whose games the state includes."""
+    _replace_parquet(state, path, {'dataset_part': dataset_part} if dataset_part else None)
+
+
+def state_dataset_part(path):
+    """The dataset part a saved state was stamped with, or None (unstamped or missing)."""
+    if not os.path.exists(path):
+        return None
+    part = (pq.read_schema(path).metadata or {}).get(b'dataset_part')
+    return part.decode() if part else None
+
+
+def last_dataset_part(dataset_path):
+    """File name of the highest-numbered part in the dataset, or None."""
+    if not os.path.isdir(dataset_path):
+        return None
+    parts = sorted(p for p in os.listdir(dataset_path) if p.startswith('part-'))
+    return parts[-1] if parts else None
+
+
+def _replace_parquet(df, path, metadata=None):
+    # Write beside the target and rename over it, so readers never see half a
+    # file. The dot prefix keeps the temp file out of pyarrow's dataset scans.
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if metadata:
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}), **{k.encode(): v.encode() for k, v in metadata.items()},
+        })
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_dataset(df, dataset_path):
+    """
+    Replace the processed dataset at `dataset_path` with a single part file.
+    The dataset is a directory of parquet parts, readable with pd.read_parquet.
+    """
+    if os.path.isdir(dataset_path):
+        for part in os.listdir(dataset_path):
+            os.remove(os.path.join(dataset_path, part))
+    elif os.path.exists(dataset_path):
+        os.remove(dataset_path)
+    os.makedirs(dataset_path, exist_ok=True)
+    return append_dataset_part(df, dataset_path)
+
+
+def append_dataset_part(df, dataset_path, key=None, after_part=None):
+    """
+    Add `df` to the dataset as a new part file and return its path. With
+    `key` (column names), rows whose key is already in a part numbered after
+    `after_part` (every part when None) are dropped first, so appending again
+    after a run that stopped before saving its state adds nothing twice.
+    Passing the part the state was saved with keeps that check to the parts
+    written since. Returns None when no rows are left.
+    """
+    if os.path.isfile(dataset_path):
+        # Legacy single-file dataset: move it in as the first part, unstamped
+        # since the features it was built with are unknown
+        legacy = pd.read_parquet(dataset_path)
+        os.remove(dataset_path)
+        os.makedirs(dataset_path)
+        _replace_parquet(legacy, os.path.join(dataset_path, "part-00000.parquet"))
+
+    os.makedirs(dataset_path, exist_ok=True)
+    parts = sorted(p for p in os.listdir(dataset_path) if p.startswith('part-'))
+    recent = [p for p in parts if after_part is None or p > after_part]
+    if key is not None and recent:
+        written = pd.concat(
+            [pd.read_parquet(os.path.join(dataset_path, p), columns=list(key)) for p in recent],
+            ignore_index=True,
+        )
+        seen = pd.MultiIndex.from_frame(written).unique()
+        df = df[~pd.MultiIndex.from_frame(df[list(key)]).isin(seen)]
+    if df.empty:
+        return None
+
+    # Number from the highest part, not the count, so a removed part is never overwritten
+    next_part = int(parts[-1][len('part-'):].split('.')[0]) + 1 if parts else 0
+    part_path = os.path.join(dataset_path, f"part-{next_part:05d}.parquet")
+    # Stamped with the feature definitions that built it, for the feature store's version check
+    _replace_parquet(df, part_path, {'feature_version': feature_version()})
+    return part_path
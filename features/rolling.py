@@ -1,23 +1,89 @@
+import numpy as np
 
-def add_rolling_features(games, default_k=5, default_pitch_count=85):
-    games = games.sort_values("game_date").copy()
-
-    games['rolling_K_avg_3'] = (
-        games['strikeouts'].rolling(3).mean().shift(1).fillna(default_k)
-    )
-    games['rolling_K_avg_5'] = (
-        games['strikeouts'].rolling(5).mean().shift(1).fillna(default_k)
-    )
-    games['rolling_pitch_count_5'] = (
-        games['pitch_count'].rolling(5).mean().shift(1).fillna(default_pitch_count)
-    )
-
-    rolling_k_sum = games['strikeouts'].rolling(3).sum().shift(1)
-    rolling_pitch_sum = games['pitch_count'].rolling(5).sum().shift(1)
-    games['rolling_K_rate'] = (
-        (rolling_k_sum / rolling_pitch_sum)
-        .replace([float('inf'), -float('inf')], None)
-        .fillna(0.055)
-    )
-
-    return games
\ No newline at end of file
+# Window features over each pitcher's previous games. 'mean' averages `col`
+# over `window` games; 'ratio' divides the `window` sum of `col` by the
+# `den_window` sum of `den_col`. `fill` is used until a pitcher has enough
+# games (or the ratio is undefined): a number, or the name of an
+# add_rolling_features keyword.
+ROLLING_CONFIG = [
+    {'name': 'rolling_K_avg_3', 'how': 'mean', 'col': 'strikeouts', 'window': 3, 'fill': 'default_k'},
+    {'name': 'rolling_K_avg_5', 'how': 'mean', 'col': 'strikeouts', 'window': 5, 'fill': 'default_k'},
+    {'name': 'rolling_pitch_count_5', 'how': 'mean', 'col': 'pitch_count', 'window': 5,
+     'fill': 'default_pitch_count'},
+    {'name': 'rolling_K_rate', 'how': 'ratio', 'col': 'strikeouts', 'window': 3,
+     'den_col': 'pitch_count', 'den_window': 5, 'fill': 0.055},
+]
+
+
+def rolling_inputs(config):
+    """Game columns the windows in `config` read."""
+    return list(dict.fromkeys(col for spec in config for col in (spec['col'], spec.get('den_col')) if col))
+
+
+ROLLING_FEATURES = [spec['name'] for spec in ROLLING_CONFIG]
+ROLLING_INPUTS = rolling_inputs(ROLLING_CONFIG)
+
+# Longest window above; that many trailing games are enough to extend them
+MAX_WINDOW = max(max(spec['window'], spec.get('den_window', 0)) for spec in ROLLING_CONFIG)
+
+
+def _group_positions(n_rows, keys=None):
+    """Position of each row within its run of equal keys (0 for the first game)."""
+    rows = np.arange(n_rows)
+    if keys is None:
+        return rows
+    starts = np.ones(len(keys), dtype=bool)
+    starts[1:] = keys[1:] != keys[:-1]
+    return rows - np.maximum.accumulate(np.where(starts, rows, 0))
+
+
+def _lagged_sum(values, window, position):
+    """
+    Sum of the `window` rows before each row, NaN where fewer than `window`
+    earlier rows share its group or any of them is NaN. Prefix sums over
+    the whole contiguous column make this one subtraction per row.
+    """
+    missing = np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values))))
+    gaps = np.concatenate(([0], np.cumsum(missing)))
+    rows = np.arange(len(values))
+    start = np.maximum(rows - window, 0)
+    total = sums[rows] - sums[start]
+    return np.where((position >= window) & (gaps[rows] == gaps[start]), total, np.nan)
+
+
+def add_rolling_features(games, default_k=5, default_pitch_count=85, group_col=None, config=ROLLING_CONFIG):
+    """
+    Add every `config` window feature in one pass over `games` sorted by
+    (group_col, game_date). With group_col set, windows never span two
+    groups (e.g. two pitchers). Results match pandas rolling(window) means
+    and sums shifted by one game.
+    """
+    defaults = {'default_k': default_k, 'default_pitch_count': default_pitch_count}
+    sort_cols = [group_col, 'game_date'] if group_col else ['game_date']
+    games = games.sort_values(sort_cols).copy()
+    position = _group_positions(len(games), games[group_col].to_numpy() if group_col else None)
+
+    columns = {col: np.ascontiguousarray(games[col].to_numpy(dtype=float)) for col in rolling_inputs(config)}
+    sums = {}
+
+    def lagged_sum(col, window):
+        if (col, window) not in sums:
+            sums[col, window] = _lagged_sum(columns[col], window, position)
+        return sums[col, window]
+
+    for spec in config:
+        fill = defaults.get(spec['fill'], spec['fill'])
+        if spec['how'] == 'mean':
+            values = lagged_sum(spec['col'], spec['window']) / spec['window']
+        elif spec['how'] == 'ratio':
+            numerator = lagged_sum(spec['col'], spec['window'])
+            denominator = lagged_sum(spec['den_col'], spec['den_window'])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values = numerator / denominator
+            values[np.isinf(values)] = np.nan
+        else:
+            raise ValueError(f"Unknown rolling feature kind '{spec['how']}' for {spec['name']}")
+        games[spec['name']] = np.where(np.isnan(values), fill, values)
+
+    return games
@@ -0,0 +1,120 @@
+import json
+import os
+
+import pandas as pd
+
+from features.dynamic_opponent import opponent_k_pct_from_team_days, team_day_counts
+from features.park_factors import park_day_counts, park_factors_from_park_days
+from ingest.statcast_store import RAW_PATH, TEAM_COLUMNS, load_statcast
+
+CONTEXT_PATH = "data/processed/team_context"
+
+# In-process copy so several stages of one run share a single load
+_CONTEXT = {}
+
+
+def raw_fingerprints(season, root):
+    """
+    One fingerprint per stored game_date (file names, sizes and mtimes), or a
+    single '*' entry for a legacy one-file season.
+    """
+    season_dir = os.path.join(root, f"season={season}")
+    if os.path.isdir(season_dir):
+        prints = {}
+        for day_dir in os.scandir(season_dir):
+            if not day_dir.name.startswith('game_date='):
+                continue
+            files = sorted(os.scandir(day_dir.path), key=lambda f: f.name)
+            prints[day_dir.name.split('=', 1)[1]] = ';'.join(
+                f"{f.name}:{f.stat().st_size}:{f.stat().st_mtime_ns}" for f in files
+            )
+        return prints
+
+    legacy_file = os.path.join(root, f"statcast_raw_{season}.parquet")
+    if os.path.exists(legacy_file):
+        stat = os.stat(legacy_file)
+        return {'*': f"{stat.st_size}:{stat.st_mtime_ns}"}
+    return {}
+
+
+def _read_cache(cache_dir):
+    manifest_file = os.path.join(cache_dir, "manifest.json")
+    if not os.path.exists(manifest_file):
+        return {}, None, None
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    team_days = pd.read_parquet(os.path.join(cache_dir, "team_days.parquet"))
+    park_days = pd.read_parquet(os.path.join(cache_dir, "park_days.parquet"))
+    return manifest['fingerprints'], team_days, park_days
+
+
+def _write_cache(cache_dir, prints, team_days, park_days):
+    os.makedirs(cache_dir, exist_ok=True)
+    team_days.to_parquet(os.path.join(cache_dir, "team_days.parquet"), index=False)
+    park_days.to_parquet(os.path.join(cache_dir, "park_days.parquet"), index=False)
+    data_through = max((d for d in prints if d != '*'), default=None)
+    if data_through is None and not team_days.empty:
+        data_through = team_days['game_date'].max().strftime("%Y-%m-%d")
+    with open(os.path.join(cache_dir, "manifest.json"), "w") as f:
+        json.dump({'data_through': data_through, 'fingerprints': prints}, f, indent=2)
+
+
+def load_team_context(season, root=RAW_PATH, cache_dir=CONTEXT_PATH):
+    """
+    Per-date team strikeout counts and park counts for a season:
+        (team_days ['game_date', 'Team', 'so', 'pa'],
+         park_days ['game_date', 'home_team', 'k', 'n'])
+
+    Persisted under `cache_dir`. Only dates whose raw partitions changed
+    since the last run are recounted from the raw store.
+    """
+    season_cache = os.path.join(cache_dir, f"season={season}")
+    prints = raw_fingerprints(season, root)
+
+    key = (season, os.path.abspath(root), os.path.abspath(cache_dir))
+    if key in _CONTEXT and _CONTEXT[key][0] == prints:
+        return _CONTEXT[key][1], _CONTEXT[key][2]
+
+    cached_prints, team_days, park_days = _read_cache(season_cache)
+    stale = sorted(d for d in prints if cached_prints.get(d) != prints[d])
+    removed = [d for d in cached_prints if d not in prints]
+
+    if stale or removed or team_days is None:
+        if team_days is None or '*' in stale or '*' in removed:
+            pbp = load_statcast(season, columns=TEAM_COLUMNS, root=root)
+            team_days = team_day_counts(pbp)
+            park_days = park_day_counts(pbp)
+        else:
+            changed = pd.to_datetime(stale + removed)
+            team_days = team_days[~team_days['game_date'].isin(changed)]
+            park_days = park_days[~park_days['game_date'].isin(changed)]
+            if stale:
+                pbp = load_statcast(season, columns=TEAM_COLUMNS, start_date=stale[0], end_date=stale[-1], root=root)
+                pbp = pbp[pbp['game_date'].isin(pd.to_datetime(stale))]
+                team_days = pd.concat([team_days, team_day_counts(pbp)], ignore_index=True)
+                park_days = pd.concat([park_days, park_day_counts(pbp)], ignore_index=True)
+        _write_cache(season_cache, prints, team_days, park_days)
+
+    _CONTEXT[key] = (prints, team_days, park_days)
+    return team_days, park_days
+
+
+def _between(days, start_date, end_date):
+    if start_date is not None:
+        days = days[days['game_date'] >= pd.Timestamp(start_date)]
+    if end_date is not None:
+        days = days[days['game_date'] <= pd.Timestamp(end_date)]
+    return days
+
+
+def opponent_k_table(season, start_date=None, end_date=None, default_k_pct=0.055,
+                     root=RAW_PATH, cache_dir=CONTEXT_PATH):
+    """compute_opponent_k_pct_dynamic over [start_date, end_date], from the cache."""
+    team_days, _ = load_team_context(season, root, cache_dir)
+    return opponent_k_pct_from_team_days(_between(team_days, start_date, end_date), default_k_pct)
+
+
+def park_factor_table(season, start_date=None, end_date=None, root=RAW_PATH, cache_dir=CONTEXT_PATH):
+    """compute_k_park_factors over [start_date, end_date], from the cache."""
+    _, park_days = load_team_context(season, root, cache_dir)
+    return park_factors_from_park_days(_between(park_days, start_date, end_date))
@@ -1,26 +1,24 @@
-from pybaseball import statcast, cache
 from datetime import date, timedelta
 
-from features.team_abbr_map import team_fix_map
+from features.park_factors import compute_k_park_factors as park_factors_from_statcast
+from features.team_context import park_factor_table
+from ingest.statcast_store import has_statcast
+
+RAW_PATH = "../data/raw/statcast"
+CONTEXT_PATH = "../data/processed/team_context"
 
 
 def compute_k_park_factors(start, end=None):
     if end is None:
         end = (date.today() - timedelta(days=1)).isoformat()
 
-    df = statcast(start, end)
-
-    df = df[df['pitch_type'].notnull()]
-    df['is_k'] = df['events'] == 'strikeout'
-    k_by_park = df.groupby('home_team').agg({
-        'is_k': 'sum',
-        'batter': 'count' # rough PA proxy
-    }).reset_index()
-
-    k_by_park['k_pct'] = k_by_park['is_k'] / k_by_park['batter']
-    league_avg = df['is_k'].sum() / df['batter'].count()
-    k_by_park['K_park_factor'] = k_by_park['k_pct'] / league_avg
-
-    k_by_park['Team_abbr'] = k_by_park['home_team'].map(team_fix_map).fillna(k_by_park['home_team'])
+    season = int(start[:4])
+    if has_statcast(season, RAW_PATH):
+        # Same cached table the dataset scripts use — no live refetch
+        park_df = park_factor_table(season, start, end, root=RAW_PATH, cache_dir=CONTEXT_PATH)
+    else:
+        from pybaseball import statcast
+        df = statcast(start, end)
+        park_df = park_factors_from_statcast(start, end, source_df=df)
 
-    k_by_park[['Team_abbr', 'K_park_factor']].to_csv("../data/raw/park_factors_2025.csv")
\ No newline at end of file
+    park_df.to_csv(f"../data/raw/park_factors_{season}.csv")
@@ -1,83 +1,103 @@
+import argparse
 import datetime
 import json
-import sys
-import requests
+import os
 from pathlib import Path
 import pandas as pd
 
-def get_ud_strikeouts_json():
-    algolia_object_id = "PickemStat_311b6775-4d03-4466-8ab9-776442468b27"
-    url = "https://api.underdogfantasy.com/v2/pickem_search/search_results"
+from features.latest_index import latest_index_path
+from ingest.player_ids import mlbam_from_names
+from ingest.ud_lines import (
+    HISTORY_PATH, UD_URL, fetch_lines_json, make_session, parse_strikeout_frame, poll_lines,
+    record_snapshot, strikeout_params
+)
+from instrumentation import add_arguments, configure_from_args, stage, summary
 
-    params = {
-        "sport_id": "HOME",
-        "algolia_object_id": algolia_object_id
-    }
-    response = requests.get(url=url, params=params)
-    response.raise_for_status()
-    return response.json()
+LINES_PATH = "data/lines"
+PROCESSED_PATH = "data/processed"
+
+_SESSION = None
+
+def get_ud_strikeouts_json():
+    global _SESSION
+    _SESSION = _SESSION or make_session()
+    with stage("fetch_lines") as s:
+        payload, _ = fetch_lines_json(_SESSION, UD_URL, strikeout_params())
+        s.extra['bytes'] = len(payload)
+    return json.loads(payload)
 
 def load_json(path: str) -> dict:
     return json.loads(Path(path).read_text(encoding="utf-8"))
 
+def season_pitcher_ids(season: int, processed_path: str = PROCESSED_PATH):
+    """MLBAM ids in the season's latest-row index, or None before it exists."""
+    path = latest_index_path(season, processed_path)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path, columns=['pitcher_id'])['pitcher_id']
+
+def save_daily_lines(lines: pd.DataFrame, lines_path: str = LINES_PATH) -> pd.DataFrame:
+    """
+    Write the current board to strikeouts_<today>.csv with crosswalk pitcher
+    ids, matched among this season's pitchers when their index exists.
+    Ambiguous names get no id and are left to resolve_player_ids.
+    """
+    df = lines.drop(columns=['line_id', 'appearance_id', 'status'])
+    if not df.empty:
+        candidates = season_pitcher_ids(datetime.date.today().year)
+        df.insert(1, 'pitcher_id', mlbam_from_names(df['player'], candidates=candidates).to_numpy())
+    date = datetime.date.today().isoformat()
+    df.to_csv(f"{lines_path}/strikeouts_{date}.csv", index=False, encoding='utf-8')
+    return df
+
+def ingest_strikeout_lines(data: dict) -> pd.DataFrame:
+    """Parse a payload, record it in the line history and save today's lines; returns the saved frame."""
+    with stage("parse_lines") as s:
+        lines = parse_strikeout_frame(data)
+        s.rows_out = len(lines)
+    with stage("record_snapshot", rows_in=len(lines)) as s:
+        s.rows_out = len(record_snapshot(lines))
+    with stage("save_daily_lines", rows_in=len(lines)) as s:
+        df = save_daily_lines(lines)
+        s.rows_out = len(df)
+    return df
+
 def parse_strikeout_lines(data: dict) -> list[dict]:
     """
     From the Underdog JSON payload, return a list of dicts:
     {
       player,
+      pitcher_id,
       k_line,
       over_american, over_decimal, over_multiplier,
       under_american, under_decimal, under_multiplier
     }
     but only for pitchers marked as starters.
     """
-
-    starter_ids = {
-        app['id']
-        for app in data.get('appearances', [])
-        if any(badge.get('label')=='Starting' and badge.get('value')=='Yes'
-               for badge in app.get('badges', []))
-    }
-
-    results = []
-    for line in data.get('over_under_lines', []):
-        appearance_id = (
-            line.get('over_under', {})
-            .get('appearance_stat', {})
-            .get('appearance_id')
-        )
-        if appearance_id not in starter_ids:
-            continue
-
-        player = line['options'][0]['selection_header']
-        k_line = line.get('stat_value')
-
-        over_opt = next(opt for opt in line['options'] if opt['choice']=='higher')
-        under_opt = next(opt for opt in line['options'] if opt['choice']=='lower')
-
-        results.append({
-            'player': player,
-            'k_line': k_line,
-            'over_american_price': over_opt.get('american_price'),
-            'over_decimal_price': over_opt.get('decimal_price'),
-            'over_payout_multiplier': over_opt.get('payout_multiplier'),
-            'under_american_price': under_opt.get('american_price'),
-            'under_decimal_price': under_opt.get('decimal_price'),
-            'under_payout_multiplier': under_opt.get('payout_multiplier'),
-        })
-
-    df = pd.DataFrame(results)
-    date = datetime.date.today().isoformat()
-    df.to_csv(f"data/lines/strikeouts_{date}.csv", index=False, encoding='utf-8')
-
-    return results
+    df = ingest_strikeout_lines(data)
+    return [
+        {k: (None if pd.isna(v) else v) for k, v in row.items()}
+        for row in df.astype(object).to_dict('records')
+    ]
 
 def main():
-    # if len(sys.argv) != 2:
-    #     print(f"Usage: {sys.argv[0]} <path-to-json-file>")
-    #     sys.exit(1)
+    parser = argparse.ArgumentParser(description="Fetch Underdog strikeout lines")
+    parser.add_argument("--json", help="Parse a saved payload instead of fetching")
+    parser.add_argument("--poll", type=float, help="Keep polling every POLL seconds, recording line moves")
+    parser.add_argument("--iterations", type=int, help="Stop after this many polls")
+    parser.add_argument("--history", default=HISTORY_PATH)
+    add_arguments(parser)
+    args = parser.parse_args()
+    configure_from_args(args)
+
+    if args.poll:
+        def on_change(lines):
+            with stage("save_daily_lines", rows_in=len(lines)):
+                save_daily_lines(lines)
+        poll_lines(args.poll, args.iterations, path=args.history, on_change=on_change)
+        return
 
-    raw_json = get_ud_strikeouts_json()
+    raw_json = load_json(args.json) if args.json else get_ud_strikeouts_json()
     lines = parse_strikeout_lines(raw_json)
 
     print(f"{'Player':20} {'K':>4}     {'Over (A/D xM)':20}    {'Under (A/D xM)'}")
@@ -86,6 +106,7 @@ def main():
         over_fmt = f"{l['over_american_price']}/{l['over_decimal_price']}x{l['over_payout_multiplier']}"
         under_fmt = f"{l['under_american_price']}/{l['under_decimal_price']}x{l['under_payout_multiplier']}"
         print(f"{l['player']:20} {l['k_line']:>4}     {over_fmt:20} {under_fmt}")
+    summary()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,130 @@
+import os
+import time
+
+import pandas as pd
+
+from features.latest_index import match_name_keys, normalize_name
+
+PLAYER_IDS_PATH = "data/raw/player_ids.parquet"
+REGISTER_COLUMNS = ['key_mlbam', 'key_fangraphs', 'name_first', 'name_last', 'mlb_played_last']
+# A missing id only triggers a new register download once the cache is this old
+REFRESH_AFTER = 24 * 60 * 60
+
+# In-process copy, reused until the file on disk changes
+_PLAYER_IDS = {}
+# Paths whose register download failed in this process; not retried
+_REFRESH_FAILED = set()
+
+
+def pybaseball_register():
+    from pybaseball import chadwick_register
+    return chadwick_register()
+
+
+def compact_register(register):
+    """
+    MLB players from the Chadwick register with 32-bit ids (key_fangraphs is
+    -1 where FanGraphs has no id), a display name and a normalized name key.
+    """
+    register = register[REGISTER_COLUMNS].dropna(subset=['key_mlbam', 'name_last'])
+    register = register[register['key_mlbam'] > 0]
+    ids = pd.DataFrame({
+        'key_mlbam': register['key_mlbam'].astype('int32'),
+        'key_fangraphs': register['key_fangraphs'].fillna(-1).astype('int32'),
+        'name': (register['name_first'].fillna('') + ' ' + register['name_last']).str.strip(),
+        'mlb_played_last': register['mlb_played_last'].fillna(0).astype('int16'),
+    })
+    ids['name_key'] = ids['name'].map(normalize_name)
+    return ids.drop_duplicates('key_mlbam', keep='last').sort_values('key_mlbam').reset_index(drop=True)
+
+
+def refresh_player_ids(path=PLAYER_IDS_PATH, register_fn=None):
+    """
+    Download the register and merge it into the crosswalk at `path`. Rows
+    already cached are kept, so players dropped from a later register still
+    resolve.
+    """
+    fresh = compact_register((register_fn or pybaseball_register)())
+    if os.path.exists(path):
+        fresh = pd.concat([pd.read_parquet(path), fresh], ignore_index=True)
+        fresh = fresh.drop_duplicates('key_mlbam', keep='last').sort_values('key_mlbam').reset_index(drop=True)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fresh.to_parquet(path, index=False)
+    _PLAYER_IDS.pop(os.path.abspath(path), None)
+    return fresh
+
+
+def load_player_ids(path=PLAYER_IDS_PATH, fangraphs_ids=None, register_fn=None):
+    """
+    The FanGraphs <-> MLBAM <-> name crosswalk:
+        ['key_mlbam', 'key_fangraphs', 'name', 'mlb_played_last', 'name_key']
+
+    Served from `path` with no network access. The register is downloaded
+    only when there is no cache yet, or when some of `fangraphs_ids` are
+    missing and the cache is older than REFRESH_AFTER. A failed download
+    falls back to the cache.
+    """
+    key = os.path.abspath(path)
+    if os.path.exists(path):
+        mtime = os.stat(path).st_mtime
+        if key not in _PLAYER_IDS or _PLAYER_IDS[key][0] != mtime:
+            _PLAYER_IDS[key] = (mtime, pd.read_parquet(path))
+        ids = _PLAYER_IDS[key][1]
+    else:
+        mtime, ids = None, None
+
+    missing = []
+    if ids is not None and fangraphs_ids is not None:
+        missing = sorted(set(fangraphs_ids) - set(ids['key_fangraphs']))
+
+    stale = missing and time.time() - mtime > REFRESH_AFTER and key not in _REFRESH_FAILED
+    if ids is None or stale:
+        try:
+            ids = refresh_player_ids(path, register_fn)
+        except Exception as e:
+            _REFRESH_FAILED.add(key)
+            if ids is None:
+                raise FileNotFoundError(f"No player id cache at {path} and the register download failed: {e}")
+            print(f"⚠️ Register refresh failed, using cached ids for {len(missing)} unknown FanGraphs ids: {e}")
+    return ids
+
+
+def mlbam_from_fangraphs(fangraphs_ids, path=PLAYER_IDS_PATH):
+    """MLBAM ids for `fangraphs_ids`, in order; unknown ids map to <NA>."""
+    fangraphs_ids = list(fangraphs_ids)
+    ids = load_player_ids(path, fangraphs_ids=fangraphs_ids)
+    by_fangraphs = ids[ids['key_fangraphs'] > 0].drop_duplicates('key_fangraphs').set_index('key_fangraphs')
+    return pd.Series(fangraphs_ids).map(by_fangraphs['key_mlbam']).astype('Int64')
+
+
+def load_pitcher_ids(starter_csv, path=PLAYER_IDS_PATH):
+    """(Name, MLBAM id) for every starter in a get_top_starters CSV."""
+    df = pd.read_csv(starter_csv)
+    df['key_mlbam'] = mlbam_from_fangraphs(df['IDfg'], path).to_numpy()
+    for name in df.loc[df['key_mlbam'].isna(), 'Name']:
+        print(f"⚠️ No MLBAM id for {name}")
+    df = df[df['key_mlbam'].notna()]
+    return list(zip(df['Name'], df['key_mlbam'].astype(int)))
+
+
+def mlbam_from_names(players, path=PLAYER_IDS_PATH, candidates=None):
+    """
+    MLBAM ids for display names (e.g. Underdog `player` strings), matched on
+    normalize_name or on first + last name (match_name_keys). Only players
+    in `candidates` (MLBAM ids, e.g. a season's latest-index pitchers) are
+    considered when it is given. Names that fit several players map to
+    <NA>, as do unresolved names, so callers fall back to their own lookup.
+    """
+    ids = load_player_ids(path)
+    if candidates is not None:
+        ids = ids[ids['key_mlbam'].isin(list(candidates))]
+    return match_name_keys(players, ids['name_key'], ids['key_mlbam'])
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", default=PLAYER_IDS_PATH)
+    args = parser.parse_args()
+    ids = refresh_player_ids(args.path)
+    print(f"✅ Saved {len(ids)} player ids to {args.path}")
@@ -0,0 +1,136 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+RAW_PATH = "data/raw/statcast"
+
+# Statcast code columns with a small set of repeated values
+CATEGORY_COLUMNS = [
+    'home_team', 'away_team', 'inning_topbot', 'description', 'events',
+    'pitch_type', 'pitch_name', 'type', 'bb_type', 'stand', 'p_throws',
+    'if_fielding_alignment', 'of_fielding_alignment',
+]
+ID_COLUMNS = [
+    'pitcher', 'batter', 'game_pk', 'on_1b', 'on_2b', 'on_3b',
+    'fielder_2', 'fielder_3', 'fielder_4', 'fielder_5',
+    'fielder_6', 'fielder_7', 'fielder_8', 'fielder_9',
+]
+
+# Columns read by the feature pipeline
+PITCHER_COLUMNS = [
+    'pitcher', 'game_date', 'description', 'events', 'inning', 'pitch_type',
+    'home_team', 'away_team', 'inning_topbot', 'pitcher_days_since_prev_game',
+]
+TEAM_COLUMNS = ['game_date', 'home_team', 'away_team', 'inning_topbot', 'events', 'pitch_type', 'batter']
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('season', pa.int16()), ('game_date', pa.string())]), flavor='hive'
+)
+DATE_PARTITIONING = ds.partitioning(pa.schema([('game_date', pa.string())]), flavor='hive')
+
+
+def compact_statcast(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a raw Statcast frame: categoricals for code columns and 32-bit
+    player/game IDs (nullable Int32 where the column has gaps).
+    """
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in ID_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('Int32' if df[col].isna().any() else 'int32')
+    return df
+
+
+def write_statcast(df: pd.DataFrame, season: int, root: str = RAW_PATH) -> None:
+    """
+    Write raw Statcast rows to `root` partitioned by season and game_date.
+    Dates present in `df` replace whatever was stored for them before.
+    """
+    df = compact_statcast(df)
+    df['season'] = season
+    df['game_date'] = pd.to_datetime(df['game_date']).dt.strftime('%Y-%m-%d')
+    df = df.sort_values(['game_date', 'pitcher'])
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Keep code columns string-valued even when a batch has no values for them
+    for col in CATEGORY_COLUMNS:
+        if col in table.column_names:
+            i = table.schema.get_field_index(col)
+            table = table.set_column(
+                i, col, table.column(col).cast(pa.dictionary(pa.int32(), pa.string()))
+            )
+    ds.write_dataset(
+        table, root,
+        format='parquet',
+        partitioning=PARTITIONING,
+        basename_template='part-{i}.parquet',
+        existing_data_behavior='delete_matching',
+    )
+
+
+def _season_path(season, root):
+    return os.path.join(root, f"season={season}")
+
+
+def _legacy_path(season, root):
+    return os.path.join(root, f"statcast_raw_{season}.parquet")
+
+
+def has_statcast(season: int, root: str = RAW_PATH) -> bool:
+    return os.path.isdir(_season_path(season, root)) or os.path.exists(_legacy_path(season, root))
+
+
+def statcast_columns(season: int, root: str = RAW_PATH) -> list:
+    """Column names stored for one season, without reading any rows."""
+    if os.path.isdir(_season_path(season, root)):
+        dataset = ds.dataset(_season_path(season, root), format='parquet', partitioning=DATE_PARTITIONING)
+    else:
+        dataset = ds.dataset(_legacy_path(season, root), format='parquet')
+    return dataset.schema.names
+
+
+def load_statcast(season: int, columns=None, start_date=None, end_date=None,
+                  pitchers=None, root: str = RAW_PATH) -> pd.DataFrame:
+    """
+    Load raw Statcast rows for one season, reading only `columns` (all when
+    None) and only the game_date partitions in [start_date, end_date].
+    `pitchers` limits rows to those MLBAM ids. game_date comes back as
+    datetime64.
+
+    Falls back to the single-file statcast_raw_{season}.parquet layout.
+    """
+    if os.path.isdir(_season_path(season, root)):
+        dataset = ds.dataset(_season_path(season, root), format='parquet', partitioning=DATE_PARTITIONING)
+        date_col = ds.field('game_date')
+    else:
+        dataset = ds.dataset(_legacy_path(season, root), format='parquet')
+        # Older files store game_date as a timestamp or a string
+        if pa.types.is_timestamp(dataset.schema.field('game_date').type):
+            date_col = ds.field('game_date').cast(pa.string())
+        else:
+            date_col = ds.field('game_date')
+
+    filters = []
+    if start_date is not None:
+        filters.append(date_col >= pd.Timestamp(start_date).strftime('%Y-%m-%d'))
+    if end_date is not None:
+        next_day = pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+        filters.append(date_col < next_day.strftime('%Y-%m-%d'))
+    if pitchers is not None:
+        filters.append(ds.field('pitcher').isin([int(p) for p in pitchers]))
+    expr = None
+    for f in filters:
+        expr = f if expr is None else expr & f
+
+    if columns is None:
+        columns = dataset.schema.names
+
+    df = dataset.to_table(columns=list(columns), filter=expr).to_pandas()
+    if 'game_date' in df.columns:
+        df['game_date'] = pd.to_datetime(df['game_date'])
+    return df
@@ -0,0 +1,181 @@
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from props.board import BOARD_COLUMNS, parse_board
+
+UD_URL = "https://api.underdogfantasy.com/v2/pickem_search/search_results"
+STRIKEOUTS_OBJECT_ID = "PickemStat_311b6775-4d03-4466-8ab9-776442468b27"
+HISTORY_PATH = "data/lines/history"
+
+KEY_COLUMNS = ['line_id', 'appearance_id', 'player']
+VALUE_COLUMNS = [
+    'k_line', 'status',
+    'over_american_price', 'over_decimal_price', 'over_payout_multiplier',
+    'under_american_price', 'under_decimal_price', 'under_payout_multiplier',
+]
+LINE_COLUMNS = KEY_COLUMNS + VALUE_COLUMNS
+
+SNAPSHOT_PARTITIONING = ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive')
+
+
+def make_session(pool_size=4, retries=3):
+    """A keep-alive session that retries transient failures with backoff."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size,
+        max_retries=Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=('GET',)),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def strikeout_params(object_id=STRIKEOUTS_OBJECT_ID):
+    return {"sport_id": "HOME", "algolia_object_id": object_id}
+
+
+def fetch_lines_json(session, url=UD_URL, params=None, validators=None, timeout=10):
+    """
+    GET the pick'em payload as raw bytes. `validators` from the previous
+    call are sent as If-None-Match / If-Modified-Since; when the server
+    answers 304 the payload is None. Returns (payload, validators).
+    """
+    validators = validators or {}
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+
+    response = session.get(url, params=params, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        return None, validators
+    response.raise_for_status()
+    return response.content, {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+
+
+def parse_strikeout_frame(payload):
+    """
+    Starter strikeout lines from an Underdog strikeouts payload (bytes, str
+    or an already-decoded dict) as a frame with LINE_COLUMNS and the
+    match_id of each pitcher's game.
+    """
+    tables = parse_board(payload)
+    lines = pd.concat(
+        [table[table['starter'].eq(True)] for table in tables.values()] or [pd.DataFrame(columns=BOARD_COLUMNS)],
+        ignore_index=True,
+    )
+    lines = lines.rename(columns={'line': 'k_line'})[LINE_COLUMNS + ['match_id']]
+    lines['k_line'] = pd.to_numeric(lines['k_line'])
+    return lines
+
+
+def _line_hashes(lines):
+    return pd.util.hash_pandas_object(lines[VALUE_COLUMNS], index=False).to_numpy()
+
+
+def record_snapshot(lines, taken_at=None, path=HISTORY_PATH):
+    """
+    Append the lines that are new or changed since the previous snapshot,
+    plus a 'removed' row for every line that disappeared, to the history
+    under `path` (parquet parts partitioned by date). The last snapshot is
+    kept in `path`/current.parquet for the comparison. Returns the rows
+    written, which are empty when nothing moved.
+    """
+    taken_at = pd.Timestamp.now(tz='UTC') if taken_at is None else pd.Timestamp(taken_at)
+    current_file = os.path.join(path, "current.parquet")
+
+    lines = lines[LINE_COLUMNS].drop_duplicates('line_id', keep='last').assign(value_hash=_line_hashes)
+    if os.path.exists(current_file):
+        previous = pd.read_parquet(current_file)
+    else:
+        previous = lines.iloc[:0]
+
+    known = lines['line_id'].map(previous.set_index('line_id')['value_hash'])
+    changed = lines[known.isna() | (known != lines['value_hash'])]
+    removed = previous[~previous['line_id'].isin(lines['line_id'])]
+    removed = removed[KEY_COLUMNS].assign(status='removed')
+
+    changes = pd.concat([changed.drop(columns='value_hash'), removed], ignore_index=True)
+    if not changes.empty:
+        changes.insert(0, 'taken_at', taken_at)
+        day_dir = os.path.join(path, "snapshots", f"date={taken_at:%Y-%m-%d}")
+        os.makedirs(day_dir, exist_ok=True)
+        changes.to_parquet(os.path.join(day_dir, f"part-{taken_at:%H%M%S%f}.parquet"), index=False)
+
+    os.makedirs(path, exist_ok=True)
+    lines.to_parquet(current_file + ".tmp", index=False)
+    os.replace(current_file + ".tmp", current_file)
+    return changes
+
+
+def load_line_history(path=HISTORY_PATH, start_date=None, end_date=None):
+    """Every recorded change, oldest first."""
+    snapshots = os.path.join(path, "snapshots")
+    if not os.path.isdir(snapshots):
+        return pd.DataFrame(columns=['taken_at'] + LINE_COLUMNS)
+    dataset = ds.dataset(snapshots, format='parquet', partitioning=SNAPSHOT_PARTITIONING)
+    expr = None
+    if start_date is not None:
+        expr = ds.field('date') >= pd.Timestamp(start_date).strftime('%Y-%m-%d')
+    if end_date is not None:
+        before = ds.field('date') <= pd.Timestamp(end_date).strftime('%Y-%m-%d')
+        expr = before if expr is None else expr & before
+    history = dataset.to_table(filter=expr).to_pandas()
+    return history.drop(columns='date').sort_values('taken_at', kind='stable').reset_index(drop=True)
+
+
+def lines_as_of(history, when):
+    """The board as it stood at `when`, rebuilt from a change history."""
+    history = history[history['taken_at'] <= pd.Timestamp(when)]
+    board = history.drop_duplicates('line_id', keep='last')
+    return board[board['status'] != 'removed'].reset_index(drop=True)
+
+
+def poll_lines(interval=300, iterations=None, url=UD_URL, params=None, path=HISTORY_PATH,
+               session=None, on_change=None):
+    """
+    Poll `url` every `interval` seconds (forever unless `iterations` is
+    given), recording changed lines with record_snapshot. `on_change` is
+    called with the full current board whenever something moved. Network
+    errors and unreadable payloads are logged and the polling goes on.
+    """
+    from requests import RequestException
+    session = session or make_session()
+    params = params or strikeout_params()
+    validators = None
+    polls = 0
+    while iterations is None or polls < iterations:
+        started = time.monotonic()
+        previous = validators
+        try:
+            payload, validators = fetch_lines_json(session, url, params, validators)
+            lines = None if payload is None else parse_strikeout_frame(payload)
+        except RequestException as e:
+            print(f"⚠️ Underdog poll failed: {e}")
+        except ValueError as e:
+            # Truncated or invalid JSON: forget its validators so the next poll refetches in full
+            print(f"⚠️ Unreadable Underdog payload: {e}")
+            validators = previous
+        else:
+            if lines is None:
+                print("⏸️ Board not modified")
+            else:
+                changes = record_snapshot(lines, path=path)
+                print(f"📈 {len(lines)} lines, {len(changes)} changed")
+                if not changes.empty and on_change is not None:
+                    on_change(lines)
+        polls += 1
+        if iterations is None or polls < iterations:
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
@@ -0,0 +1,221 @@
+"""
+Stage timing for the pipeline: scripts, ingest and the CLI.
+
+    with stage("load_statcast") as s:
+        df = load_statcast(...)
+        s.rows_out = len(df)
+
+Every stage appends one JSON line to the stage log with wall seconds,
+process CPU seconds (every thread's, so worker pools and stages running
+concurrently in other threads count too), rows in/out, RSS at entry and peak RSS while it ran. Stages nest
+('generate/enrich'). One stage per run can also be profiled with cProfile
+(or pyinstrument, when installed) into the profile directory.
+"""
+import cProfile
+import collections
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+STAGE_LOG_PATH = "data/logs/stages.jsonl"
+PROFILE_PATH = "data/logs/profiles"
+# How often the RSS sampler looks at /proc while a stage runs
+RSS_INTERVAL = 0.01
+
+_CONFIG = {
+    'log_path': STAGE_LOG_PATH,
+    'profile_stage': None,
+    'profile_path': PROFILE_PATH,
+    'profiler': 'cprofile',
+    'run_id': uuid.uuid4().hex[:12],
+    'script': os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else None,
+}
+# Names of the stages currently open in each thread, outermost first
+_LOCAL = threading.local()
+# Most records kept for summary(); long-running commands (poll, serve, live)
+# may never print one
+MAX_RECORDS = 10_000
+# Records written in this process since the last summary()
+_RECORDS = collections.deque(maxlen=MAX_RECORDS)
+_WRITE_LOCK = threading.Lock()
+
+
+def configure(log_path=None, profile_stage=None, profile_path=None, profiler=None, script=None):
+    """Set where records go and which stage to profile; None keeps the current setting."""
+    for key, value in (('log_path', log_path), ('profile_stage', profile_stage),
+                       ('profile_path', profile_path), ('profiler', profiler), ('script', script)):
+        if value is not None:
+            _CONFIG[key] = value
+
+
+def add_arguments(parser):
+    """--stage-log, --profile-stage and --profiler for a script's argparse parser."""
+    parser.add_argument("--stage-log", default=STAGE_LOG_PATH, help="JSON-lines stage timing log")
+    parser.add_argument("--profile-stage", help="Profile this stage (e.g. 'generate/enrich')")
+    parser.add_argument("--profiler", choices=["cprofile", "pyinstrument"], default="cprofile")
+
+
+def configure_from_args(args):
+    configure(log_path=args.stage_log, profile_stage=args.profile_stage, profiler=args.profiler)
+
+
+def _rss_bytes():
+    """Current resident set size, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _max_rss_bytes():
+    """Process high-water RSS; ru_maxrss is KiB on Linux and bytes on macOS."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _RssSampler(threading.Thread):
+    """Tracks the largest RSS seen until stopped."""
+
+    def __init__(self, start_rss):
+        super().__init__(daemon=True)
+        self.peak = start_rss
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(RSS_INTERVAL):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.peak = max(self.peak, _rss_bytes())
+        return self.peak
+
+
+class Stage:
+    """What a running stage reports; set rows_in / rows_out and any extra fields."""
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.extra = {}
+
+
+@contextmanager
+def _profiled(name):
+    if name != _CONFIG['profile_stage']:
+        yield
+        return
+    os.makedirs(_CONFIG['profile_path'], exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    base = os.path.join(_CONFIG['profile_path'], f"{name.replace('/', '.')}-{stamp}")
+    if _CONFIG['profiler'] == 'pyinstrument':
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(base + ".html", "w") as f:
+                f.write(profiler.output_html())
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(base + ".prof")
+
+
+def _write(record):
+    with _WRITE_LOCK:
+        _RECORDS.append(record)
+        path = _CONFIG['log_path']
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+@contextmanager
+def stage(name, rows_in=None, **extra):
+    """
+    Time the enclosed block as stage `name` (nested under any open stage)
+    and log it, also when it raises. Yields a Stage to fill in rows_out.
+    """
+    if not hasattr(_LOCAL, 'stack'):
+        _LOCAL.stack = []
+    _LOCAL.stack.append(name)
+    full_name = "/".join(_LOCAL.stack)
+    current = Stage(full_name, rows_in)
+    current.extra.update(extra)
+
+    start_rss = _rss_bytes()
+    sampler = _RssSampler(start_rss) if start_rss is not None else None
+    if sampler:
+        sampler.start()
+    started_at = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+    wall, cpu = time.perf_counter(), time.process_time()
+    status = 'error'
+    try:
+        with _profiled(full_name):
+            yield current
+        status = 'ok'
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        peak_rss = sampler.stop() if sampler else _max_rss_bytes()
+        _LOCAL.stack.pop()
+        _write({
+            'run_id': _CONFIG['run_id'],
+            'script': _CONFIG['script'],
+            'stage': full_name,
+            'status': status,
+            'started_at': started_at,
+            'wall_s': round(wall, 6),
+            'process_cpu_s': round(cpu, 6),
+            'rows_in': current.rows_in,
+            'rows_out': current.rows_out,
+            'rss_start_mb': round(start_rss / 2 ** 20, 1) if start_rss is not None else None,
+            'peak_rss_mb': round(peak_rss / 2 ** 20, 1),
+            **current.extra,
+        })
+
+
+def timed(name=None):
+    """Decorator form of stage(); rows_out is len() of the result when it has one."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name or fn.__name__) as s:
+                result = fn(*args, **kwargs)
+                if hasattr(result, '__len__'):
+                    s.rows_out = len(result)
+                return result
+        return wrapper
+    return decorate
+
+
+def summary():
+    """Print the stages recorded since the last summary, slowest first, and forget them."""
+    with _WRITE_LOCK:
+        records = list(_RECORDS)
+        _RECORDS.clear()
+    if not records:
+        return
+    print(f"⏱️ {'Stage':<36} {'wall':>8} {'proc cpu':>9} {'rows out':>10} {'peak MB':>8}")
+    for r in sorted(records, key=lambda r: -r['wall_s']):
+        rows = '' if r['rows_out'] is None else r['rows_out']
+        print(f"   {r['stage']:<36} {r['wall_s']:>7.2f}s {r['process_cpu_s']:>8.2f}s {rows:>10} "
+              f"{r['peak_rss_mb']:>8.0f}")
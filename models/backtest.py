@@ -0,0 +1,257 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from features.latest_index import latest_rows, pregame_rows, resolve_player_ids
+from ingest.ud_lines import HISTORY_PATH, load_line_history
+from models.ensemble import DEFAULT_PARAMS, FEATURE_COLS, TARGET_COL
+from models.predict import MIN_STD, PROCESSED_PATH
+from props.pricing import american_to_decimal, price_lines
+
+BACKTEST_PATH = "data/processed/backtest"
+LINES_PATH = "data/lines"
+LINE_TZ = "America/New_York"
+LINE_CARRY_DAYS = 7
+
+
+def load_backtest_frame(seasons, processed_path=PROCESSED_PATH, features=FEATURE_COLS):
+    """Processed games of `seasons` in date order, with the columns a backtest needs."""
+    columns = ['pitcher_id', 'pitcher_name', 'game_date', TARGET_COL] + list(features)
+    frames = [
+        pd.read_parquet(os.path.join(processed_path, f"pitcher_game_data_{season}.parquet"), columns=columns)
+        for season in seasons
+    ]
+    games = pd.concat(frames, ignore_index=True)
+    games['game_date'] = pd.to_datetime(games['game_date'])
+    return games.sort_values('game_date', kind='stable').reset_index(drop=True)
+
+
+def cache_features(games, features=FEATURE_COLS, cache_dir=BACKTEST_PATH):
+    """
+    Write the date-ordered training matrix, the pregame test matrix and the
+    target once as float32 .npy files and return them memory-mapped
+    read-only as (X, X_pregame, y). Training rows carry each game's own
+    features, as the ensemble is trained; a test row is scored from the
+    pitcher's latest game before that date (pregame_rows), as SlateScorer
+    scores a slate, so a prediction never sees the game it predicts.
+
+    Every fold is a contiguous row range of these arrays, so folds (and the
+    worker processes running them) share one copy on disk instead of each
+    holding its own. The cache key covers the rows and the feature list.
+    """
+    digest = hashlib.sha1(repr(list(features)).encode())
+    digest.update(pd.util.hash_pandas_object(
+        games[['pitcher_id', 'game_date', TARGET_COL] + list(features)], index=False
+    ).to_numpy().tobytes())
+    fold_dir = os.path.join(cache_dir, digest.hexdigest()[:16])
+    files = [os.path.join(fold_dir, name) for name in ("X.npy", "X_pregame.npy", "y.npy")]
+
+    if not all(os.path.exists(path) for path in files):
+        os.makedirs(fold_dir, exist_ok=True)
+        matrices = (games[list(features)], pregame_rows(games, features), games[TARGET_COL])
+        for path, values in zip(files, matrices):
+            out = np.lib.format.open_memmap(path + ".tmp", mode='w+', dtype=np.float32, shape=values.shape)
+            out[:] = values.to_numpy(dtype=np.float32)
+            out.flush()
+            del out
+            os.replace(path + ".tmp", path)
+
+    return tuple(np.load(path, mmap_mode='r') for path in files)
+
+
+def walk_forward_folds(dates, start_date, end_date=None, step_days=7, retrain_every=4):
+    """
+    Split date-sorted rows into consecutive test windows of `step_days`
+    starting at `start_date`. Each fold trains on every row before its
+    window. Folds are grouped into blocks of `retrain_every`; a block starts
+    from freshly fitted models and warm-starts them through its later folds.
+    """
+    dates = pd.DatetimeIndex(dates)
+    end_date = pd.Timestamp(end_date) if end_date is not None else dates.max()
+    starts = pd.date_range(pd.Timestamp(start_date), end_date, freq=f"{step_days}D")
+
+    folds = []
+    for i, start in enumerate(starts):
+        stop = min(start + pd.Timedelta(days=step_days), end_date + pd.Timedelta(days=1))
+        test_start, test_end = dates.searchsorted(start), dates.searchsorted(stop)
+        if test_start == test_end or test_start == 0:
+            continue
+        folds.append({
+            'fold': i, 'block': i // retrain_every, 'start': start, 'end': stop - pd.Timedelta(days=1),
+            'test_start': int(test_start), 'test_end': int(test_end),
+        })
+    return folds
+
+
+def _booster_params(params, threads, seed):
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    rounds = params.pop('n_estimators')
+    return {**params, 'nthread': threads, 'seed': int(seed % 2**31)}, rounds
+
+
+def _run_block(X, X_pregame, y, folds, params, n_models, warm_rounds, threads, seed):
+    import xgboost as xgb
+    train_params, rounds = _booster_params(params, threads, seed)
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n_models)]
+
+    boosters, trained_to, results = [None] * n_models, 0, []
+    for fold in folds:
+        train_end = fold['test_start']
+        for m in range(n_models):
+            # First fold of the block fits from scratch; later ones add trees for the new rows
+            lo = 0 if boosters[m] is None else trained_to
+            idx = lo + rngs[m].integers(0, train_end - lo, train_end - lo)
+            dtrain = xgb.DMatrix(X[idx], label=y[idx], nthread=threads)
+            boosters[m] = xgb.train(
+                train_params, dtrain, num_boost_round=rounds if boosters[m] is None else warm_rounds,
+                xgb_model=boosters[m],
+            )
+        trained_to = train_end
+
+        dtest = xgb.DMatrix(X_pregame[fold['test_start']:fold['test_end']], nthread=threads)
+        preds = np.stack([booster.predict(dtest) for booster in boosters])
+        results.append((fold, preds.mean(axis=0), preds.std(axis=0)))
+    return results
+
+
+def run_backtest(games, start_date, end_date=None, step_days=7, retrain_every=4, n_models=10,
+                 params=None, warm_rounds=25, n_jobs=-1, threads_per_block=1, seed=0,
+                 features=FEATURE_COLS, cache_dir=BACKTEST_PATH, min_std=MIN_STD):
+    """
+    Replay `games` (load_backtest_frame) walking forward from `start_date`:
+    every `step_days` window is predicted by models trained only on earlier
+    games, from each pitcher's features before the game date, refitted from scratch every `retrain_every` windows and
+    warm-started in between. Blocks are independent and run in parallel.
+
+    Returns the test rows with fold, k_pred_mean and k_pred_std.
+    """
+    from joblib import Parallel, delayed
+    X, X_pregame, y = cache_features(games, features, cache_dir)
+    folds = walk_forward_folds(games['game_date'], start_date, end_date, step_days, retrain_every)
+    blocks = {}
+    for fold in folds:
+        blocks.setdefault(fold['block'], []).append(fold)
+    seeds = np.random.SeedSequence(seed).generate_state(len(blocks))
+
+    block_results = Parallel(n_jobs=n_jobs)(
+        delayed(_run_block)(X, X_pregame, y, block, params, n_models, warm_rounds, threads_per_block, int(s))
+        for block, s in zip(blocks.values(), seeds)
+    )
+
+    frames = []
+    for results in block_results:
+        for fold, mean, std in results:
+            rows = games.iloc[fold['test_start']:fold['test_end']][['pitcher_id', 'pitcher_name', 'game_date', TARGET_COL]]
+            frames.append(rows.assign(fold=fold['fold'], k_pred_mean=mean, k_pred_std=np.clip(std, min_std, None)))
+    if not frames:
+        raise ValueError(f"No games to test between {start_date} and {end_date}")
+    return pd.concat(frames, ignore_index=True)
+
+
+def daily_lines(history, start_date, end_date):
+    """
+    The lines on the board on each local (LINE_TZ) date from `start_date` to
+    `end_date`, with game_date set to that date: every line active at some
+    point of the day at its last active value that day. The history only
+    records changes, so lines posted on an earlier day and unchanged since
+    are carried forward from the board as it stood when the day began.
+    """
+    local_day = history['taken_at'].dt.tz_convert(LINE_TZ).dt.tz_localize(None).dt.normalize()
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    board = history[local_day < start].drop_duplicates('line_id', keep='last')
+    by_day = dict(tuple(history[(local_day >= start) & (local_day <= end)].groupby(local_day)))
+
+    frames = []
+    for day in pd.date_range(start, end):
+        changes = by_day.get(day, history.iloc[:0])
+        lines_as_of_day = pd.concat([board, changes], ignore_index=True)
+        active = lines_as_of_day[lines_as_of_day['status'] != 'removed'].drop_duplicates('line_id', keep='last')
+        if not active.empty:
+            frames.append(active.assign(game_date=day))
+        board = lines_as_of_day.drop_duplicates('line_id', keep='last')
+    if not frames:
+        return history.iloc[:0].assign(game_date=pd.Series(dtype='datetime64[ns]'))
+    return pd.concat(frames, ignore_index=True)
+
+
+def historical_lines(games, start_date, end_date, history_path=HISTORY_PATH, lines_path=LINES_PATH):
+    """
+    The strikeout line each pitcher closed at on each date: the last active
+    value of each line on the board that day (daily_lines, which carries
+    unchanged lines forward from earlier days), or the day's
+    strikeouts_<date>.csv for dates the history does not cover. A line
+    still on the board on a day its pitcher did not pitch finds no game to
+    score against. Players are matched to ids against the names in
+    `games`, so no network is needed.
+    """
+    frames = []
+    # Lines posted up to LINE_CARRY_DAYS before the range can still be open on its first day
+    carry_from = pd.Timestamp(start_date) - pd.Timedelta(days=LINE_CARRY_DAYS)
+    history = load_line_history(history_path, carry_from, end_date)
+    if not history.empty:
+        frames.append(daily_lines(history, start_date, end_date))
+
+    covered = set(frames[0]['game_date']) if frames else set()
+    for day in pd.date_range(start_date, end_date):
+        csv_file = os.path.join(lines_path, f"strikeouts_{day:%Y-%m-%d}.csv")
+        if day not in covered and os.path.exists(csv_file):
+            frames.append(pd.read_csv(csv_file).assign(game_date=day))
+    if not frames:
+        return pd.DataFrame(columns=['game_date', 'pitcher_id', 'player', 'k_line'])
+
+    lines = pd.concat(frames, ignore_index=True)
+    index = latest_rows(games).set_index('pitcher_id')
+    resolved = resolve_player_ids(lines['player'], index).to_numpy()
+    if 'pitcher_id' in lines.columns:
+        given = pd.array(lines['pitcher_id'].to_numpy(), dtype='Int64')
+        resolved = np.where(pd.Series(given).isin(index.index).to_numpy(), given, resolved)
+    lines['pitcher_id'] = pd.array(resolved, dtype='Int64')
+    lines = lines[lines['pitcher_id'].notna() & lines['k_line'].notna()]
+    if 'taken_at' in lines.columns:
+        # A pitcher with two open lines on a day (yesterday's not yet pulled) closes at the newest
+        lines = lines.sort_values('taken_at', kind='stable', na_position='first')
+        lines = lines.drop_duplicates(['game_date', 'pitcher_id'], keep='last').sort_index()
+    return lines.reset_index(drop=True)
+
+
+def score_backtest(predictions, lines, dist='normal'):
+    """Price every historical line against the walk-forward prediction for that game."""
+    lines = lines.drop(columns=[c for c in ('line_id', 'appearance_id', 'status', 'taken_at') if c in lines.columns])
+    lines = lines.astype({'pitcher_id': 'int64'})
+    merged = predictions.merge(lines, on=['pitcher_id', 'game_date'], how='inner')
+    priced = price_lines(merged, dist)
+    priced['result'] = np.sign(priced[TARGET_COL] - priced['k_line'])
+    return priced
+
+
+def summarize_backtest(priced, min_ev=0.0):
+    """
+    Error of the mean projection, plus the record of betting the better side
+    of every line whose expected value clears `min_ev` (one unit per bet).
+    """
+    error = priced['k_pred_mean'] - priced[TARGET_COL]
+    over = priced['ev_over'] >= priced['ev_under']
+    ev = np.where(over, priced['ev_over'], priced['ev_under'])
+    bets = priced[ev > min_ev]
+    over = over[ev > min_ev]
+
+    if 'over_decimal_price' in bets.columns:
+        over_payout, under_payout = bets['over_decimal_price'], bets['under_decimal_price']
+    else:
+        over_payout = american_to_decimal(bets['over_american_price'])
+        under_payout = american_to_decimal(bets['under_american_price'])
+    payout = np.where(over, over_payout, under_payout)
+    outcome = np.where(over, bets['result'], -bets['result'])
+    profit = np.where(outcome > 0, payout - 1, np.where(outcome < 0, -1.0, 0.0))
+
+    return {
+        'n_lines': len(priced),
+        'mae': float(error.abs().mean()),
+        'rmse': float(np.sqrt((error ** 2).mean())),
+        'n_bets': len(bets),
+        'hit_rate': float((outcome > 0).mean()) if len(bets) else float('nan'),
+        'units': float(profit.sum()),
+        'roi': float(profit.mean()) if len(bets) else float('nan'),
+    }
@@ -0,0 +1,169 @@
+import os
+from datetime import datetime
+
+import numpy as np
+
+FEATURE_COLS = [
+    'pitch_count', 'num_pitch_types', 'max_inning',
+    'rest_days', 'rolling_K_avg_3', 'rolling_K_avg_5',
+    'rolling_pitch_count_5', 'rolling_K_rate',
+    'opponent_k_pct', 'park_factor_K', 'whiff_rate',
+    'csw_pct', 'whiff_rate_expanding', 'csw_pct_expanding'
+]
+TARGET_COL = 'strikeouts'
+
+DEFAULT_PARAMS = {
+    'objective': 'count:poisson',
+    'n_estimators': 300,
+    'max_depth': 3,
+    'learning_rate': 0.1,
+    'verbosity': 0,
+}
+
+MODEL_PATH = "models"
+ARTIFACT_FORMAT = 1
+
+
+class BootstrapEnsemble:
+    """
+    A bag of XGBoost boosters fitted on bootstrap resamples of one training
+    set, plus the feature list and metadata needed to score new rows.
+    """
+
+    def __init__(self, boosters, features, params, version, meta=None):
+        self.boosters = boosters
+        self.features = list(features)
+        self.params = params
+        self.version = version
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.boosters)
+
+    def predict_members(self, X, nthread=None):
+        """
+        Predictions of every member, shape (n_models, n_rows). X is a frame
+        with the ensemble's feature columns, or an array of them in order.
+        """
+        import xgboost as xgb
+        X = _feature_matrix(X, self.features)
+        dmatrix = xgb.DMatrix(np.ascontiguousarray(X, dtype=np.float32), feature_names=self.features,
+                              nthread=nthread)
+        return np.stack([booster.predict(dmatrix) for booster in self.boosters])
+
+    def predict(self, X, nthread=None):
+        """Ensemble mean and std per row."""
+        preds = self.predict_members(X, nthread)
+        return preds.mean(axis=0), preds.std(axis=0)
+
+
+def _feature_matrix(X, features):
+    """`features` of frame X in order, or X itself when it is an array with one column per feature."""
+    if hasattr(X, 'columns'):
+        missing = [f for f in features if f not in X.columns]
+        if missing:
+            raise ValueError(f"Missing feature columns: {', '.join(missing)}")
+        return X[features]
+    if np.ndim(X) != 2 or np.shape(X)[1] != len(features):
+        raise ValueError(
+            f"Expected {len(features)} feature columns ({', '.join(features)}), got shape {np.shape(X)}"
+        )
+    return X
+
+
+def _as_float32(values):
+    """float32 C-contiguous array; memmaps that already are pass through so workers map the file."""
+    if isinstance(values, np.memmap) and values.dtype == np.float32 and values.flags.c_contiguous:
+        return values
+    return np.ascontiguousarray(values, dtype=np.float32)
+
+
+def _fit_member(X, y, seed, params, threads):
+    import xgboost as xgb
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(y), len(y))
+    model = xgb.XGBRegressor(**params, n_jobs=threads, random_state=int(seed % 2**31))
+    model.fit(X[idx], y[idx])
+    return bytes(model.get_booster().save_raw('ubj'))
+
+
+def train_bootstrap_ensemble(X, y, n_models=100, params=None, n_jobs=-1, threads_per_model=1,
+                             seed=0, version=None, meta=None, features=None):
+    """
+    Fit `n_models` boosters on bootstrap resamples of (X, y) in parallel
+    worker processes, each limited to `threads_per_model` XGBoost threads so
+    n_jobs * threads_per_model stays within the machine's cores. Memmapped
+    float32 inputs (export_training_matrix) reach the workers uncopied.
+
+    `features` names X's columns; it defaults to a frame's own columns and
+    must be given for arrays, whose width has to match it.
+    """
+    from joblib import Parallel, delayed
+    if features is None:
+        if not hasattr(X, 'columns'):
+            raise ValueError("Training on an array needs `features` to name its columns")
+        features = X.columns
+    features = list(features)
+    X = _feature_matrix(X, features)
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    X = _as_float32(X)
+    y = _as_float32(y)
+    seeds = np.random.SeedSequence(seed).generate_state(n_models, dtype=np.uint64)
+
+    raw_boosters = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_member)(X, y, int(s), params, threads_per_model) for s in seeds
+    )
+
+    version = version or datetime.now().strftime("%Y%m%d%H%M%S")
+    meta = {'n_rows': len(y), 'seed': seed, **(meta or {})}
+    return BootstrapEnsemble(_load_boosters(raw_boosters), features, params, version, meta)
+
+
+def _load_boosters(raw_boosters, nthread=None):
+    import xgboost as xgb
+    boosters = []
+    for raw in raw_boosters:
+        booster = xgb.Booster(params={'nthread': nthread} if nthread else None)
+        booster.load_model(bytearray(raw))
+        boosters.append(booster)
+    return boosters
+
+
+def ensemble_path(version, model_dir=MODEL_PATH):
+    return os.path.join(model_dir, f"ks_ensemble_{version}.joblib")
+
+
+def save_ensemble(ensemble, path=None):
+    """Write the whole ensemble as one artifact; returns its path."""
+    import joblib
+    path = path or ensemble_path(ensemble.version)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    joblib.dump({
+        'format': ARTIFACT_FORMAT,
+        'version': ensemble.version,
+        'features': ensemble.features,
+        'params': ensemble.params,
+        'meta': ensemble.meta,
+        'boosters': [bytes(b.save_raw('ubj')) for b in ensemble.boosters],
+    }, path)
+    return path
+
+
+def load_ensemble(path, nthread=None):
+    import joblib
+    artifact = joblib.load(path)
+    if artifact.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"Unsupported ensemble artifact format in {path}: {artifact.get('format')}")
+    return BootstrapEnsemble(
+        _load_boosters(artifact['boosters'], nthread),
+        artifact['features'], artifact['params'], artifact['version'], artifact['meta'],
+    )
+
+
+def latest_ensemble_path(model_dir=MODEL_PATH):
+    artifacts = sorted(
+        f for f in os.listdir(model_dir) if f.startswith("ks_ensemble_") and f.endswith(".joblib")
+    )
+    if not artifacts:
+        raise FileNotFoundError(f"No ks_ensemble_*.joblib artifacts in {model_dir}")
+    return os.path.join(model_dir, artifacts[-1])
@@ -0,0 +1,296 @@
+"""
+In-game strikeout projections, updated pitch by pitch.
+
+    live = LiveStrikeouts(priors)
+    for event in replay_statcast(2025, "2025-04-01"):
+        game = live.update(event)
+        if game.tracked:
+            print(game.projected_total, game.prob_over(5.5))
+
+Each pitcher's game keeps the counts aggregate_pitcher_games computes in
+batch (pitches, strikeouts, whiffs, swings, called strikes) plus batters
+faced, updated in O(1) per pitch. After every pitch the remaining K total
+is re-projected as Poisson(rate x batters left): the pregame K per batter
+shrunk toward what the pitcher has shown (K/BF, scaled by game CSW over
+season CSW), and batters left from the pregame pitch-count budget. A
+pitcher is done once the fielding side sends in someone else.
+"""
+import math
+import os
+import time
+
+import pandas as pd
+
+from features.latest_index import latest_index_path, load_latest_index
+from features.mlb_features import SWING_DESCRIPTIONS, WHIFF_DESCRIPTIONS
+from ingest.statcast_store import PITCHER_COLUMNS, RAW_PATH, load_statcast, statcast_columns
+
+# League rates the pregame priors fall back on
+LEAGUE_CSW = 0.29
+PITCHES_PER_PA = 3.9
+DEFAULT_K = 5
+DEFAULT_PITCH_COUNT = 85
+# How many batters / pitches of in-game evidence weigh as much as the prior
+PRIOR_BATTERS = 20
+PRIOR_PITCHES = 60
+# Bounds on the CSW adjustment to the K rate
+CSW_RATIO_BOUNDS = (0.6, 1.5)
+MAX_K = 30
+
+REPLAY_COLUMNS = PITCHER_COLUMNS + ['game_pk', 'pitch_number']
+_WHIFFS = frozenset(WHIFF_DESCRIPTIONS)
+_SWINGS = frozenset(SWING_DESCRIPTIONS)
+
+
+class PitcherPrior:
+    """Pregame expectations for one start: strikeouts, pitch count and season CSW rate."""
+
+    __slots__ = ('k_mean', 'pitch_count', 'csw_pct', 'k_line')
+
+    def __init__(self, k_mean=DEFAULT_K, pitch_count=DEFAULT_PITCH_COUNT, csw_pct=LEAGUE_CSW, k_line=None):
+        self.k_mean = float(k_mean)
+        self.pitch_count = float(pitch_count)
+        self.csw_pct = float(csw_pct) if csw_pct and csw_pct > 0 else LEAGUE_CSW
+        self.k_line = k_line
+
+    @property
+    def k_per_batter(self):
+        return self.k_mean / max(self.pitch_count / PITCHES_PER_PA, 1.0)
+
+
+class PitcherGame:
+    """One pitcher's running counts in one game and his current remaining-K projection."""
+
+    __slots__ = ('pitcher', 'game_pk', 'prior', 'tracked', 'pitch_count', 'strikeouts', 'whiff_count',
+                 'swing_count', 'called_count', 'batters_faced', 'pa_pitches', 'max_inning', 'done',
+                 'remaining_mean')
+
+    def __init__(self, pitcher, game_pk, prior, tracked):
+        self.pitcher = pitcher
+        self.game_pk = game_pk
+        self.prior = prior
+        self.tracked = tracked
+        self.pitch_count = self.strikeouts = self.whiff_count = self.swing_count = self.called_count = 0
+        # Pitches thrown in completed plate appearances, for the live pitches-per-batter rate
+        self.batters_faced = self.pa_pitches = 0
+        self.max_inning = 0
+        self.done = False
+        self.remaining_mean = 0.0
+        self.rescore()
+
+    @property
+    def whiff_rate(self):
+        return self.whiff_count / self.swing_count if self.swing_count else 0.0
+
+    @property
+    def csw_pct(self):
+        return (self.whiff_count + self.called_count) / self.pitch_count if self.pitch_count else 0.0
+
+    @property
+    def projected_total(self):
+        return self.strikeouts + self.remaining_mean
+
+    def k_rate(self):
+        """K per batter from here on: the prior shrunk toward this game's K/BF and CSW."""
+        prior = self.prior
+        rate = (prior.k_per_batter * PRIOR_BATTERS + self.strikeouts) / (PRIOR_BATTERS + self.batters_faced)
+        csw = (prior.csw_pct * PRIOR_PITCHES + self.whiff_count + self.called_count) / (
+            PRIOR_PITCHES + self.pitch_count)
+        low, high = CSW_RATIO_BOUNDS
+        return rate * min(max(csw / prior.csw_pct, low), high)
+
+    def rescore(self):
+        if self.done:
+            self.remaining_mean = 0.0
+            return
+        ppa = (PITCHES_PER_PA * PRIOR_BATTERS + self.pa_pitches) / (PRIOR_BATTERS + self.batters_faced)
+        batters_left = max(self.prior.pitch_count - self.pitch_count, 0.0) / ppa
+        self.remaining_mean = self.k_rate() * batters_left
+
+    def remaining_pmf(self, max_k=MAX_K):
+        """P(exactly k more strikeouts) for k = 0..max_k."""
+        lam = self.remaining_mean
+        p = math.exp(-lam)
+        pmf = [p]
+        for k in range(1, max_k + 1):
+            p *= lam / k
+            pmf.append(p)
+        return pmf
+
+    def total_pmf(self, max_k=MAX_K):
+        """P(the pitcher finishes with exactly k strikeouts) for k = 0..max_k."""
+        have = min(self.strikeouts, max_k + 1)
+        return [0.0] * have + self.remaining_pmf(max_k - have)
+
+    def prob_over(self, line):
+        """P(total strikeouts > line)."""
+        need = math.floor(line) + 1 - self.strikeouts
+        if need <= 0:
+            return 1.0
+        return max(1.0 - sum(self.remaining_pmf(need - 1)), 0.0)
+
+    def as_dict(self):
+        return {
+            'pitcher': self.pitcher, 'game_pk': self.game_pk, 'pitch_count': self.pitch_count,
+            'strikeouts': self.strikeouts, 'batters_faced': self.batters_faced, 'max_inning': self.max_inning,
+            'whiff_count': self.whiff_count, 'swing_count': self.swing_count, 'called_count': self.called_count,
+            'whiff_rate': self.whiff_rate, 'csw_pct': self.csw_pct, 'done': self.done,
+            'remaining_mean': self.remaining_mean, 'projected_total': self.projected_total,
+        }
+
+
+class LiveStrikeouts:
+    """
+    Live state of every pitcher in the games fed to update(). Pitchers in
+    `priors` ({pitcher id: PitcherPrior}) are tracked; with
+    `track_all`, everyone else is projected from league defaults.
+    """
+
+    def __init__(self, priors=None, track_all=False):
+        self.priors = priors or {}
+        self.track_all = track_all
+        self.games = {}
+        # (game_pk, inning_topbot) -> the fielding side's current pitcher game
+        self._on_mound = {}
+
+    def update(self, event):
+        """
+        Fold one pitch into its pitcher's game and re-project it. `event`
+        has pitcher, game_pk, inning, inning_topbot, description and events
+        attributes (a replay_statcast row). Returns the PitcherGame.
+        """
+        key = (event.game_pk, event.pitcher)
+        game = self.games.get(key)
+        if game is None:
+            prior = self.priors.get(event.pitcher)
+            game = PitcherGame(event.pitcher, event.game_pk, prior or PitcherPrior(),
+                               prior is not None or self.track_all)
+            self.games[key] = game
+        side = (event.game_pk, event.inning_topbot)
+        previous = self._on_mound.get(side)
+        if previous is not game:
+            if previous is not None:
+                previous.done = True
+                previous.rescore()
+            self._on_mound[side] = game
+
+        description = event.description
+        if isinstance(description, str):
+            game.pitch_count += 1
+            if description in _SWINGS:
+                game.swing_count += 1
+                if description in _WHIFFS:
+                    game.whiff_count += 1
+            elif description == 'called_strike':
+                game.called_count += 1
+        if isinstance(event.events, str):
+            game.batters_faced += 1
+            game.pa_pitches = game.pitch_count
+            if event.events == 'strikeout':
+                game.strikeouts += 1
+        if event.inning > game.max_inning:
+            game.max_inning = event.inning
+        game.rescore()
+        return game
+
+    def finish(self, game_pk=None):
+        """Mark every pitcher of `game_pk` (all games when None) as done."""
+        for (pk, _), game in self.games.items():
+            if game_pk is None or pk == game_pk:
+                game.done = True
+                game.rescore()
+
+    def state(self):
+        """Every pitcher game so far as a frame, one row per (game_pk, pitcher)."""
+        return pd.DataFrame([game.as_dict() for game in self.games.values()])
+
+
+def priors_from_index(index, slate=None):
+    """
+    {pitcher id: PitcherPrior} from the latest-row index (rolling_K_avg_5,
+    rolling_pitch_count_5, csw_pct_expanding). A scored `slate`
+    (pitcher_id, k_line, k_pred_mean) overrides the K mean and adds lines.
+    """
+    priors = {}
+    if index is not None:
+        for pitcher, row in index.iterrows():
+            priors[int(pitcher)] = PitcherPrior(
+                row.get('rolling_K_avg_5', DEFAULT_K), row.get('rolling_pitch_count_5', DEFAULT_PITCH_COUNT),
+                row.get('csw_pct_expanding', LEAGUE_CSW),
+            )
+    if slate is not None:
+        for row in slate.dropna(subset=['pitcher_id']).itertuples(index=False):
+            prior = priors.setdefault(int(row.pitcher_id), PitcherPrior())
+            prior.k_mean = float(row.k_pred_mean)
+            prior.k_line = float(row.k_line)
+    return priors
+
+
+def replay_statcast(season, game_date, pitchers=None, root=RAW_PATH):
+    """
+    Pitches of one day from the raw store, in game order: half-inning by
+    half-inning across games, then by at_bat_number / pitch_number within
+    a half. Yields rows as namedtuples.
+    """
+    stored = set(statcast_columns(season, root))
+    columns = [c for c in REPLAY_COLUMNS + ['at_bat_number'] if c in stored]
+    pitches = load_statcast(season, columns, game_date, game_date, root=root)
+    if pitchers is not None:
+        # Keep whole games so the other pitchers still mark when a starter is pulled
+        games = pitches.loc[pitches['pitcher'].isin(pitchers), 'game_pk'].unique()
+        pitches = pitches[pitches['game_pk'].isin(games)]
+    pitches = pitches.assign(
+        half=(pitches['inning_topbot'].astype(str) == 'Bot').astype('int8'),
+        inning_topbot=pitches['inning_topbot'].astype(str),
+        description=pitches['description'].astype(object),
+        events=pitches['events'].astype(object),
+    )
+    order = ['inning', 'half', 'game_pk'] + [c for c in ('at_bat_number', 'pitch_number') if c in pitches.columns]
+    pitches = pitches.sort_values(order, kind='stable')
+    yield from pitches.itertuples(index=False)
+
+
+def replay(season, game_date, priors=None, pitchers=None, root=RAW_PATH, lines=None):
+    """
+    Feed one day of stored pitches through LiveStrikeouts, printing tracked
+    pitchers after each strikeout and when they leave. `lines` maps pitcher
+    id -> K line for P(over). Returns the final state and µs per update.
+    """
+    lines = lines or {p: prior.k_line for p, prior in (priors or {}).items() if prior.k_line is not None}
+    live = LiveStrikeouts(priors, track_all=not priors)
+    tracked = set(pitchers) if pitchers is not None else None
+    elapsed, n_events = 0.0, 0
+    for event in replay_statcast(season, game_date, pitchers, root):
+        n_events += 1
+        started = time.perf_counter()
+        game = live.update(event)
+        elapsed += time.perf_counter() - started
+        if not game.tracked or (tracked is not None and game.pitcher not in tracked):
+            continue
+        if event.events == 'strikeout':
+            line = lines.get(game.pitcher)
+            over = f", P(over {line}) {game.prob_over(line):.2f}" if line is not None else ""
+            print(f"🔴 {game.pitcher} K{game.strikeouts} in {game.batters_faced} BF, {game.pitch_count} pitches, "
+                  f"CSW {game.csw_pct:.0%}: projecting {game.projected_total:.1f}{over}")
+    live.finish()
+    per_event_us = elapsed / max(n_events, 1) * 1e6
+    return live.state(), per_event_us
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay a day of Statcast through the live K projector")
+    parser.add_argument("--season", type=int, required=True)
+    parser.add_argument("--date", required=True, help="Game date to replay (YYYY-MM-DD)")
+    parser.add_argument("--pitchers", type=int, nargs="+", help="Only print these MLBAM ids")
+    parser.add_argument("--slate", help="Scored slate CSV (pitcher_id, k_line, k_pred_mean) for priors and lines")
+    parser.add_argument("--processed", default="data/processed")
+    parser.add_argument("--root", default=RAW_PATH)
+    args = parser.parse_args()
+
+    index_path = latest_index_path(args.season, args.processed)
+    index = load_latest_index(index_path) if os.path.exists(index_path) else None
+    slate = pd.read_csv(args.slate) if args.slate else None
+    priors = priors_from_index(index, slate) if index is not None or slate is not None else None
+    state, per_event_us = replay(args.season, args.date, priors, args.pitchers, args.root)
+    print(f"✅ {len(state)} pitcher games, {per_event_us:.1f} µs per pitch")
@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from features.latest_index import latest_index_path, load_latest_index, lookup_latest, resolve_player_ids
+from models.ensemble import load_ensemble
+
+PROCESSED_PATH = "data/processed"
+MIN_STD = 0.75
+
+
+class SlateScorer:
+    """
+    Keeps an ensemble and the season's latest-row index (one row per
+    pitcher, keyed by MLBAM id) in memory and scores a lines table
+    (player, k_line) in one batched prediction. A pitcher_id column from the
+    lines file is used when present; other players are matched to ids with
+    resolve_player_ids, so accents and middle initials don't drop rows.
+    """
+
+    def __init__(self, model_path, season, processed_path=PROCESSED_PATH, min_std=MIN_STD, nthread=None):
+        self.ensemble = load_ensemble(model_path, nthread=nthread)
+        self.season = season
+        self.processed_path = processed_path
+        self.min_std = min_std
+        self.nthread = nthread
+        self._latest = None
+        self._latest_mtime = None
+        self._lock = threading.Lock()
+
+    def latest(self):
+        # Reloaded only when the updater has rewritten the index
+        path = latest_index_path(self.season, self.processed_path)
+        mtime = os.stat(path).st_mtime_ns
+        if self._latest is None or mtime != self._latest_mtime:
+            self._latest = load_latest_index(path, columns=self.ensemble.features)
+            self._latest_mtime = mtime
+        return self._latest
+
+    def score(self, lines):
+        with self._lock:
+            latest = self.latest()
+            ids = resolve_player_ids(lines['player'], latest).to_numpy()
+            if 'pitcher_id' in lines.columns:
+                # Crosswalk ids from the lines file win wherever they have games in the index
+                given = pd.array(lines['pitcher_id'].to_numpy(), dtype='Int64')
+                ids = np.where(pd.Series(given).isin(latest.index).to_numpy(), given, ids)
+            slate = lines.assign(pitcher_id=ids)
+            slate = slate[slate['pitcher_id'].notna()].reset_index(drop=True)
+            slate['pitcher_id'] = slate['pitcher_id'].astype('int64')
+            rows = lookup_latest(latest, slate['pitcher_id'])
+            slate[self.ensemble.features] = rows[self.ensemble.features].to_numpy()
+            if slate.empty:
+                mean = std = np.array([])
+            else:
+                mean, std = self.ensemble.predict(slate[self.ensemble.features], nthread=self.nthread)
+
+        slate['k_pred_mean'] = mean
+        slate['k_pred_std'] = np.clip(std, self.min_std, None)
+        return slate[['player', 'pitcher_id', 'k_line', 'k_pred_mean', 'k_pred_std']]
+
+
+def serve(scorer, host="127.0.0.1", port=8765):
+    """
+    Answer scoring requests over local HTTP until interrupted.
+
+        GET  /health  -> {"version", "n_models"}
+        POST /score   {"lines": [{"player", "k_line"}, ...]} or {"lines_path": "<csv>"}
+                      -> [{"player", "pitcher_id", "k_line", "k_pred_mean", "k_pred_std"}, ...]
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path != "/health":
+                return self._reply(404, {"error": "not found"})
+            self._reply(200, {"version": scorer.ensemble.version, "n_models": len(scorer.ensemble)})
+
+        def do_POST(self):
+            if self.path != "/score":
+                return self._reply(404, {"error": "not found"})
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                if "lines_path" in request:
+                    lines = pd.read_csv(request["lines_path"])
+                else:
+                    lines = pd.DataFrame(request["lines"])
+                scored = scorer.score(lines)
+            except (KeyError, ValueError, OSError) as e:
+                return self._reply(400, {"error": str(e)})
+            self._reply(200, json.loads(scored.to_json(orient="records")))
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"🛰️ Scoring {scorer.season} slates with ensemble {scorer.ensemble.version} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
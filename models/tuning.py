@@ -0,0 +1,215 @@
+import hashlib
+import itertools
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from models.ensemble import DEFAULT_PARAMS
+
+TUNING_PATH = "data/processed/tuning"
+
+# Candidate values per XGBoost parameter. n_estimators is not searched:
+# early stopping picks the number of rounds within each budget.
+SEARCH_SPACE = {
+    'max_depth': [3, 4, 5, 6],
+    'learning_rate': [0.02, 0.05, 0.1, 0.2],
+    'min_child_weight': [1, 5, 20],
+    'subsample': [0.7, 0.85, 1.0],
+    'colsample_bytree': [0.7, 1.0],
+    'reg_lambda': [1.0, 5.0],
+}
+
+# Per-process DMatrix cache: worker processes reuse their fold matrices across trials
+_DMATRICES = {}
+
+
+def data_hash(X, y, chunk_rows=1 << 16):
+    """Content hash of a training matrix, read in row chunks so memmaps stay on disk."""
+    digest = hashlib.sha1(repr((X.shape, str(X.dtype))).encode())
+    for lo in range(0, len(y), chunk_rows):
+        digest.update(np.ascontiguousarray(X[lo:lo + chunk_rows]).tobytes())
+        digest.update(np.ascontiguousarray(y[lo:lo + chunk_rows]).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def time_folds(dates, n_folds=3, min_train=0.5):
+    """
+    Expanding-window folds over date-sorted rows: the last 1 - `min_train`
+    of the dates is cut into `n_folds` validation windows, each trained on
+    every earlier row. Cuts fall between dates, so a day is never split.
+    Returns [(train_end, valid_end)] row positions.
+    """
+    dates = pd.DatetimeIndex(dates)
+    if not dates.is_monotonic_increasing:
+        raise ValueError("time_folds needs rows sorted by date")
+    days = dates.unique()
+    cut_days = days[np.linspace(int(len(days) * min_train), len(days), n_folds + 1).astype(int)[:-1]]
+    cuts = list(dates.searchsorted(cut_days)) + [len(dates)]
+    return [(int(lo), int(hi)) for lo, hi in zip(cuts[:-1], cuts[1:]) if 0 < lo < hi]
+
+
+def candidate_params(space=SEARCH_SPACE, n_candidates=27, seed=0):
+    """The whole grid when it has at most `n_candidates` points, else a seeded sample of it."""
+    keys = sorted(space)
+    grid = list(itertools.product(*(space[k] for k in keys)))
+    if len(grid) > n_candidates:
+        rng = np.random.default_rng(seed)
+        grid = [grid[i] for i in sorted(rng.choice(len(grid), n_candidates, replace=False))]
+    return [dict(zip(keys, values)) for values in grid]
+
+
+def _train_params(params, metric, seed):
+    """The xgb.train parameters of a trial, thread count aside."""
+    train_params = {**DEFAULT_PARAMS, **params, 'eval_metric': metric, 'seed': seed}
+    train_params.pop('n_estimators', None)
+    return train_params
+
+
+def trial_key(params, rounds, folds, metric, early_stopping_rounds, seed, feature_version, data_key):
+    """Cache key over everything that decides a trial's score: what xgb.train gets, the folds and the data."""
+    spec = json.dumps({'params': _train_params(params, metric, seed), 'rounds': rounds,
+                       'early_stopping_rounds': early_stopping_rounds, 'folds': folds,
+                       'feature_version': feature_version, 'data': data_key}, sort_keys=True, default=str)
+    return hashlib.sha1(spec.encode()).hexdigest()
+
+
+def load_trials(cache_path=TUNING_PATH):
+    """{trial key: record} of every trial scored before."""
+    trials_file = os.path.join(cache_path, "trials.jsonl")
+    if not os.path.exists(trials_file):
+        return {}
+    with open(trials_file) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return {r['key']: r for r in records}
+
+
+def _append_trial(record, cache_path):
+    os.makedirs(cache_path, exist_ok=True)
+    with open(os.path.join(cache_path, "trials.jsonl"), "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def _fold_matrices(X, y, fold, data_key, threads):
+    import xgboost as xgb
+    key = (data_key, fold, threads)
+    if key not in _DMATRICES:
+        if any(k[0] != data_key for k in _DMATRICES):
+            _DMATRICES.clear()
+        train_end, valid_end = fold
+        _DMATRICES[key] = (
+            xgb.DMatrix(X[:train_end], label=y[:train_end], nthread=threads),
+            xgb.DMatrix(X[train_end:valid_end], label=y[train_end:valid_end], nthread=threads),
+        )
+    return _DMATRICES[key]
+
+
+def _evaluate(X, y, folds, params, rounds, metric, early_stopping_rounds, threads, data_key, seed):
+    """Mean best validation `metric` over `folds` and the mean best round count."""
+    import xgboost as xgb
+    train_params = {**_train_params(params, metric, seed), 'nthread': threads}
+    scores, best_rounds = [], []
+    for fold in folds:
+        dtrain, dvalid = _fold_matrices(X, y, tuple(fold), data_key, threads)
+        booster = xgb.train(
+            train_params, dtrain, num_boost_round=rounds, evals=[(dvalid, 'valid')],
+            early_stopping_rounds=early_stopping_rounds, verbose_eval=False,
+        )
+        scores.append(booster.best_score)
+        best_rounds.append(booster.best_iteration + 1)
+    return float(np.mean(scores)), int(round(np.mean(best_rounds)))
+
+
+def _run_trial(key, params, X, y, folds, rounds, metric, early_stopping_rounds, threads, data_key, seed):
+    return (key, params, *_evaluate(X, y, folds, params, rounds, metric, early_stopping_rounds,
+                                    threads, data_key, seed))
+
+
+def plan_workers(n_jobs=-1, threads_per_trial=1):
+    """Worker processes so that workers * threads_per_trial fits the machine's cores."""
+    from joblib import cpu_count
+    cores = cpu_count()
+    most = max(1, cores // threads_per_trial)
+    return most if n_jobs is None or n_jobs < 0 else max(1, min(n_jobs, most))
+
+
+def successive_halving(X, y, dates, space=SEARCH_SPACE, n_candidates=27, eta=3, min_rounds=50,
+                       max_rounds=800, n_folds=3, metric='mae', early_stopping_rounds=30, n_jobs=-1,
+                       threads_per_trial=1, seed=0, feature_version=None, cache_path=TUNING_PATH):
+    """
+    Successive-halving search for the K model's XGBoost parameters.
+
+    Every candidate first gets `min_rounds` boosting rounds on each
+    expanding time fold (time_folds); the best 1/`eta` go on with `eta`
+    times the rounds, until `max_rounds`. Each fit stops early once the
+    validation `metric` (an XGBoost eval_metric; lower is better) stalls
+    for `early_stopping_rounds`.
+
+    Trials run in plan_workers(n_jobs, threads_per_trial) processes with
+    `threads_per_trial` XGBoost threads each, so the two levels never
+    oversubscribe the cores. Pass X and y from export_training_matrix:
+    workers then map the same file. Each scored trial is appended to
+    `cache_path`/trials.jsonl under a key (trial_key) covering everything
+    passed to xgb.train (params over DEFAULT_PARAMS, metric, seed), the
+    rounds, early stopping, folds, `feature_version` and a hash of the
+    data, and later runs only fit trials that are not there yet.
+
+    Returns every trial of the final ranking, best first, with params,
+    rounds, score, best_rounds and cached.
+    """
+    from joblib import Parallel, delayed
+    folds = time_folds(dates, n_folds)
+    data_key = data_hash(X, y)
+    trials = load_trials(cache_path)
+    workers = plan_workers(n_jobs, threads_per_trial)
+    candidates = candidate_params(space, n_candidates, seed)
+
+    rounds = min_rounds
+    rungs = []
+    while True:
+        keys = [trial_key(p, rounds, folds, metric, early_stopping_rounds, seed, feature_version, data_key)
+                for p in candidates]
+        todo = [(k, p) for k, p in zip(keys, candidates) if k not in trials]
+        print(f"🔎 {len(candidates)} candidates at {rounds} rounds: "
+              f"{len(candidates) - len(todo)} cached, {len(todo)} to fit on {workers} workers")
+
+        results = Parallel(n_jobs=workers, return_as='generator_unordered')(
+            delayed(_run_trial)(key, params, X, y, folds, rounds, metric, early_stopping_rounds,
+                                threads_per_trial, data_key, seed)
+            for key, params in todo
+        )
+        for key, params, score, best_rounds in results:
+            trials[key] = {'key': key, 'params': params, 'rounds': rounds, 'metric': metric,
+                           'early_stopping_rounds': early_stopping_rounds, 'seed': seed,
+                           'feature_version': feature_version, 'data': data_key,
+                           'score': score, 'best_rounds': best_rounds}
+            _append_trial(trials[key], cache_path)
+
+        done = {k for k, _ in todo}
+        rung = pd.DataFrame([{**trials[k], 'cached': k not in done} for k in keys])
+        rung = rung.sort_values('score', kind='stable').reset_index(drop=True)
+        rungs.append(rung)
+        if rounds >= max_rounds or len(candidates) <= 1:
+            break
+        candidates = list(rung['params'][:max(1, len(candidates) // eta)])
+        rounds = min(rounds * eta, max_rounds)
+
+    return rungs[-1].drop(columns=['key'])
+
+
+def best_params(trials):
+    """Ensemble parameters from the top trial, with n_estimators set to its best round count."""
+    top = trials.iloc[0]
+    return {**DEFAULT_PARAMS, **top['params'], 'n_estimators': int(top['best_rounds'])}
+
+
+def save_params(params, meta, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({'params': params, **meta}, f, indent=2, default=str)
+
+
+def load_params(path):
+    with open(path) as f:
+        return json.load(f)['params']
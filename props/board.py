@@ -0,0 +1,121 @@
+import datetime
+import json
+import os
+
+import pandas as pd
+
+UD_BOARD_URL = "https://api.underdogfantasy.com/beta/v5/over_under_lines"
+BOARD_PATH = "data/lines/props"
+
+BOARD_COLUMNS = [
+    'line_id', 'appearance_id', 'player_id', 'player', 'sport_id', 'team_id', 'match_id', 'starter',
+    'stat', 'line', 'status',
+    'over_american_price', 'over_decimal_price', 'over_payout_multiplier',
+    'under_american_price', 'under_decimal_price', 'under_payout_multiplier',
+]
+PRICE_COLUMNS = BOARD_COLUMNS[-6:]
+PRICE_FIELDS = ['american_price', 'decimal_price', 'payout_multiplier']
+
+
+def _player_index(data):
+    return {
+        player['id']: (
+            f"{player.get('first_name', '')} {player.get('last_name', '')}".strip(),
+            player.get('sport_id'),
+        )
+        for player in data.get('players', [])
+    }
+
+
+def _appearance_index(data):
+    index = {}
+    for app in data.get('appearances', []):
+        starter = None
+        for badge in app.get('badges', []):
+            if badge.get('label') == 'Starting':
+                starter = badge.get('value') == 'Yes'
+                break
+        index[app['id']] = (app.get('player_id'), app.get('team_id'), app.get('match_id'), starter)
+    return index
+
+
+def parse_board(payload, stats=None):
+    """
+    Split an Underdog board (bytes, str or decoded dict) into one frame per
+    stat, {stat: DataFrame[BOARD_COLUMNS]}, in a single pass over its
+    over_under_lines. Players and appearances are indexed by id up front,
+    so each line costs a couple of dict lookups whatever the number of
+    stats. Pass `stats` to keep only those stat types. Lines without a
+    stat or without both sides are dropped.
+    """
+    data = json.loads(payload) if isinstance(payload, (bytes, str)) else payload
+    players = _player_index(data)
+    appearances = _appearance_index(data)
+    stats = set(stats) if stats is not None else None
+
+    tables = {}
+    for line in data.get('over_under_lines', []):
+        appearance_stat = line.get('over_under', {}).get('appearance_stat', {})
+        stat = appearance_stat.get('stat')
+        if not stat or (stats is not None and stat not in stats):
+            continue
+        options = {opt.get('choice'): opt for opt in line.get('options', [])}
+        if 'higher' not in options or 'lower' not in options:
+            continue
+
+        higher, lower = options['higher'], options['lower']
+        appearance_id = appearance_stat.get('appearance_id')
+        player_id, team_id, match_id, starter = appearances.get(appearance_id, (None, None, None, None))
+        player, sport_id = players.get(player_id, (higher.get('selection_header'), None))
+
+        tables.setdefault(stat, []).append((
+            line.get('id'), appearance_id, player_id, player, sport_id, team_id, match_id, starter,
+            stat, line.get('stat_value'), line.get('status'),
+            *(higher.get(field) for field in PRICE_FIELDS),
+            *(lower.get(field) for field in PRICE_FIELDS),
+        ))
+
+    frames = {}
+    for stat, rows in tables.items():
+        frame = pd.DataFrame.from_records(rows, columns=BOARD_COLUMNS)
+        frame['line'] = pd.to_numeric(frame['line'])
+        for col in PRICE_COLUMNS:
+            frame[col] = pd.to_numeric(frame[col], errors='coerce')
+        frames[stat] = frame
+    return frames
+
+
+def fetch_board(session=None, url=UD_BOARD_URL, params=None, stats=None, timeout=10):
+    """Fetch the whole board once and parse it with parse_board."""
+    from ingest.ud_lines import fetch_lines_json, make_session
+
+    payload, _ = fetch_lines_json(session or make_session(), url, params, timeout=timeout)
+    return parse_board(payload, stats)
+
+
+def save_board(tables, path=BOARD_PATH, date=None):
+    """Write each stat's table to `path`/<stat>_<date>.parquet; returns the paths."""
+    date = date or datetime.date.today().isoformat()
+    os.makedirs(path, exist_ok=True)
+    paths = {}
+    for stat, frame in tables.items():
+        paths[stat] = os.path.join(path, f"{stat}_{date}.parquet")
+        frame.to_parquet(paths[stat], index=False)
+    return paths
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Fetch the Underdog board and save one table per stat")
+    parser.add_argument("--stats", nargs="*", help="Only these stat types (default: all)")
+    parser.add_argument("--json", help="Parse a saved payload instead of fetching")
+    parser.add_argument("--out", default=BOARD_PATH)
+    args = parser.parse_args()
+
+    if args.json:
+        with open(args.json, encoding="utf-8") as f:
+            tables = parse_board(f.read(), args.stats)
+    else:
+        tables = fetch_board(stats=args.stats)
+    for stat, out_file in save_board(tables, args.out).items():
+        print(f"✅ {len(tables[stat]):>5} {stat} lines -> {out_file}")
@@ -0,0 +1,92 @@
+import numpy as np
+
+DISTRIBUTIONS = ('normal', 'poisson', 'negbin')
+
+
+def prob_over_under(line, mean, std=None, dist='normal'):
+    """
+    Closed-form P(over), P(under) and P(push) for a stat line.
+
+    All arguments broadcast, so a whole slate (or a pitcher x alternate-line
+    grid) is priced in one call. 'normal' treats the stat as continuous, as
+    the notebooks did, so it never pushes. 'poisson' uses `mean` only.
+    'negbin' matches `mean` and `std` and falls back to Poisson wherever the
+    spread is not overdispersed (std**2 <= mean). For the discrete
+    distributions a whole-number line pushes when the stat lands on it.
+    'normal' and 'negbin' need `std`, and 'normal' needs it positive.
+    """
+    from scipy import stats
+    line = np.asarray(line, dtype=float)
+    mean = np.asarray(mean, dtype=float)
+    if dist in ('normal', 'negbin') and std is None:
+        raise ValueError(f"dist='{dist}' needs std")
+
+    if dist == 'normal':
+        std = np.asarray(std, dtype=float)
+        if not np.all(std > 0):
+            raise ValueError(f"dist='normal' needs std > 0, got {std[~(std > 0)].ravel()[:5].tolist()}")
+        p_under = stats.norm.cdf(line, loc=mean, scale=std)
+        p_over = 1.0 - p_under
+        return p_over, p_under, np.zeros_like(p_over)
+
+    if dist not in ('poisson', 'negbin'):
+        raise ValueError(f"Unknown distribution '{dist}', expected one of {DISTRIBUTIONS}")
+
+    whole = np.floor(line) == line
+    # Over needs strictly more than the line, under strictly fewer
+    over_k = np.floor(line)
+    under_k = np.where(whole, line - 1, np.floor(line))
+
+    poisson = stats.poisson(mean)
+    p_over, p_under, p_push = poisson.sf(over_k), poisson.cdf(under_k), poisson.pmf(line)
+
+    if dist == 'negbin':
+        var = np.asarray(std, dtype=float) ** 2
+        overdispersed = var > mean
+        # Moment match: n = mean^2 / (var - mean), p = n / (n + mean)
+        n = mean ** 2 / np.where(overdispersed, var - mean, 1.0)
+        negbin = stats.nbinom(np.where(overdispersed, n, 1.0), np.where(overdispersed, n / (n + mean), 0.5))
+        p_over = np.where(overdispersed, negbin.sf(over_k), p_over)
+        p_under = np.where(overdispersed, negbin.cdf(under_k), p_under)
+        p_push = np.where(overdispersed, negbin.pmf(line), p_push)
+
+    return p_over, p_under, np.where(whole, p_push, 0.0)
+
+
+def american_to_decimal(odds):
+    odds = np.asarray(odds, dtype=float)
+    return np.where(odds > 0, 1 + odds / 100, 1 + 100 / np.abs(odds))
+
+
+def expected_value(p_win, payout, p_push=0.0):
+    """EV per unit staked at a total (decimal) `payout`; a push returns the stake."""
+    return np.asarray(p_win) * payout + p_push - 1.0
+
+
+def price_lines(slate, dist='normal', line_col='k_line', mean_col='k_pred_mean', std_col='k_pred_std',
+                over_payout_col=None, under_payout_col=None):
+    """
+    Add p_over, p_under, p_push, ev_over and ev_under columns to a scored
+    slate (one row per line). Payouts default to the decimal prices from the
+    lines file, or to its American prices converted to decimal. Pass
+    multiplier columns to price against pick'em payouts instead.
+    """
+    slate = slate.copy()
+    std = slate[std_col].to_numpy() if std_col in slate.columns else None
+    p_over, p_under, p_push = prob_over_under(
+        slate[line_col].to_numpy(), slate[mean_col].to_numpy(), std, dist
+    )
+    slate['p_over'] = p_over
+    slate['p_under'] = p_under
+    slate['p_push'] = p_push
+
+    for side, payout_col in (('over', over_payout_col), ('under', under_payout_col)):
+        if payout_col is not None:
+            payout = slate[payout_col].to_numpy(dtype=float)
+        elif f'{side}_decimal_price' in slate.columns:
+            payout = slate[f'{side}_decimal_price'].to_numpy(dtype=float)
+        else:
+            payout = american_to_decimal(slate[f'{side}_american_price'])
+        slate[f'ev_{side}'] = expected_value(slate[f'p_{side}'], payout, p_push)
+
+    return slate
@@ -0,0 +1,48 @@
+"""
+Time the feature pipeline on synthetic Statcast data, with no network.
+
+A command-line wrapper around tests/benchmarks.py (also run by
+tests/test_benchmarks.py). Results are appended as JSON lines to
+`--results`; with `--compare`, the newest earlier result for the same
+benchmark and scale is the baseline and the script exits 1 when a
+benchmark got more than `--tolerance` slower.
+
+    python -m scripts.benchmark_pipeline --scales day month season --compare
+"""
+import argparse
+import sys
+
+from tests.benchmarks import RESULTS_PATH, append_results, benchmark_scale, load_results, regressions, run_stamp
+from tests.synthetic_statcast import SCALES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the feature pipeline on synthetic Statcast data")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["day", "month"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-end-to-end", action="store_true", help="Skip generate_dataset_from_raw")
+    parser.add_argument("--results", default=RESULTS_PATH)
+    parser.add_argument("--compare", action="store_true", help="Exit 1 on a slowdown against earlier results")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    baseline = load_results(args.results)
+    stamp = run_stamp()
+    results = []
+    for scale in args.scales:
+        print(f"⏱️ {scale} ({SCALES[scale]} days)")
+        results += [{**stamp, **r} for r in benchmark_scale(scale, args.repeat, args.seed, not args.no_end_to_end)]
+    append_results(results, args.results)
+    print(f"✅ Appended {len(results)} results to {args.results}")
+
+    if args.compare:
+        slower = regressions(results, baseline, args.tolerance)
+        for name, scale, before, after in slower:
+            print(f"❌ {name} @ {scale}: {before:.3f}s -> {after:.3f}s")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
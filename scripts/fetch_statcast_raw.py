@@ -1,26 +1,154 @@
+import json
 import os
+import time
 import pandas as pd
-from datetime import datetime
-from pybaseball import statcast
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
 
-def fetch_statcast_raw(season, start="04-01", end="10-01", save_dir="data/raw/statcast"):
+from ingest.statcast_store import RAW_PATH, write_statcast
+from instrumentation import add_arguments, configure_from_args, stage, summary
+
+CACHE_PATH = "data/raw/statcast_cache"
+
+def pybaseball_statcast(start_date, end_date):
+    from pybaseball import statcast
+    # We parallelize across chunks ourselves
+    return statcast(start_date, end_date, verbose=False, parallel=False)
+
+def chunk_date_range(start_date, end_date, chunk_days=7):
+    """Split [start_date, end_date] into inclusive (start, end) ISO date pairs."""
+    start = pd.Timestamp(start_date).date()
+    end = pd.Timestamp(end_date).date()
+    chunks = []
+    while start <= end:
+        chunk_end = min(start + timedelta(days=chunk_days - 1), end)
+        chunks.append((start.isoformat(), chunk_end.isoformat()))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+def load_manifest(cache_dir):
+    path = os.path.join(cache_dir, "manifest.json")
+    if not os.path.exists(path):
+        return {"chunks": {}}
+    with open(path) as f:
+        return json.load(f)
+
+def save_manifest(manifest, cache_dir):
+    path = os.path.join(cache_dir, "manifest.json")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+def fetch_chunk(fetch_fn, start_date, end_date, retries=3, backoff=2.0):
+    for attempt in range(retries + 1):
+        try:
+            with stage("fetch_chunk", chunk=f"{start_date}..{end_date}", attempt=attempt) as s:
+                df = fetch_fn(start_date, end_date)
+                s.rows_out = len(df)
+            return df
+        except Exception as e:
+            if attempt == retries:
+                raise
+            wait = backoff * 2 ** attempt
+            print(f"⚠️ {start_date}..{end_date} failed ({e}) — retrying in {wait:.0f}s")
+            time.sleep(wait)
+
+def fetch_statcast_range(start_date, end_date, season, save_dir=RAW_PATH, cache_dir=CACHE_PATH,
+                         chunk_days=7, workers=4, retries=3, refresh=False, fetch_fn=None, backoff=2.0):
+    """
+    Fetch Statcast for [start_date, end_date] in date chunks on a bounded
+    thread pool and write each one into the partitioned raw store.
+
+    Every chunk is cached under `cache_dir` with a manifest; chunks that
+    ended before today are final and are skipped on later runs unless
+    `refresh` is set. Failed chunks are retried after `backoff`, 2x`backoff`,
+    ... seconds, then left out of the manifest so the next run picks them
+    up. Returns the failed chunks.
+    """
+    fetch_fn = fetch_fn or pybaseball_statcast
+    cache_dir = os.path.join(cache_dir, str(season))
+    os.makedirs(cache_dir, exist_ok=True)
     os.makedirs(save_dir, exist_ok=True)
 
-    start_date = f"{season}-{start}"
-    end_date = f"{season}-{end}"
+    manifest = load_manifest(cache_dir)
+    today = date.today().isoformat()
+
+    pending = []
+    for chunk_start, chunk_end in chunk_date_range(start_date, end_date, chunk_days):
+        key = f"{chunk_start}_{chunk_end}"
+        entry = manifest["chunks"].get(key)
+        if (not refresh and entry and entry["complete"]
+                and os.path.exists(os.path.join(cache_dir, entry["file"]))):
+            continue
+        pending.append((key, chunk_start, chunk_end))
+
+    skipped = len(chunk_date_range(start_date, end_date, chunk_days)) - len(pending)
+    print(f"📡 Fetching {len(pending)} chunks from {start_date} to {end_date} ({skipped} cached)")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(fetch_chunk, fetch_fn, chunk_start, chunk_end, retries, backoff): (key, chunk_start, chunk_end)
+            for key, chunk_start, chunk_end in pending
+        }
+        for future in as_completed(futures):
+            key, chunk_start, chunk_end = futures[future]
+            try:
+                df = future.result()
+            except Exception as e:
+                print(f"❌ {chunk_start}..{chunk_end} failed after {retries} retries: {e}")
+                failed.append((chunk_start, chunk_end))
+                continue
 
-    print(f"📡 Fetching Statcast data from {start_date} to {end_date}")
-    df = statcast(start_date, end_date)
-    print(f"💾 Retrieved {len(df)} rows")
+            file_name = f"chunk_{key}.parquet"
+            with stage("write_chunk", rows_in=len(df), chunk=key):
+                df.to_parquet(os.path.join(cache_dir, file_name), index=False)
+                if not df.empty:
+                    write_statcast(df, season, root=save_dir)
 
-    out_path = os.path.join(save_dir, f"statcast_raw_{season}.parquet")
-    df.to_parquet(out_path, index=False)
-    print(f"✅ Saved to {out_path}")
+            manifest["chunks"][key] = {
+                "file": file_name,
+                "rows": len(df),
+                "complete": chunk_end < today,
+                "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            save_manifest(manifest, cache_dir)
+            print(f"💾 {chunk_start}..{chunk_end}: {len(df)} rows")
+
+    if failed:
+        print(f"❌ {len(failed)} chunks failed — rerun to resume")
+    else:
+        print(f"✅ Saved to {os.path.join(save_dir, f'season={season}')}")
+    return failed
+
+def fetch_statcast_raw(season, start="04-01", end="10-01", save_dir=RAW_PATH, **kwargs):
+    start_date = f"{season}-{start}"
+    end_date = f"{season}-{end}"
+    return fetch_statcast_range(start_date, end_date, season, save_dir=save_dir, **kwargs)
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
-    parser.add_argument("--season", type=int, required=True)
+    parser.add_argument("--season", type=int)
+    parser.add_argument("--start", default="04-01", help="MM-DD")
+    parser.add_argument("--end", default="10-01", help="MM-DD")
+    parser.add_argument("--yesterday", action="store_true", help="Fetch only yesterday's games")
+    parser.add_argument("--chunk-days", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--refresh", action="store_true", help="Refetch cached chunks")
+    add_arguments(parser)
     args = parser.parse_args()
+    configure_from_args(args)
 
-    fetch_statcast_raw(args.season)
\ No newline at end of file
+    options = dict(chunk_days=args.chunk_days, workers=args.workers,
+                   retries=args.retries, refresh=args.refresh)
+    if args.yesterday:
+        day = date.today() - timedelta(days=1)
+        fetch_statcast_range(day, day, day.year, **options)
+    elif args.season is None:
+        parser.error("--season is required unless --yesterday is given")
+    else:
+        fetch_statcast_raw(args.season, args.start, args.end, **options)
+    summary()
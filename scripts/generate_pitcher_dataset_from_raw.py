@@ -1,72 +1,72 @@
 import os
 
 import pandas as pd
-from pybaseball import playerid_reverse_lookup
 
-from features.dynamic_opponent import compute_opponent_k_pct_dynamic
-from features.park_factors import compute_k_park_factors
-from features.pitcher_enrichment import enrich_pitcher_games
+from features.latest_index import latest_index_path, write_latest_index
+from features.mlb_features import COUNT_COLS
+from features.pitcher_enrichment import enrich_all_pitcher_games
+from features.pitcher_state import build_pitcher_state, save_pitcher_state, write_dataset
+from features.team_context import opponent_k_table, park_factor_table
+from ingest.player_ids import load_pitcher_ids
+from ingest.statcast_store import PITCHER_COLUMNS, load_statcast
+from instrumentation import add_arguments, configure_from_args, stage, summary
 
 RAW_PATH = "data/raw/statcast"
 OUTPUT_PATH = "data/processed"
 
-def load_pitcher_ids(csv_path):
-    df = pd.read_csv(csv_path)
-    lookup = playerid_reverse_lookup(df['IDfg'].tolist(), key_type='fangraphs')
-    merged = df.merge(lookup, left_on='IDfg', right_on='key_fangraphs')
-    return list(zip(merged['Name'], merged['key_mlbam']))
-
 def generate_dataset_from_raw(season):
-    raw_file = os.path.join(RAW_PATH, f"statcast_raw_{season}.parquet")
     starter_csv = f"data/raw/top_starters_{season}.csv"
     output_file = os.path.join(OUTPUT_PATH, f"pitcher_game_data_{season}.parquet")
+    state_file = os.path.join(OUTPUT_PATH, f"pitcher_state_{season}.parquet")
 
-    print(f"📂 Loading raw statcast data from {raw_file}")
-    df = pd.read_parquet(raw_file)
-    df['game_date'] = pd.to_datetime(df['game_date'])
-
-    print(f"📋 Loading starter list from {starter_csv}")
-    pitchers = load_pitcher_ids(starter_csv)
-    mlbam_ids = [pid for _, pid in pitchers]
+    with stage("generate", season=season):
+        print(f"📂 Loading raw statcast data from {RAW_PATH}")
+        with stage("load_statcast") as s:
+            df = load_statcast(season, columns=PITCHER_COLUMNS, root=RAW_PATH)
+            s.rows_out = len(df)
 
-    print(f"📆 Computing opponent K% from raw data...")
-    opponent_k_df = compute_opponent_k_pct_dynamic(
-        start_date=df['game_date'].min().strftime("%Y-%m-%d"),
-        end_date=df['game_date'].max().strftime("%Y-%m-%d"),
-        source_df=df
-    )
-    opponent_k_df['game_date'] = pd.to_datetime(opponent_k_df['game_date'])
+        print(f"📋 Loading starter list from {starter_csv}")
+        with stage("load_pitcher_ids") as s:
+            pitchers = load_pitcher_ids(starter_csv)
+            s.rows_out = len(pitchers)
 
-    print(f"🏟️ Computing park factors from raw data...")
-    park_df = compute_k_park_factors(
-        start_date=df['game_date'].min().strftime("%Y-%m-%d"),
-        end_date=df['game_date'].max().strftime("%Y-%m-%d"),
-        source_df=df
-    )
+        print(f"📆 Loading opponent K% from the team context cache...")
+        with stage("opponent_k") as s:
+            opponent_k_df = opponent_k_table(season, root=RAW_PATH)
+            s.rows_out = len(opponent_k_df)
 
-    print(f"🧠 Processing {len(pitchers)} pitchers...")
-    all_games =[]
-    for name, mlbam_id in pitchers:
-        player_df = df[df['pitcher'] == mlbam_id]
-        if player_df.empty:
-            print(f"⛔ No data for {name} ({mlbam_id})")
-            continue
+        print(f"🏟️ Loading park factors from the team context cache...")
+        with stage("park_factors") as s:
+            park_df = park_factor_table(season, root=RAW_PATH)
+            s.rows_out = len(park_df)
 
-        enriched = enrich_pitcher_games(player_df, name, mlbam_id, opponent_k_df, park_df)
-        if enriched is not None:
-            all_games.append(enriched)
+        print(f"🧠 Processing {len(pitchers)} pitchers...")
+        found_ids = set(df['pitcher'].unique())
+        for name, mlbam_id in pitchers:
+            if mlbam_id not in found_ids:
+                print(f"⛔ No data for {name} ({mlbam_id})")
 
-    if not all_games:
-        print("❌ No pitcher games generated.")
-        return
+        with stage("enrich", rows_in=len(df)) as s:
+            full_df = enrich_all_pitcher_games(df, pitchers, opponent_k_df, park_df, keep_counts=True)
+            s.rows_out = 0 if full_df is None else len(full_df)
+        if full_df is None:
+            print("❌ No pitcher games generated.")
+            return
 
-    full_df = pd.concat(all_games, ignore_index=True)
-    full_df.to_parquet(output_file, index=False)
-    print(f"✅ Saved {len(full_df)} rows to {output_file}")
+        with stage("write", rows_in=len(full_df)):
+            state = build_pitcher_state(full_df)
+            full_df = full_df.drop(columns=COUNT_COLS)
+            part_file = write_dataset(full_df, output_file)
+            save_pitcher_state(state, state_file, dataset_part=os.path.basename(part_file))
+            write_latest_index(full_df, latest_index_path(season, OUTPUT_PATH))
+        print(f"✅ Saved {len(full_df)} rows to {output_file}")
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--season", type=int, required=True)
+    add_arguments(parser)
     args = parser.parse_args()
+    configure_from_args(args)
     generate_dataset_from_raw(args.season)
+    summary()
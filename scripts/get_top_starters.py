@@ -5,7 +5,20 @@ Filters for GS >= 10 and sorts by WAR.
 """
 
 import argparse
-from pybaseball import pitching_stats
+
+def top_starters_path(season):
+    return f"data/raw/top_starters_{season}.csv"
+
+def top_starters(season, top_n=999):
+    from pybaseball import pitching_stats
+
+    df = pitching_stats(season, qual=0)
+
+    starters = df[(df['IP'] >= 15) & (df['GS'] > 0)].copy()
+    starters = starters.sort_values('WAR', ascending=False)
+
+    keep = ['Name', 'Team', 'IP', 'GS', 'WAR', 'ERA', 'K/9', 'IDfg']
+    return starters[keep].head(top_n)
 
 def main():
     p = argparse.ArgumentParser()
@@ -14,20 +27,13 @@ def main():
     args = p.parse_args()
 
     season = args.season
-    top_n = args.top
-    out_path = f"data/raw/top_starters_{season}.csv"
+    out_path = top_starters_path(season)
 
     print(f"📊 Fetching pitching stats for {season}...")
-    df = pitching_stats(season, qual=0)
-
-    starters = df[(df['IP'] >= 15) & (df['GS'] > 0)].copy()
-    starters = starters.sort_values('WAR', ascending=False)
-
-    keep = ['Name', 'Team', 'IP', 'GS', 'WAR', 'ERA', 'K/9', 'IDfg']
-    starters = starters[keep].head(top_n)
+    starters = top_starters(season, args.top)
 
     starters.to_csv(out_path, index=False)
     print(f"✅ Saved {len(starters)} starters to {out_path}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,39 @@
+from features.feature_store import export_training_matrix, sync_feature_store
+from models.ensemble import FEATURE_COLS, TARGET_COL, save_ensemble, train_bootstrap_ensemble
+from models.tuning import load_params
+
+def load_training_data(seasons):
+    """Memory-mapped float32 (X, y) for `seasons` from the feature store."""
+    sync_feature_store(seasons)
+    X, y, meta = export_training_matrix(seasons, FEATURE_COLS, TARGET_COL)
+    print(f"📦 {len(y)} rows × {len(FEATURE_COLS)} features (feature version {meta['feature_version']})")
+    return X, y
+
+def main(seasons, n_models=100, n_jobs=-1, threads_per_model=1, seed=0, params_file=None):
+    print(f"▶️ Training on seasons {seasons}")
+    X_train, y_train = load_training_data(seasons)
+    params = load_params(params_file) if params_file else None
+    if params:
+        print(f"🎛️ Using tuned params from {params_file}: {params}")
+
+    print(f"🧠 Fitting {n_models} bootstrap models ({n_jobs} jobs × {threads_per_model} threads)...")
+    ensemble = train_bootstrap_ensemble(
+        X_train, y_train, n_models=n_models, params=params, n_jobs=n_jobs,
+        threads_per_model=threads_per_model, seed=seed,
+        meta={'trained_on': seasons}, features=FEATURE_COLS
+    )
+
+    path = save_ensemble(ensemble)
+    print(f"✅ Saved {len(ensemble)}-model ensemble to {path}")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seasons", type=int, nargs="+", default=[2021, 2022, 2023, 2024])
+    parser.add_argument("--n-models", type=int, default=100)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--threads-per-model", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--params", help="Tuned params JSON from cli.tune")
+    args = parser.parse_args()
+    main(args.seasons, args.n_models, args.n_jobs, args.threads_per_model, args.seed, args.params)
@@ -1,13 +1,19 @@
 import os
 import pandas as pd
+import pyarrow.parquet as pq
 from datetime import date, timedelta
 
-from pybaseball import playerid_reverse_lookup
-from features.mlb_features import aggregate_pitcher_games
-from features.dynamic_opponent import compute_opponent_k_pct_dynamic
-from features.park_factors import compute_k_park_factors
-from features.enrichments import add_park_factor
-from features.rolling import add_rolling_features
+from features.latest_index import latest_index_path, update_latest_index
+from features.mlb_features import COUNT_COLS, aggregate_pitcher_games
+from features.pitcher_enrichment import enrich_all_pitcher_games
+from features.pitcher_state import (
+    append_dataset_part, build_pitcher_state, last_dataset_part, load_pitcher_state, save_pitcher_state,
+    state_dataset_part
+)
+from features.team_context import opponent_k_table, park_factor_table
+from ingest.player_ids import load_pitcher_ids
+from ingest.statcast_store import PITCHER_COLUMNS, has_statcast, load_statcast
+from instrumentation import add_arguments, configure_from_args, stage, summary
 
 RAW_PATH = "data/raw/statcast"
 PROCESSED_PATH = "data/processed"
@@ -15,98 +21,132 @@ PROCESSED_PATH = "data/processed"
 def get_latest_game_data(processed_path):
     if not os.path.exists(processed_path):
         return None
-    df = pd.read_parquet(processed_path)
+    df = pd.read_parquet(processed_path, columns=["game_date"])
     return pd.to_datetime(df["game_date"]).max()
 
-def load_pitcher_ids(starter_csv):
-    df = pd.read_csv(starter_csv)
-    lookup = playerid_reverse_lookup(df['IDfg'].tolist(), key_type='fangraphs')
-    merged = df.merge(lookup, left_on='IDfg', right_on='key_fangraphs')
-    return list(zip(merged['Name'], merged['key_mlbam']))
-
-def update_pitcher_dataset(season):
-    raw_file = os.path.join(RAW_PATH, f"statcast_raw_{season}.parquet")
+def bootstrap_pitcher_state(season, pitchers, processed_file):
+    # Datasets written before state files existed: rebuild it once from raw
+    latest_date = get_latest_game_data(processed_file)
+    mlbam_ids = [pid for _, pid in pitchers]
+    done_df = load_statcast(
+        season, columns=PITCHER_COLUMNS, end_date=latest_date, pitchers=mlbam_ids, root=RAW_PATH
+    )
+    games = aggregate_pitcher_games(done_df, keep_counts=True)
+    games['game_date'] = pd.to_datetime(games['game_date'])
+    return build_pitcher_state(games)
+
+def update_pitcher_dataset(season, pitchers=None):
+    """
+    Append games played since the last run. `pitchers` ((name, MLBAM id)
+    pairs) defaults to the season's starter list. Returns the new games,
+    or None when nothing was added.
+    """
     processed_file = os.path.join(PROCESSED_PATH, f"pitcher_game_data_{season}.parquet")
+    state_file = os.path.join(PROCESSED_PATH, f"pitcher_state_{season}.parquet")
     starter_csv = f"data/raw/top_starters_{season}.csv"
 
-    if not os.path.exists(raw_file):
-        print(f"❌ No statcast_raw_{season}.parquet found. Run fetch_statcast_raw.py first.")
+    if not has_statcast(season, RAW_PATH):
+        print(f"❌ No raw statcast data for {season} found. Run fetch_statcast_raw.py first.")
         return
 
-    df = pd.read_parquet(raw_file)
-    df['game_date'] = pd.to_datetime(df['game_date'])
-
-    latest_date = get_latest_game_data(processed_file)
-    if latest_date is None:
+    if not os.path.exists(processed_file):
         print("⚠️ No existing dataset — run full generator first.")
         return
 
-    start_date = latest_date.strftime("%Y-%m-%d")
-    end_date = (date.today() - timedelta(days=1)).strftime("%Y-%m-%d")
-
-    print(f"📆 Updating pitcher dataset from {start_date} to {end_date}")
-    new_df = df[(df['game_date'] >= start_date) & (df['game_date'] <= end_date)]
-
-    if new_df.empty:
-        print("✅ No new games found — nothing to update.")
-        return
+    with stage("update", season=season):
+        return _update_pitcher_dataset(season, pitchers, starter_csv, processed_file, state_file)
 
-    pitchers = load_pitcher_ids(starter_csv)
+def _update_pitcher_dataset(season, pitchers, starter_csv, processed_file, state_file):
+    if pitchers is None:
+        with stage("load_pitcher_ids") as s:
+            pitchers = load_pitcher_ids(starter_csv)
+            s.rows_out = len(pitchers)
     mlbam_ids = [pid for _, pid in pitchers]
-    new_df = new_df[new_df['pitcher'].isin(mlbam_ids)]
 
-    season_start = df['game_date'].min().strftime("%Y-%m-%d")
+    with stage("load_state") as s:
+        state = load_pitcher_state(state_file)
+        # Parts after this one were written by a run that stopped before saving the state
+        covered_part = state_dataset_part(state_file)
+        if state is None:
+            print("⚠️ No pitcher state found — rebuilding it from raw data.")
+            state = bootstrap_pitcher_state(season, pitchers, processed_file)
+        s.rows_out = len(state)
 
-    opponent_k_df = compute_opponent_k_pct_dynamic(
-        season_start, end_date, source_df=df
-    )
-    park_df = compute_k_park_factors(
-        season_start, end_date, source_df=df
-    )
+    start_date = state['game_date'].max().strftime("%Y-%m-%d")
+    end_date = (date.today() - timedelta(days=1)).strftime("%Y-%m-%d")
 
-    all_games = []
+    print(f"📆 Updating pitcher dataset from {start_date} to {end_date}")
+    # Read only the pitches after each tracked pitcher's last processed game,
+    # one read per distinct last game so an idle starter does not pull the
+    # early season for everyone; starters with no state yet need their whole season
+    last_game = state.groupby('pitcher')['game_date'].max()
+    tracked = last_game[last_game.index.isin(mlbam_ids)]
+    untracked = [pid for pid in mlbam_ids if pid not in last_game.index]
+    with stage("load_statcast") as s:
+        frames = [load_statcast(
+            season, columns=PITCHER_COLUMNS, start_date=load_from, end_date=end_date,
+            pitchers=group.index.tolist(), root=RAW_PATH
+        ) for load_from, group in tracked.groupby(tracked)]
+        if untracked:
+            frames.append(load_statcast(
+                season, columns=PITCHER_COLUMNS, end_date=end_date, pitchers=untracked, root=RAW_PATH
+            ))
+        if not frames:
+            print("✅ No new games found — nothing to update.")
+            return
+        new_df = pd.concat(frames, ignore_index=True)
+        new_df = new_df[~(new_df['game_date'] <= new_df['pitcher'].map(last_game))]
+        s.rows_out = len(new_df)
+
+    described = set(new_df.loc[new_df['description'].notna(), 'pitcher'].unique())
+    undescribed = set(new_df['pitcher'].unique()) - described
     for name, mlbam_id in pitchers:
-        player_df = new_df[new_df['pitcher'] == mlbam_id]
-        if player_df.empty:
-            continue
-
-        if 'description' not in player_df.columns:
-            print(f"⚠️ No 'description' column found for {name}")
-            continue
-
-        if player_df['description'].notna().sum() == 0:
+        if mlbam_id in undescribed:
             print(f"⚠️ All descriptions missing for {name} — {mlbam_id}")
-            continue
-
-        games = aggregate_pitcher_games(player_df)
-        games['game_date'] = pd.to_datetime(player_df['game_date'])
-
-        games = games.merge(
-            opponent_k_df,
-            left_on=['game_date', 'opponent_team'],
-            right_on=['game_date', 'Team'],
-            how='left'
-        ).rename(columns={'K_pct_so_far': 'opponent_k_pct'}).drop(columns=['Team'])
+    new_df = new_df[new_df['pitcher'].isin(described)]
 
-        games = add_park_factor(games, park_df)
-        games = add_rolling_features(games)
-        games['pitcher_name'] = name
-        games['pitcher_id'] = mlbam_id
-        all_games.append(games)
+    if new_df.empty:
+        print("✅ No new games found — nothing to update.")
+        return
 
-    if not all_games:
+    with stage("team_context") as s:
+        opponent_k_df = opponent_k_table(season, end_date=end_date, root=RAW_PATH)
+        park_df = park_factor_table(season, end_date=end_date, root=RAW_PATH)
+        s.rows_out = len(opponent_k_df)
+
+    with stage("enrich", rows_in=len(new_df)) as s:
+        new_games = enrich_all_pitcher_games(
+            new_df, pitchers, opponent_k_df, park_df, state=state, keep_counts=True
+        )
+        s.rows_out = 0 if new_games is None else len(new_games)
+    if new_games is None:
         print("⚠️ No new pitcher games added.")
         return
 
-    new_games = pd.concat(all_games, ignore_index=True)
-    full_df = pd.read_parquet(processed_file)
-    updated_df = pd.concat([full_df, new_games], ignore_index=True).drop_duplicates()
-    updated_df.to_parquet(processed_file, index=False)
-    print(f"✅ Appended {len(new_games)} new rows. Total rows: {len(updated_df)}")
+    with stage("write", rows_in=len(new_games)):
+        new_rows = new_games.drop(columns=COUNT_COLS)
+        update_latest_index(new_rows, latest_index_path(season, PROCESSED_PATH), processed_file)
+        # Part before state: if the run stops in between, the next one redoes
+        # these games from the old state and the key check, over the parts
+        # written since that state, skips the rows
+        part_file = append_dataset_part(
+            new_rows, processed_file, key=['pitcher_id', 'game_date'], after_part=covered_part
+        )
+        save_pitcher_state(
+            build_pitcher_state(new_games, state), state_file, dataset_part=last_dataset_part(processed_file)
+        )
+    if part_file is None:
+        print("✅ New games were already in the dataset — pitcher state caught up.")
+    else:
+        print(f"✅ Appended {pq.read_metadata(part_file).num_rows} new rows to {part_file}")
+    return new_games
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--season", type=int, required=True)
+    add_arguments(parser)
     args = parser.parse_args()
-    update_pitcher_dataset(args.season)
\ No newline at end of file
+    configure_from_args(args)
+    update_pitcher_dataset(args.season)
+    summary()
@@ -0,0 +1,175 @@
+"""
+Pipeline benchmarks on synthetic Statcast data, with no network.
+
+Each benchmark runs once under tracemalloc for peak Python/NumPy memory and
+then `repeat` times untraced for wall time. Results can be appended as JSON
+lines to a results file; regressions() compares them with the newest
+earlier result for the same benchmark and scale. Run by
+tests/test_benchmarks.py and by scripts/benchmark_pipeline.py.
+"""
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from features.dynamic_opponent import compute_opponent_k_pct_dynamic, team_day_counts, update_opponent_k_pct
+from features.mlb_features import aggregate_pitcher_games
+from features.park_factors import compute_k_park_factors
+from features.rolling import add_rolling_features
+from ingest.statcast_store import PITCHER_COLUMNS, write_statcast
+from tests.synthetic_statcast import SCALES, synthetic_seasons
+
+RESULTS_PATH = "data/benchmarks/pipeline.jsonl"
+
+
+def measure(fn, repeat=3):
+    """Best and median wall seconds over `repeat` untraced runs, plus traced peak MB."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {'wall_best': min(times), 'wall_median': statistics.median(times), 'peak_mb': peak / 2 ** 20}
+
+
+@contextmanager
+def _workdir():
+    """A throwaway directory to run path-relative scripts in."""
+    cwd = os.getcwd()
+    path = tempfile.mkdtemp(prefix="sportsbalf-bench-")
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _write_inputs(seasons, root):
+    """Raw store, starter lists and player id crosswalk for generate_dataset_from_raw."""
+    from ingest.player_ids import PLAYER_IDS_PATH
+    from features.latest_index import normalize_name
+
+    pitchers = set()
+    for season, df in seasons.items():
+        write_statcast(df, season, root=os.path.join(root, "data/raw/statcast"))
+        starters = df.loc[df['pitch_number'] == 1, 'pitcher'].unique()
+        pd.DataFrame({'Name': [f"Pitcher {p}" for p in starters], 'IDfg': starters - 500000}).to_csv(
+            os.path.join(root, f"data/raw/top_starters_{season}.csv"), index=False
+        )
+        pitchers.update(df['pitcher'].unique())
+    names = [f"Pitcher {p}" for p in sorted(pitchers)]
+    pd.DataFrame({
+        'key_mlbam': pd.Series(sorted(pitchers), dtype='int32'),
+        'key_fangraphs': pd.Series([p - 500000 for p in sorted(pitchers)], dtype='int32'),
+        'name': names,
+        'mlb_played_last': pd.Series(max(seasons), index=range(len(names)), dtype='int16'),
+        'name_key': [normalize_name(n) for n in names],
+    }).to_parquet(os.path.join(root, PLAYER_IDS_PATH), index=False)
+
+
+def _end_to_end(seasons, repeat):
+    """generate_dataset_from_raw over every season, cold caches on each run."""
+    from scripts.generate_pitcher_dataset_from_raw import generate_dataset_from_raw
+
+    with _workdir() as root:
+        os.makedirs("data/raw", exist_ok=True)
+        _write_inputs(seasons, root)
+
+        def run():
+            shutil.rmtree("data/processed", ignore_errors=True)
+            os.makedirs("data/processed")
+            with open(os.devnull, "w") as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    for season in seasons:
+                        generate_dataset_from_raw(season)
+                finally:
+                    sys.stdout = stdout
+
+        return measure(run, repeat)
+
+
+def benchmark_scale(scale, repeat=3, seed=0, end_to_end=True, verbose=True):
+    """One result dict per benchmark at `scale` (a key of SCALES)."""
+    seasons = synthetic_seasons(scale, seed=seed)
+    pitches = pd.concat(seasons.values(), ignore_index=True)
+    start_date, end_date = pitches['game_date'].min(), pitches['game_date'].max()
+    games = aggregate_pitcher_games(pitches[PITCHER_COLUMNS], keep_counts=True)
+    # Team-day counts through the day before the last, for the one-day incremental update
+    team_days = team_day_counts(pitches[pitches['game_date'] < end_date])
+
+    benchmarks = {
+        'aggregate_pitcher_games': lambda: aggregate_pitcher_games(pitches[PITCHER_COLUMNS], keep_counts=True),
+        'compute_opponent_k_pct_dynamic': lambda: compute_opponent_k_pct_dynamic(
+            start_date, end_date, source_df=pitches
+        ),
+        'update_opponent_k_pct': lambda: update_opponent_k_pct(
+            start_date, end_date, team_days, source_df=pitches
+        ),
+        'compute_k_park_factors': lambda: compute_k_park_factors(start_date, end_date, source_df=pitches),
+        'add_rolling_features': lambda: add_rolling_features(games, group_col='pitcher'),
+    }
+    results = []
+    for name, fn in benchmarks.items():
+        results.append({'benchmark': name, 'rows': len(pitches), **measure(fn, repeat)})
+    if end_to_end:
+        results.append({'benchmark': 'generate_dataset_from_raw', 'rows': len(pitches),
+                        **_end_to_end(seasons, repeat)})
+    if verbose:
+        for r in results:
+            print(f"  {r['benchmark']:<32} {r['wall_best']:8.3f}s  {r['peak_mb']:8.1f} MB")
+    return [{'scale': scale, **r} for r in results]
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_stamp():
+    """Revision and time to tag one run's results with."""
+    return {'revision': _git_revision(), 'run_at': datetime.now(timezone.utc).isoformat(timespec='seconds')}
+
+
+def load_results(path=RESULTS_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_results(results, path=RESULTS_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        for r in results:
+            f.write(json.dumps(r) + "\n")
+
+
+def regressions(results, baseline, tolerance=0.2):
+    """(benchmark, scale, before, after) for results slower than baseline by more than `tolerance`."""
+    latest = {(r['benchmark'], r['scale']): r for r in baseline}
+    slower = []
+    for r in results:
+        before = latest.get((r['benchmark'], r['scale']))
+        if before and r['wall_best'] > before['wall_best'] * (1 + tolerance):
+            slower.append((r['benchmark'], r['scale'], before['wall_best'], r['wall_best']))
+    return slower
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+TEAMS = [
+    'AZ', 'ATL', 'BAL', 'BOS', 'CHC', 'CWS', 'CIN', 'CLE', 'COL', 'DET', 'HOU', 'KC', 'LAA', 'LAD', 'MIA',
+    'MIL', 'MIN', 'NYM', 'NYY', 'OAK', 'PHI', 'PIT', 'SD', 'SF', 'SEA', 'STL', 'TB', 'TEX', 'TOR', 'WSH',
+]
+ROTATION_SIZE = 5
+BULLPEN_SIZE = 8
+
+# Rough league-wide mix for pitches that do not end a plate appearance
+DESCRIPTIONS = {
+    'ball': 0.42, 'called_strike': 0.19, 'swinging_strike': 0.12, 'swinging_strike_blocked': 0.01,
+    'foul': 0.24, 'blocked_ball': 0.02,
+}
+STRIKEOUT_DESCRIPTIONS = {'swinging_strike': 0.6, 'called_strike': 0.25, 'foul_tip': 0.05,
+                          'swinging_strike_blocked': 0.1}
+PA_EVENTS = {
+    'strikeout': 0.22, 'field_out': 0.44, 'single': 0.14, 'walk': 0.08,
+    'double': 0.045, 'home_run': 0.03, 'grounded_into_double_play': 0.02, 'hit_by_pitch': 0.015,
+    'triple': 0.005, 'sac_fly': 0.005,
+}
+PITCH_TYPES = {'FF': 0.33, 'SL': 0.19, 'SI': 0.15, 'CH': 0.11, 'CU': 0.08, 'FC': 0.07, 'ST': 0.05, None: 0.02}
+PITCHES_PER_PA = 3.9
+
+# Days of games per scale; a regular season is about 186 days
+SCALES = {'day': 1, 'month': 30, 'season': 186, 'five_seasons': 5 * 186}
+
+
+def _choice(rng, options, size):
+    keys = list(options)
+    probs = np.array(list(options.values()), dtype=float)
+    return np.array(keys, dtype=object)[rng.choice(len(keys), size, p=probs / probs.sum())]
+
+
+def synthetic_statcast(days=30, start_date="2025-03-27", seed=0, starter_pitches=(75, 105),
+                       reliever_pitches=(10, 30)):
+    """
+    Pitch-level frame shaped like pybaseball.statcast() output, with no
+    network access. Every day all 30 teams play (15 games). Each side uses
+    the next starter of a five-man rotation and two or three relievers from
+    an eight-man bullpen. Descriptions, plate-appearance events and pitch
+    types follow rough league rates.
+
+    Carries the columns the feature pipeline reads: PITCHER_COLUMNS,
+    TEAM_COLUMNS, game_pk and pitch_number.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start_date, periods=days)
+    n_teams = len(TEAMS)
+    starters = 600000 + np.arange(n_teams * ROTATION_SIZE).reshape(n_teams, ROTATION_SIZE)
+    bullpens = 700000 + np.arange(n_teams * BULLPEN_SIZE).reshape(n_teams, BULLPEN_SIZE)
+
+    # One row per pitcher appearance: (day, game, fielding team, batting team, home?, pitcher, pitches)
+    day_idx, home_idx, away_idx = [], [], []
+    for d in range(days):
+        order = rng.permutation(n_teams)
+        day_idx.append(np.full(n_teams // 2, d))
+        home_idx.append(order[::2])
+        away_idx.append(order[1::2])
+    day_idx, home_idx, away_idx = map(np.concatenate, (day_idx, home_idx, away_idx))
+    n_games = len(day_idx)
+    game_pk = 700000 + np.arange(n_games)
+
+    apps = []
+    for fielding, batting, top in ((home_idx, away_idx, 'Top'), (away_idx, home_idx, 'Bot')):
+        starter = starters[fielding, day_idx % ROTATION_SIZE]
+        apps.append(pd.DataFrame({
+            'game': np.arange(n_games), 'fielding': fielding, 'batting': batting, 'topbot': top,
+            'pitcher': starter, 'order': 0,
+            'pitches': rng.integers(*starter_pitches, n_games),
+        }))
+        n_relievers = rng.integers(2, 4, n_games)
+        game_rep = np.repeat(np.arange(n_games), n_relievers)
+        slot = np.concatenate([np.arange(k) for k in n_relievers])
+        apps.append(pd.DataFrame({
+            'game': game_rep, 'fielding': fielding[game_rep], 'batting': batting[game_rep], 'topbot': top,
+            'pitcher': bullpens[fielding[game_rep], rng.integers(0, BULLPEN_SIZE, len(game_rep))],
+            'order': 1 + slot,
+            'pitches': rng.integers(*reliever_pitches, len(game_rep)),
+        }))
+    apps = pd.concat(apps, ignore_index=True).sort_values(['game', 'topbot', 'order'], kind='stable')
+    apps = apps.drop_duplicates(['game', 'pitcher'])
+
+    # Expand appearances to pitches
+    n_pitches = apps['pitches'].to_numpy()
+    rows = np.repeat(np.arange(len(apps)), n_pitches)
+    app = apps.iloc[rows].reset_index(drop=True)
+    side_pitch = app.groupby(['game', 'topbot']).cumcount().to_numpy()
+    side_total = app.groupby(['game', 'topbot'])['pitches'].transform('size').to_numpy()
+    n = len(app)
+
+    # The last pitch of a plate appearance carries its event and a matching description
+    ends_pa = rng.random(n) < 1 / PITCHES_PER_PA
+    events = np.where(ends_pa, _choice(rng, PA_EVENTS, n), None)
+    description = _choice(rng, DESCRIPTIONS, n)
+    description = np.where(ends_pa, 'hit_into_play', description)
+    description = np.where(events == 'strikeout', _choice(rng, STRIKEOUT_DESCRIPTIONS, n), description)
+    description = np.where(events == 'walk', 'ball', description)
+    description = np.where(events == 'hit_by_pitch', 'hit_by_pitch', description)
+
+    # Days since each pitcher's previous appearance, from the schedule itself
+    app_days = pd.DataFrame({'pitcher': apps['pitcher'].to_numpy(), 'day': day_idx[apps['game'].to_numpy()]})
+    prev_gap = app_days.groupby('pitcher')['day'].diff().to_numpy()
+    gap = prev_gap[rows]
+
+    home_team = np.array(TEAMS, dtype=object)[home_idx[app['game'].to_numpy()]]
+    away_team = np.array(TEAMS, dtype=object)[away_idx[app['game'].to_numpy()]]
+    df = pd.DataFrame({
+        'pitch_type': _choice(rng, PITCH_TYPES, n),
+        'game_date': dates[day_idx[app['game'].to_numpy()]].strftime('%Y-%m-%d'),
+        'player_name': 'Pitcher ' + app['pitcher'].astype(str).to_numpy(),
+        'batter': rng.integers(400000, 500000, n),
+        'pitcher': app['pitcher'].to_numpy(),
+        'events': events,
+        'description': description,
+        'home_team': home_team,
+        'away_team': away_team,
+        'inning_topbot': app['topbot'].to_numpy(),
+        'inning': 1 + (side_pitch * 9) // side_total,
+        'game_pk': game_pk[app['game'].to_numpy()],
+        'pitch_number': side_pitch + 1,
+        'pitcher_days_since_prev_game': gap,
+    })
+    # Statcast returns the newest pitches first
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+def synthetic_seasons(scale="season", first_season=2025, seed=0):
+    """{season: frame} for a named scale in SCALES; five_seasons spans five years."""
+    days = SCALES[scale]
+    seasons = {}
+    for i in range(max(1, days // SCALES['season'])):
+        season_days = min(days, SCALES['season'])
+        seasons[first_season - i] = synthetic_statcast(
+            season_days, start_date=f"{first_season - i}-03-27", seed=seed + i
+        )
+    return seasons
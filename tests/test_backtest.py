@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from features.latest_index import pregame_rows
+from ingest.ud_lines import LINE_COLUMNS, record_snapshot
+from models.backtest import cache_features, historical_lines, run_backtest
+from models.ensemble import FEATURE_COLS, TARGET_COL
+
+
+def _games(n_pitchers=6, n_days=40, seed=0):
+    """
+    pitch_count equals the game's own strikeouts (the leak a backtest must
+    not see); every other feature is row * 100 + column, naming its game.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2025-04-01", periods=n_days)
+    games = pd.DataFrame([
+        {'pitcher_id': 600000 + p, 'pitcher_name': f"Pitcher {p}", 'game_date': d}
+        for d in dates for p in range(n_pitchers) if rng.random() < 0.6
+    ])
+    games[TARGET_COL] = rng.integers(0, 12, len(games))
+    for j, col in enumerate(FEATURE_COLS):
+        games[col] = np.arange(len(games)) * 100 + j
+    games['pitch_count'] = games[TARGET_COL]
+    return games
+
+
+def test_pregame_rows_use_the_latest_earlier_date_only():
+    games = _games()
+    # A doubleheader: the second game must not see the first one's numbers either
+    double = games.iloc[[-1]].assign(**{TARGET_COL: 99, 'pitch_count': 9999})
+    games = pd.concat([games, double], ignore_index=True)
+    pre = pregame_rows(games, FEATURE_COLS)
+
+    for i, row in games.iterrows():
+        earlier = games[(games['pitcher_id'] == row['pitcher_id']) & (games['game_date'] < row['game_date'])]
+        if earlier.empty:
+            assert pre.loc[i].isna().all()
+        else:
+            expected = earlier[FEATURE_COLS].iloc[-1].to_numpy(dtype=float)
+            np.testing.assert_array_equal(pre.loc[i].to_numpy(dtype=float), expected)
+
+
+def test_backtest_test_rows_hold_no_data_from_their_own_game(tmp_path):
+    games = _games()
+    X, X_pregame, y = cache_features(games, cache_dir=str(tmp_path))
+    np.testing.assert_array_equal(X, games[FEATURE_COLS].to_numpy(dtype=np.float32))
+
+    # Every pregame row comes from an earlier game of the same pitcher, or is empty
+    source = X_pregame[:, FEATURE_COLS.index('rolling_K_avg_3')]
+    known = ~np.isnan(source)
+    rows = (source[known] // 100).astype(int)
+    assert (games['pitcher_id'].to_numpy()[rows] == games['pitcher_id'].to_numpy()[known]).all()
+    assert (games['game_date'].to_numpy()[rows] < games['game_date'].to_numpy()[known]).all()
+
+    predictions = run_backtest(games, "2025-04-21", step_days=7, retrain_every=2, n_models=2,
+                               n_jobs=1, params={'n_estimators': 20}, warm_rounds=5, cache_dir=str(tmp_path))
+    # A model fed the games' own features would read the target straight off them
+    error = (predictions['k_pred_mean'] - predictions[TARGET_COL]).abs().mean()
+    assert error > 1.0
+
+
+def _board(*lines):
+    return pd.DataFrame([
+        {'line_id': line_id, 'appearance_id': f"a-{line_id}", 'player': player, 'k_line': k_line, 'status': 'active'}
+        for line_id, player, k_line in lines
+    ]).reindex(columns=LINE_COLUMNS)
+
+
+def test_unchanged_lines_are_dated_by_the_games_they_stay_open_for(tmp_path):
+    history = str(tmp_path / "history")
+    games = pd.DataFrame({
+        'pitcher_id': [600001, 600002, 600001],
+        'pitcher_name': ["Tarik Skubal", "Zack Wheeler", "Tarik Skubal"],
+        'game_date': pd.to_datetime(["2025-05-02", "2025-05-02", "2025-05-07"]),
+    })
+    # Skubal's line goes up the evening before and never moves; Wheeler's moves on game day
+    record_snapshot(_board(("l1", "Tarik Skubal", 5.5)), "2025-05-01 18:00-04:00", history)
+    record_snapshot(_board(("l1", "Tarik Skubal", 5.5), ("l2", "Zack Wheeler", 6.5)), "2025-05-02 09:00-04:00", history)
+    record_snapshot(_board(("l1", "Tarik Skubal", 5.5), ("l2", "Zack Wheeler", 7.0)), "2025-05-02 15:00-04:00", history)
+    record_snapshot(_board(), "2025-05-02 19:05-04:00", history)
+    record_snapshot(_board(("l3", "Tarik Skubal", 4.5)), "2025-05-06 12:00-04:00", history)
+
+    lines = historical_lines(games, "2025-05-02", "2025-05-07", history_path=history, lines_path=str(tmp_path))
+    closing = {(row.pitcher_id, f"{row.game_date:%m-%d}"): row.k_line for row in lines.itertuples()}
+    assert closing == {
+        (600001, "05-02"): 5.5, (600002, "05-02"): 7.0,
+        (600001, "05-06"): 4.5, (600001, "05-07"): 4.5,
+    }
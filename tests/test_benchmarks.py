@@ -0,0 +1,62 @@
+"""
+Pipeline benchmarks (tests/benchmarks.py) on synthetic Statcast data.
+
+Runs the 'day' scale by default. BENCHMARK_SCALES (e.g. "day month season")
+picks others and BENCHMARK_REPEAT the untraced runs per benchmark. With
+BENCHMARK_RESULTS set to a JSON-lines file, results are appended there and
+a benchmark more than BENCHMARK_TOLERANCE (default 0.2) slower than its
+newest earlier result fails.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from features.mlb_features import aggregate_pitcher_games
+from ingest.statcast_store import PITCHER_COLUMNS
+from tests.benchmarks import append_results, benchmark_scale, load_results, regressions, run_stamp
+from tests.synthetic_statcast import SCALES, synthetic_statcast
+
+BENCHMARKS = ['aggregate_pitcher_games', 'compute_opponent_k_pct_dynamic', 'update_opponent_k_pct',
+              'compute_k_park_factors', 'add_rolling_features', 'generate_dataset_from_raw']
+SCALES_TO_RUN = os.environ.get("BENCHMARK_SCALES", "day").split()
+REPEAT = int(os.environ.get("BENCHMARK_REPEAT", "1"))
+RESULTS = os.environ.get("BENCHMARK_RESULTS")
+TOLERANCE = float(os.environ.get("BENCHMARK_TOLERANCE", "0.2"))
+
+
+def test_synthetic_statcast_is_seeded_and_plausible():
+    df = synthetic_statcast(days=3, seed=1)
+    pd.testing.assert_frame_equal(df, synthetic_statcast(days=3, seed=1))
+    assert set(PITCHER_COLUMNS) <= set(df.columns)
+
+    games = aggregate_pitcher_games(df[PITCHER_COLUMNS])
+    starters = games[games['pitcher'] < 700000]
+    assert len(starters) == 3 * 30
+    assert 4 <= starters['strikeouts'].mean() <= 8
+    assert 75 <= starters['pitch_count'].mean() <= 105
+
+
+def test_regressions_flag_only_slowdowns_past_tolerance():
+    baseline = [{'benchmark': 'a', 'scale': 'day', 'wall_best': 1.0},
+                {'benchmark': 'b', 'scale': 'day', 'wall_best': 1.0}]
+    results = [{'benchmark': 'a', 'scale': 'day', 'wall_best': 1.1},
+               {'benchmark': 'b', 'scale': 'day', 'wall_best': 1.5},
+               {'benchmark': 'c', 'scale': 'day', 'wall_best': 9.0}]
+    assert regressions(results, baseline, tolerance=0.2) == [('b', 'day', 1.0, 1.5)]
+
+
+@pytest.mark.parametrize("scale", SCALES_TO_RUN)
+def test_pipeline_benchmark(scale):
+    assert scale in SCALES
+    results = benchmark_scale(scale, repeat=REPEAT, verbose=False)
+    assert [r['benchmark'] for r in results] == BENCHMARKS
+    assert all(r['wall_best'] > 0 and r['peak_mb'] > 0 and r['rows'] > 0 for r in results)
+
+    if RESULTS:
+        baseline = load_results(RESULTS)
+        stamp = run_stamp()
+        append_results([{**stamp, **r} for r in results], RESULTS)
+        slower = regressions(results, baseline, TOLERANCE)
+        assert not slower, "slower than the last recorded run: " + ", ".join(
+            f"{name} @ {s}: {before:.3f}s -> {after:.3f}s" for name, s, before, after in slower)
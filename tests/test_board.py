@@ -0,0 +1,70 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from props.board import BOARD_COLUMNS, parse_board, save_board
+
+# The strikeouts fixture (four lines) plus lines for two more stats and two without a stat
+PAYLOAD = os.path.join(os.path.dirname(__file__), "fixtures", "ud_strikeouts.json")
+
+
+def _line(line_id, appearance_id, stat, value, header="Tarik Skubal"):
+    appearance_stat = {'appearance_id': appearance_id}
+    if stat is not None:
+        appearance_stat['stat'] = stat
+    return {
+        'id': line_id, 'status': "active", 'stat_value': value,
+        'over_under': {'appearance_stat': appearance_stat},
+        'options': [
+            {'choice': choice, 'selection_header': header, 'american_price': "-110", 'decimal_price': "1.91",
+             'payout_multiplier': multiplier}
+            for choice, multiplier in (('higher', "1.05"), ('lower', "0.95"))
+        ],
+    }
+
+
+@pytest.fixture
+def board():
+    with open(PAYLOAD, encoding="utf-8") as f:
+        data = json.load(f)
+    data['over_under_lines'] += [
+        _line("h1", "a1", "hits_allowed", "5.5"),
+        _line("h2", "a2", "hits_allowed", "4.5"),
+        _line("o1", "a1", "pitching_outs", "17.5"),
+        _line("x1", "a1", None, "1.5"),
+        _line("x2", "a1", "", "2.5"),
+        # A new appearance not yet in the payload's indexes
+        _line("o2", "a99", "pitching_outs", "15.5", header="Zack Wheeler"),
+    ]
+    return data
+
+
+def test_lines_are_split_by_stat(board):
+    tables = parse_board(json.dumps(board))
+    assert sorted(tables) == ['hits_allowed', 'pitching_outs', 'strikeouts']
+    assert [len(tables[stat]) for stat in sorted(tables)] == [2, 2, 4]
+    for stat, frame in tables.items():
+        assert list(frame.columns) == BOARD_COLUMNS
+        assert (frame['stat'] == stat).all()
+        assert frame['line'].dtype == float
+
+    outs = tables['pitching_outs'].set_index('line_id')
+    assert outs.loc['o1', ['player', 'team_id', 'starter', 'line']].tolist() == ["Tarik Skubal", 't-det', True, 17.5]
+    assert outs.loc['o2', 'player'] == "Zack Wheeler" and pd.isna(outs.loc['o2', 'player_id'])
+    assert outs['over_payout_multiplier'].tolist() == [1.05, 1.05]
+
+
+def test_stats_filter_and_input_types_agree(board):
+    only = parse_board(board, stats=['hits_allowed'])
+    assert list(only) == ['hits_allowed']
+    pd.testing.assert_frame_equal(only['hits_allowed'], parse_board(json.dumps(board).encode())['hits_allowed'])
+
+
+def test_lines_without_a_stat_are_not_saved(board, tmp_path):
+    paths = save_board(parse_board(board), str(tmp_path), date="2025-04-01")
+    assert sorted(os.listdir(tmp_path)) == [
+        "hits_allowed_2025-04-01.parquet", "pitching_outs_2025-04-01.parquet", "strikeouts_2025-04-01.parquet",
+    ]
+    assert pd.read_parquet(paths['hits_allowed'])['line_id'].tolist() == ["h1", "h2"]
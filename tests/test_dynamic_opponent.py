@@ -0,0 +1,37 @@
+import pandas as pd
+import pandas.testing as pdt
+
+from features.dynamic_opponent import compute_opponent_k_pct_dynamic, team_day_counts, update_opponent_k_pct
+from tests.synthetic_statcast import synthetic_statcast
+
+
+def _sorted(frame):
+    return frame.sort_values(['game_date', 'Team']).reset_index(drop=True)
+
+
+def test_incremental_update_matches_a_full_rebuild():
+    pitches = synthetic_statcast(days=12, start_date="2025-04-01", seed=3)
+    full = compute_opponent_k_pct_dynamic("2025-04-01", "2025-04-12", source_df=pitches)
+
+    k_pct, team_days = update_opponent_k_pct("2025-04-01", "2025-04-06", source_df=pitches)
+    assert team_days['game_date'].max() == "2025-04-06"
+    k_pct, team_days = update_opponent_k_pct("2025-04-01", "2025-04-12", team_days, source_df=pitches)
+
+    pdt.assert_frame_equal(_sorted(k_pct), _sorted(full))
+    pdt.assert_frame_equal(_sorted(team_days), _sorted(team_day_counts(pitches)))
+
+
+def test_only_dates_after_the_table_are_counted():
+    pitches = synthetic_statcast(days=4, start_date="2025-04-01", seed=3)
+    _, team_days = update_opponent_k_pct("2025-04-01", "2025-04-03", source_df=pitches)
+
+    # Earlier dates in the source are ignored once the table covers them
+    tampered = pitches.assign(events=pitches['events'].where(pitches['game_date'] == "2025-04-04", 'strikeout'))
+    _, extended = update_opponent_k_pct("2025-04-01", "2025-04-04", team_days, source_df=tampered)
+    pdt.assert_frame_equal(_sorted(extended), _sorted(team_day_counts(pitches)))
+
+    # A table already through end_date is returned as is, with no source at all
+    k_pct, same = update_opponent_k_pct("2025-04-01", "2025-04-04", extended)
+    assert same is extended
+    assert len(k_pct) == len(extended)
+    assert set(pd.to_datetime(k_pct['game_date']).dt.day) == {1, 2, 3, 4}
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.ensemble import FEATURE_COLS, train_bootstrap_ensemble
+
+PARAMS = {'n_estimators': 5}
+
+
+@pytest.fixture(scope="module")
+def training_frame():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((200, len(FEATURE_COLS))), columns=FEATURE_COLS)
+    y = rng.poisson(5, 200).astype(float)
+    return X, y
+
+
+def test_arrays_and_frames_train_and_score_alike(training_frame, tmp_path):
+    X, y = training_frame
+    np.save(tmp_path / "X.npy", X.to_numpy(dtype=np.float32))
+    X_mapped = np.load(tmp_path / "X.npy", mmap_mode='r')
+
+    from_frame = train_bootstrap_ensemble(X, y, n_models=2, params=PARAMS, n_jobs=1)
+    from_memmap = train_bootstrap_ensemble(X_mapped, y, n_models=2, params=PARAMS, n_jobs=1, features=FEATURE_COLS)
+    assert from_frame.features == from_memmap.features == FEATURE_COLS
+
+    # Frames are scored by column name, whatever their order or extra columns
+    shuffled = X[FEATURE_COLS[::-1]].assign(extra=1.0)
+    np.testing.assert_allclose(from_frame.predict_members(shuffled), from_memmap.predict_members(X_mapped))
+
+
+def test_feature_mismatches_raise(training_frame):
+    X, y = training_frame
+    with pytest.raises(ValueError, match="needs `features`"):
+        train_bootstrap_ensemble(X.to_numpy(), y, n_models=1, params=PARAMS, n_jobs=1)
+    with pytest.raises(ValueError, match="Expected 14 feature columns"):
+        train_bootstrap_ensemble(X.to_numpy()[:, :-1], y, n_models=1, params=PARAMS, n_jobs=1, features=FEATURE_COLS)
+
+    ensemble = train_bootstrap_ensemble(X.iloc[:, :3], y, n_models=1, params=PARAMS, n_jobs=1)
+    assert ensemble.features == FEATURE_COLS[:3]
+    with pytest.raises(ValueError, match="Expected 3 feature columns"):
+        ensemble.predict(X.to_numpy())
+    with pytest.raises(ValueError, match="Missing feature columns: max_inning"):
+        ensemble.predict(X.drop(columns='max_inning'))
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+import features.feature_store as store
+from features.pitcher_state import append_dataset_part, write_dataset
+
+
+def _games(day, n=4):
+    return pd.DataFrame({
+        'pitcher_id': range(1, n + 1),
+        'game_date': pd.Timestamp(f"2025-04-{day:02d}"),
+        'pitch_count': np.arange(n, dtype=float),
+        'strikeouts': np.arange(n, dtype=float),
+    })
+
+
+def test_the_store_reports_the_version_the_dataset_was_built_with(tmp_path, monkeypatch, capsys):
+    processed, store_path = str(tmp_path / "processed"), str(tmp_path / "store")
+    dataset = store._source_path(2025, processed)
+    built_with = store.feature_version()
+    write_dataset(_games(1), dataset)
+
+    # The feature definitions change after the dataset was built
+    monkeypatch.setattr(store, "FEATURE_SCHEMA", store.FEATURE_SCHEMA + 1)
+    assert store.feature_version() != built_with
+    manifest = store.sync_feature_store([2025], processed, store_path)
+    assert manifest['seasons']['2025']['feature_version'] == built_with
+    store.export_training_matrix([2025], ['pitch_count'], 'strikeouts', store_path)
+    assert f"built under feature versions ['{built_with}']" in capsys.readouterr().out
+
+    # An update under the new definitions leaves the season mixed until it is rebuilt
+    append_dataset_part(_games(2), dataset)
+    mixed = store.sync_feature_store([2025], processed, store_path)['seasons']['2025']['feature_version']
+    assert mixed == '+'.join(sorted([built_with, store.feature_version()]))
+
+    write_dataset(pd.concat([_games(1), _games(2)]), dataset)
+    assert store.sync_feature_store([2025], processed, store_path)['seasons']['2025']['feature_version'] \
+        == store.feature_version()
+
+
+def test_legacy_datasets_are_unknown(tmp_path):
+    legacy = str(tmp_path / "pitcher_game_data_2024.parquet")
+    _games(1).to_parquet(legacy, index=False)
+    assert store.dataset_feature_version(legacy) == 'unknown'
+
+    append_dataset_part(_games(2), legacy)
+    assert store.dataset_feature_version(legacy) == '+'.join(sorted(['unknown', store.feature_version()]))
@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+import scripts.fetch_statcast_raw as fetch
+from ingest.statcast_store import load_statcast
+from instrumentation import configure
+
+SEASON = 2024
+
+
+@pytest.fixture(autouse=True)
+def stage_log(tmp_path):
+    configure(log_path=str(tmp_path / "stages.jsonl"))
+
+
+class StubStatcast:
+    """fetch_fn stand-in: two pitches per day, optionally failing the first calls of a chunk."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, start_date, end_date):
+        with self._lock:
+            self.calls.append((start_date, end_date))
+            attempt = self.calls.count((start_date, end_date))
+        if attempt <= self.failures:
+            raise ConnectionError("stub outage")
+        days = pd.date_range(start_date, end_date).strftime('%Y-%m-%d')
+        return pd.DataFrame({
+            'game_date': days.repeat(2),
+            'pitcher': [600001, 600002] * len(days),
+            'description': ['called_strike', 'ball'] * len(days),
+        })
+
+
+def _run(tmp_path, stub, start="2024-04-01", end="2024-04-17", **kwargs):
+    return fetch.fetch_statcast_range(
+        start, end, SEASON, save_dir=str(tmp_path / "raw"), cache_dir=str(tmp_path / "cache"),
+        chunk_days=7, workers=2, fetch_fn=stub, **kwargs,
+    )
+
+
+def _manifest(tmp_path):
+    with open(tmp_path / "cache" / str(SEASON) / "manifest.json") as f:
+        return json.load(f)
+
+
+def test_chunk_boundaries_are_inclusive_and_cover_the_range():
+    assert fetch.chunk_date_range("2024-04-01", "2024-04-17", 7) == [
+        ("2024-04-01", "2024-04-07"), ("2024-04-08", "2024-04-14"), ("2024-04-15", "2024-04-17"),
+    ]
+    assert fetch.chunk_date_range("2024-04-01", "2024-04-01", 7) == [("2024-04-01", "2024-04-01")]
+
+
+def test_manifest_records_every_chunk_and_its_rows(tmp_path):
+    stub = StubStatcast()
+    assert _run(tmp_path, stub) == []
+
+    assert sorted(stub.calls) == fetch.chunk_date_range("2024-04-01", "2024-04-17", 7)
+    chunks = _manifest(tmp_path)['chunks']
+    assert sorted(chunks) == ["2024-04-01_2024-04-07", "2024-04-08_2024-04-14", "2024-04-15_2024-04-17"]
+    assert [chunks[k]['rows'] for k in sorted(chunks)] == [14, 14, 6]
+    assert all(entry['complete'] for entry in chunks.values())
+    for entry in chunks.values():
+        cached = pd.read_parquet(tmp_path / "cache" / str(SEASON) / entry['file'])
+        assert len(cached) == entry['rows']
+    assert len(load_statcast(SEASON, root=str(tmp_path / "raw"))) == 34
+
+
+def test_cached_chunks_are_skipped(tmp_path):
+    _run(tmp_path, StubStatcast(), end="2024-04-14")
+    stub = StubStatcast()
+    _run(tmp_path, stub)
+    assert stub.calls == [("2024-04-15", "2024-04-17")]
+
+    refreshed = StubStatcast()
+    _run(tmp_path, refreshed, refresh=True)
+    assert len(refreshed.calls) == 3
+
+
+def test_failures_are_retried_with_backoff(tmp_path, monkeypatch):
+    waits = []
+    monkeypatch.setattr(fetch.time, "sleep", waits.append)
+    stub = StubStatcast(failures=2)
+    assert _run(tmp_path, stub, end="2024-04-07", retries=3, backoff=0.5) == []
+
+    assert len(stub.calls) == 3
+    assert waits == [0.5, 1.0]
+    assert _manifest(tmp_path)['chunks']["2024-04-01_2024-04-07"]['rows'] == 14
+
+
+def test_chunks_failing_every_retry_stay_out_of_the_manifest(tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch.time, "sleep", lambda seconds: None)
+    stub = StubStatcast(failures=10)
+    failed = _run(tmp_path, stub, end="2024-04-07", retries=2)
+
+    assert failed == [("2024-04-01", "2024-04-07")]
+    assert len(stub.calls) == 3
+    assert not os.path.exists(tmp_path / "cache" / str(SEASON) / "manifest.json")
+
+    # The next run picks the chunk up again
+    assert _run(tmp_path, StubStatcast()) == []
+    assert len(_manifest(tmp_path)['chunks']) == 3
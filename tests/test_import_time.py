@@ -0,0 +1,107 @@
+"""
+Startup checks for the CLI and library modules.
+
+Each check starts a fresh interpreter under `python -X importtime` and
+fails when the import pulled in a package the module must only load on
+demand (network and model stacks). That part is deterministic and always
+runs. The millisecond budgets depend on the machine, so they only run
+with IMPORT_BUDGET=1: the total cumulative time of the top-level imports,
+best of REPEAT runs, must stay within budget. IMPORT_BUDGET_SCALE
+stretches every budget.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEAT = 3
+CHECK_BUDGETS = os.environ.get("IMPORT_BUDGET") == "1"
+SCALE = float(os.environ.get("IMPORT_BUDGET_SCALE", "1"))
+
+# Loaded by the commands that need them, never at import time of a library module
+NETWORK_STACK = ('pybaseball', 'requests', 'urllib3', 'bs4', 'lxml', 'matplotlib')
+MODEL_STACK = ('xgboost', 'joblib', 'scipy', 'sklearn')
+HEAVY = NETWORK_STACK + MODEL_STACK
+
+# Check -> (argv after `python -X importtime`, budget in ms, packages it must not import)
+IMPORT_BUDGETS = {
+    'sportsbalf --help': (['-m', 'cli.main', '--help'], 150, HEAVY + ('pandas', 'numpy')),
+    'sportsbalf daily --help': (['-m', 'cli.main', 'daily', '--help'], 250, HEAVY + ('pandas', 'numpy')),
+    'sportsbalf backtest --help': (['-m', 'cli.main', 'backtest', '--help'], 1200, HEAVY),
+    'sportsbalf tune --help': (['-m', 'cli.main', 'tune', '--help'], 1200, HEAVY),
+    'cli.dag': (['-c', 'import cli.dag'], 250, HEAVY + ('pandas',)),
+    'instrumentation': (['-c', 'import instrumentation'], 150, HEAVY + ('pandas', 'numpy')),
+    'cli.daily': (['-c', 'import cli.daily'], 1000, HEAVY),
+    'features.rolling': (['-c', 'import features.rolling'], 300, HEAVY + ('pandas',)),
+    'features.park_factors': (['-c', 'import features.park_factors'], 1000, HEAVY),
+    'features.dynamic_opponent': (['-c', 'import features.dynamic_opponent'], 1000, HEAVY),
+    'features.team_context': (['-c', 'import features.team_context'], 1000, HEAVY),
+    'features.feature_store': (['-c', 'import features.feature_store'], 1000, HEAVY),
+    'ingest.park_factors': (['-c', 'import ingest.park_factors'], 1000, HEAVY),
+    'ingest.ud_lines': (['-c', 'import ingest.ud_lines'], 1000, HEAVY),
+    'models.ensemble': (['-c', 'import models.ensemble'], 300, HEAVY + ('pandas',)),
+    'models.predict': (['-c', 'import models.predict'], 1000, HEAVY),
+    'models.backtest': (['-c', 'import models.backtest'], 1000, HEAVY),
+    'models.tuning': (['-c', 'import models.tuning'], 1000, HEAVY),
+    'models.live': (['-c', 'import models.live'], 1000, HEAVY),
+    'props.pricing': (['-c', 'import props.pricing'], 300, HEAVY + ('pandas',)),
+    'betslips.simulate': (['-c', 'import betslips.simulate'], 1000, HEAVY),
+}
+
+
+def parse_importtime(stderr):
+    """(total cumulative µs of the top-level imports, set of top-level packages imported)."""
+    total, packages = 0, set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        packages.add(name.strip().split(".")[0])
+        # Nested imports are indented under the module that triggered them
+        if not name[1:2].isspace():
+            total += int(cumulative)
+    return total, packages
+
+
+def measure(argv, repeat=REPEAT):
+    """Best total import time in ms over `repeat` cold interpreters, and the packages imported."""
+    best, packages = None, set()
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=ROOT,
+                              capture_output=True, text=True)
+        assert proc.returncode == 0, proc.stderr.splitlines()[-1]
+        total, packages = parse_importtime(proc.stderr)
+        best = total if best is None else min(best, total)
+    return best / 1000, packages
+
+
+def test_parse_importtime_sums_top_level_imports():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |   _io",
+        "import time:       200 |        300 | io",
+        "import time:        50 |         50 |     numpy.core",
+        "import time:       400 |        450 |   numpy",
+        "import time:        10 |        460 | pandas",
+    ])
+    assert parse_importtime(stderr) == (760, {'_io', 'io', 'numpy', 'pandas'})
+
+
+@pytest.mark.parametrize("name", list(IMPORT_BUDGETS))
+def test_no_heavy_imports_at_startup(name):
+    argv, _, forbidden = IMPORT_BUDGETS[name]
+    _, packages = measure(argv, repeat=1)
+    leaked = sorted(set(forbidden) & packages)
+    assert not leaked, f"{name} imports {', '.join(leaked)} at startup"
+
+
+@pytest.mark.skipif(not CHECK_BUDGETS, reason="timing budgets run with IMPORT_BUDGET=1")
+@pytest.mark.parametrize("name", list(IMPORT_BUDGETS))
+def test_import_budget(name):
+    argv, budget, _ = IMPORT_BUDGETS[name]
+    ms, _ = measure(argv)
+    assert ms <= budget * SCALE, f"{name} took {ms:.0f} ms to import (budget {budget * SCALE:.0f} ms)"
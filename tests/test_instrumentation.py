@@ -0,0 +1,42 @@
+import json
+import threading
+import time
+
+import instrumentation
+from instrumentation import configure, stage, summary
+
+
+def _burn(seconds):
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+def test_stage_cpu_counts_every_thread_of_the_process(tmp_path):
+    log = tmp_path / "stages.jsonl"
+    configure(log_path=str(log))
+    with stage("pool"):
+        workers = [threading.Thread(target=_burn, args=(0.1,)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    record = json.loads(log.read_text().splitlines()[-1])
+    assert record['stage'] == "pool" and 'cpu_s' not in record
+    assert record['process_cpu_s'] >= 0.18
+
+
+def test_records_are_capped_and_cleared_by_summary(tmp_path, monkeypatch, capsys):
+    configure(log_path=str(tmp_path / "stages.jsonl"))
+    summary()
+    monkeypatch.setattr(instrumentation, "_RECORDS", instrumentation.collections.deque(maxlen=3))
+    for i in range(5):
+        with stage(f"poll-{i}"):
+            pass
+    assert [r['stage'] for r in instrumentation._RECORDS] == ["poll-2", "poll-3", "poll-4"]
+
+    summary()
+    assert "poll-4" in capsys.readouterr().out
+    summary()
+    assert capsys.readouterr().out == ""
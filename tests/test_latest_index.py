@@ -0,0 +1,26 @@
+import pandas as pd
+
+from features.latest_index import resolve_player_ids
+
+
+def _index(names):
+    return pd.DataFrame({
+        'pitcher_id': range(1, len(names) + 1),
+        'pitcher_name': names,
+        'game_date': pd.date_range("2025-05-01", periods=len(names)),
+    }).set_index('pitcher_id')
+
+
+def test_names_resolve_through_accents_suffixes_and_middle_initials():
+    index = _index(["José Berríos", "Luis L. Ortiz Jr.", "Zack Wheeler"])
+    ids = resolve_player_ids(["Jose Berrios", "Luis Ortiz", "zack wheeler", "Nobody Here"], index)
+    assert ids.tolist() == [1, 2, 3, pd.NA]
+
+
+def test_ambiguous_names_are_left_unresolved(capsys):
+    index = _index(["Luis L. Ortiz", "Luis F. Ortiz", "Zack Wheeler", "Zack Wheeler"])
+    ids = resolve_player_ids(["Luis Ortiz", "Luis L. Ortiz", "Zack Wheeler"], index)
+
+    # Only the exact name tells the two Ortizes apart; the recency of their last game does not
+    assert ids.tolist() == [pd.NA, 1, pd.NA]
+    assert "Luis Ortiz, Zack Wheeler" in capsys.readouterr().out
@@ -0,0 +1,59 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from features.mlb_features import aggregate_pitcher_games
+from ingest.statcast_store import write_statcast
+from models.live import LiveStrikeouts, PitcherPrior, replay, replay_statcast
+from tests.synthetic_statcast import synthetic_statcast
+
+SEASON, DAY = 2025, "2025-04-02"
+COUNTS = ['pitch_count', 'strikeouts', 'max_inning', 'whiff_rate', 'csw_pct']
+
+
+@pytest.fixture
+def raw_root(tmp_path):
+    root = str(tmp_path / "statcast")
+    write_statcast(synthetic_statcast(days=2, start_date="2025-04-01", seed=3), SEASON, root=root)
+    return root
+
+
+def test_replay_ends_with_the_batch_game_counts(raw_root):
+    state, per_event_us = replay(SEASON, DAY, root=raw_root)
+    assert per_event_us > 0
+    assert state['done'].all() and not state['remaining_mean'].any()
+
+    pitches = synthetic_statcast(days=2, start_date="2025-04-01", seed=3)
+    games = aggregate_pitcher_games(pitches[pitches['game_date'] == DAY])
+    merged = games.merge(state, on='pitcher', suffixes=('_batch', '_live'), validate='one_to_one')
+    assert len(merged) == len(games) == len(state)
+    for column in COUNTS:
+        np.testing.assert_allclose(merged[f'{column}_live'], merged[f'{column}_batch'], err_msg=column)
+
+
+def test_prob_over_is_the_poisson_tail_of_the_remaining_strikeouts(raw_root):
+    live = LiveStrikeouts(track_all=True)
+    # Stop mid-slate so starters still have batters left
+    for n, event in enumerate(replay_statcast(SEASON, DAY, root=raw_root)):
+        live.update(event)
+        if n == 1500:
+            break
+    games = [game for game in live.games.values() if not game.done and game.remaining_mean > 0]
+    assert games
+
+    for game in games:
+        for line in [0.5, 2.5, 4.0, 5.5, 8.5]:
+            expected = stats.poisson.sf(math.floor(line) - game.strikeouts, game.remaining_mean)
+            assert game.prob_over(line) == pytest.approx(expected, abs=1e-12)
+        assert game.prob_over(game.strikeouts - 0.5) == 1.0
+
+
+def test_replay_prints_tracked_pitchers_with_their_lines(raw_root, capsys):
+    pitcher = int(pd.read_parquet(raw_root).query("game_date == @DAY and events == 'strikeout'")['pitcher'].iloc[0])
+    state, _ = replay(SEASON, DAY, priors={pitcher: PitcherPrior(k_line=4.5)}, root=raw_root)
+    printed = capsys.readouterr().out.splitlines()
+    assert printed and all(line.startswith(f"🔴 {pitcher} K") and "P(over 4.5)" in line for line in printed)
+    assert len(printed) == state.set_index('pitcher').loc[pitcher, 'strikeouts']
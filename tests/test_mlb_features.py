@@ -0,0 +1,53 @@
+import os
+
+import pandas as pd
+import pandas.testing as pdt
+
+from features.mlb_features import COUNT_COLS, EXPANDING_RATES, aggregate_pitcher_games
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Frozen output of the original per-column groupby aggregation, run one pitcher
+# at a time (its running totals were not grouped by pitcher), on the sample below
+BASELINE = os.path.join(FIXTURES, "pitcher_games_baseline.csv")
+SAMPLE = os.path.join(FIXTURES, "statcast_sample.parquet")
+
+
+def _sample():
+    return pd.read_parquet(SAMPLE)
+
+
+def _baseline():
+    return pd.read_csv(BASELINE, dtype={'game_date': str})
+
+
+def _compare(games, expected):
+    games = games.sort_values(['pitcher', 'game_date']).reset_index(drop=True)
+    pdt.assert_frame_equal(games[list(expected.columns)], expected, check_dtype=False)
+
+
+def test_aggregate_matches_baseline():
+    games = aggregate_pitcher_games(_sample())
+    expected = _baseline().drop(columns=COUNT_COLS)
+    assert set(games.columns) == set(expected.columns)
+    _compare(games, expected)
+
+
+def test_keep_counts_matches_baseline_counts():
+    games = aggregate_pitcher_games(_sample(), keep_counts=True)
+    expected = _baseline()
+    assert set(COUNT_COLS) <= set(games.columns)
+    _compare(games, expected)
+
+
+def test_expanding_rates_are_per_pitcher():
+    # Shuffling the pitches must not leak one pitcher's totals into another's
+    games = aggregate_pitcher_games(_sample().sample(frac=1, random_state=0), keep_counts=True)
+    by_pitcher = games.sort_values('game_date').groupby('pitcher')
+    running = {cum: by_pitcher[count].cumsum()
+               for cum, count in (('cum_whiffs', 'whiff_count'), ('cum_called', 'called_count'),
+                                  ('cum_pitches', 'pitch_count'))}
+    for name, (numerators, denominator) in EXPANDING_RATES.items():
+        expected = (sum(running[col] for col in numerators) / running[denominator]).fillna(0)
+        pdt.assert_series_equal(games[name], expected.reindex(games.index), check_names=False)
+    _compare(games, _baseline())
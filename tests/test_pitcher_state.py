@@ -0,0 +1,148 @@
+import os
+
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+import scripts.update_pitcher_dataset_from_raw as update
+from features.pitcher_state import append_dataset_part, state_dataset_part
+from ingest.statcast_store import write_statcast
+from instrumentation import configure
+from scripts.generate_pitcher_dataset_from_raw import generate_dataset_from_raw
+from tests.benchmarks import _write_inputs
+from tests.synthetic_statcast import synthetic_statcast
+
+SEASON = 2025
+KEY = ['pitcher_id', 'game_date']
+
+
+@pytest.fixture(autouse=True)
+def stage_log(tmp_path):
+    configure(log_path=str(tmp_path / "stages.jsonl"))
+
+
+def _rows(pitcher, days):
+    return pd.DataFrame({
+        'pitcher_id': pitcher,
+        'game_date': pd.to_datetime([f"2025-04-{d:02d}" for d in days]),
+        'strikeouts': days,
+    })
+
+
+def test_parts_are_numbered_past_the_highest_existing_part(tmp_path):
+    dataset = str(tmp_path / "games.parquet")
+    for day in (1, 2, 3):
+        append_dataset_part(_rows(1, [day]), dataset)
+    os.remove(os.path.join(dataset, "part-00001.parquet"))
+
+    assert append_dataset_part(_rows(1, [4]), dataset).endswith("part-00003.parquet")
+    assert sorted(os.listdir(dataset)) == ["part-00000.parquet", "part-00002.parquet", "part-00003.parquet"]
+    assert sorted(pd.read_parquet(dataset)['strikeouts']) == [1, 3, 4]
+
+
+def test_rows_already_in_the_dataset_are_not_appended_again(tmp_path):
+    dataset = str(tmp_path / "games.parquet")
+    append_dataset_part(_rows(1, [1, 2]), dataset, key=KEY)
+
+    assert append_dataset_part(_rows(1, [1, 2]), dataset, key=KEY) is None
+    append_dataset_part(pd.concat([_rows(1, [2, 3]), _rows(2, [2])]), dataset, key=KEY)
+    written = pd.read_parquet(dataset).sort_values(KEY)
+    assert list(zip(written['pitcher_id'], written['game_date'].dt.day)) == [(1, 1), (1, 2), (1, 3), (2, 2)]
+    assert not [p for p in os.listdir(dataset) if not p.startswith('part-')]
+
+
+def test_the_key_check_skips_parts_the_state_already_covers(tmp_path):
+    dataset = str(tmp_path / "games.parquet")
+    covered = os.path.basename(append_dataset_part(_rows(1, [1, 2]), dataset, key=KEY))
+    append_dataset_part(_rows(1, [3]), dataset, key=KEY, after_part=covered)
+
+    # Only the part written after the state's part is read for the check
+    assert append_dataset_part(_rows(1, [3]), dataset, key=KEY, after_part=covered) is None
+    assert append_dataset_part(_rows(1, [2]), dataset, key=KEY, after_part=covered).endswith("part-00002.parquet")
+
+
+def _dataset_due_an_update(root, pitches, monkeypatch):
+    """A dataset generated from the first five days, with the rest of `pitches` in the raw store."""
+    os.makedirs(root)
+    monkeypatch.chdir(root)
+    os.makedirs("data/raw")
+    os.makedirs("data/processed")
+    _write_inputs({SEASON: pitches[pitches['game_date'] <= "2025-04-05"]}, root)
+    generate_dataset_from_raw(SEASON)
+    write_statcast(pitches[pitches['game_date'] > "2025-04-05"], SEASON, root="data/raw/statcast")
+
+
+def _dataset(root):
+    games = pd.read_parquet(os.path.join(root, f"data/processed/pitcher_game_data_{SEASON}.parquet"))
+    return games.sort_values(KEY).reset_index(drop=True)
+
+
+def test_update_interrupted_before_saving_state_does_not_duplicate_games(tmp_path, monkeypatch):
+    pitches = synthetic_statcast(days=8, start_date="2025-04-01", seed=5)
+    clean, interrupted = str(tmp_path / "clean"), str(tmp_path / "interrupted")
+
+    _dataset_due_an_update(clean, pitches, monkeypatch)
+    update.update_pitcher_dataset(SEASON)
+
+    _dataset_due_an_update(interrupted, pitches, monkeypatch)
+    with monkeypatch.context() as m:
+        def stop(state, path, dataset_part=None):
+            raise KeyboardInterrupt
+        m.setattr(update, "save_pitcher_state", stop)
+        with pytest.raises(KeyboardInterrupt):
+            update.update_pitcher_dataset(SEASON)
+    # The rerun redoes the games from the old state but appends nothing twice
+    update.update_pitcher_dataset(SEASON)
+    assert update.update_pitcher_dataset(SEASON) is None
+
+    result = _dataset(interrupted)
+    assert not result.duplicated(KEY).any()
+    pdt.assert_frame_equal(result, _dataset(clean))
+    pdt.assert_frame_equal(
+        pd.read_parquet(os.path.join(interrupted, f"data/processed/pitcher_state_{SEASON}.parquet")),
+        pd.read_parquet(os.path.join(clean, f"data/processed/pitcher_state_{SEASON}.parquet")),
+    )
+
+
+def test_rerun_after_an_interruption_reports_only_the_rows_it_writes(tmp_path, monkeypatch, capsys):
+    pitches = synthetic_statcast(days=8, start_date="2025-04-01", seed=5)
+    root = str(tmp_path / "interrupted")
+    _dataset_due_an_update(root, pitches[pitches['game_date'] <= "2025-04-07"], monkeypatch)
+    state_file = f"data/processed/pitcher_state_{SEASON}.parquet"
+    dataset = f"data/processed/pitcher_game_data_{SEASON}.parquet"
+    assert state_dataset_part(state_file) == "part-00000.parquet"
+
+    with monkeypatch.context() as m:
+        def stop(state, path, dataset_part=None):
+            raise KeyboardInterrupt
+        m.setattr(update, "save_pitcher_state", stop)
+        with pytest.raises(KeyboardInterrupt):
+            update.update_pitcher_dataset(SEASON)
+    write_statcast(pitches[pitches['game_date'] == "2025-04-08"], SEASON, root="data/raw/statcast")
+    capsys.readouterr()
+
+    redone = update.update_pitcher_dataset(SEASON)
+    new_rows = len(redone[redone['game_date'] == "2025-04-08"])
+    assert 0 < new_rows < len(redone)
+    assert f"Appended {new_rows} new rows to {dataset}/part-00002.parquet" in capsys.readouterr().out
+    assert state_dataset_part(state_file) == "part-00002.parquet"
+    assert not _dataset(root).duplicated(KEY).any()
+
+
+def test_statcast_is_read_from_each_pitchers_last_game(tmp_path, monkeypatch):
+    pitches = synthetic_statcast(days=8, start_date="2025-04-01", seed=5)
+    _dataset_due_an_update(str(tmp_path / "root"), pitches, monkeypatch)
+    state = pd.read_parquet(f"data/processed/pitcher_state_{SEASON}.parquet")
+    last_game = state.groupby('pitcher')['game_date'].max()
+
+    reads, load_statcast = [], update.load_statcast
+    def recording_load(season, start_date=None, pitchers=None, **kwargs):
+        reads.append((start_date, pitchers))
+        return load_statcast(season, start_date=start_date, pitchers=pitchers, **kwargs)
+    monkeypatch.setattr(update, "load_statcast", recording_load)
+    update.update_pitcher_dataset(SEASON)
+
+    # A starter idle since the first day does not pull that day in for the rest
+    assert len(reads) == last_game.nunique() > 1
+    for start_date, pitchers in reads:
+        assert (last_game.loc[pitchers] == start_date).all()
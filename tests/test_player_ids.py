@@ -0,0 +1,51 @@
+import datetime
+import os
+
+import pandas as pd
+
+from features.latest_index import latest_index_path, normalize_name
+from ingest.parse_ud_strikeouts import save_daily_lines
+from ingest.player_ids import PLAYER_IDS_PATH, mlbam_from_names
+
+# Two Luis Ortiz records (a pitcher and a long-retired namesake) and two pitchers with unique names
+REGISTER = pd.DataFrame({
+    'key_mlbam': pd.Series([682847, 121212, 641154, 554430], dtype='int32'),
+    'key_fangraphs': pd.Series([-1, -1, 19343, 13125], dtype='int32'),
+    'name': ["Luis Ortiz", "Luis Ortiz", "Luis L. Ortiz", "Zack Wheeler"],
+    'mlb_played_last': pd.Series([2025, 1996, 2025, 2025], dtype='int16'),
+})
+
+
+def _write_register(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    REGISTER.assign(name_key=REGISTER['name'].map(normalize_name)).to_parquet(path, index=False)
+
+
+def test_ambiguous_names_get_no_id(tmp_path, capsys):
+    path = str(tmp_path / "player_ids.parquet")
+    _write_register(path)
+
+    ids = mlbam_from_names(["Luis Ortiz", "Luis L Ortiz", "Zack Wheeler", "Luis A. Ortiz"], path)
+    # Recency no longer breaks the tie between the two plain Luis Ortiz records
+    assert ids.tolist() == [pd.NA, 641154, 554430, pd.NA]
+    assert "Luis Ortiz, Luis A. Ortiz" in capsys.readouterr().out
+
+    among_pitchers = mlbam_from_names(["Luis Ortiz", "Luis A. Ortiz"], path, candidates=[682847, 554430])
+    assert among_pitchers.tolist() == [682847, 682847]
+
+
+def test_daily_lines_match_names_among_the_season_pitchers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_register(PLAYER_IDS_PATH)
+    os.makedirs("data/lines")
+    lines = pd.DataFrame({
+        'line_id': ["l1", "l2"], 'appearance_id': ["a1", "a2"], 'player': ["Luis Ortiz", "Zack Wheeler"],
+        'k_line': [4.5, 6.5], 'status': "active",
+    })
+
+    assert save_daily_lines(lines)['pitcher_id'].isna().tolist() == [True, False]
+
+    os.makedirs("data/processed")
+    season = datetime.date.today().year
+    pd.DataFrame({'pitcher_id': [682847, 554430]}).to_parquet(latest_index_path(season, "data/processed"))
+    assert save_daily_lines(lines)['pitcher_id'].tolist() == [682847, 554430]
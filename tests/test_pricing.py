@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from props.pricing import prob_over_under
+
+LINES = [4.0, 4.5, 5.0, 5.5, 7.0]
+
+
+def _from_pmf(pmf, line):
+    """P(over), P(under), P(push) summed straight from a pmf over 0..len(pmf)-1."""
+    k = np.arange(len(pmf))
+    return pmf[k > line].sum(), pmf[k < line].sum(), pmf[k == line].sum()
+
+
+@pytest.mark.parametrize("line", LINES)
+def test_poisson_matches_its_pmf(line):
+    mean = 5.3
+    p_over, p_under, p_push = prob_over_under(line, mean, dist='poisson')
+    expected = _from_pmf(stats.poisson.pmf(np.arange(200), mean), line)
+    np.testing.assert_allclose([p_over, p_under, p_push], expected, atol=1e-12)
+    assert (p_push > 0) == float(line).is_integer()
+
+
+@pytest.mark.parametrize("line", LINES)
+def test_negbin_matches_a_simulation_with_the_same_moments(line):
+    mean, std = 5.3, 3.1
+    p_over, p_under, p_push = prob_over_under(line, mean, std, dist='negbin')
+    np.testing.assert_allclose(p_over + p_under + p_push, 1.0)
+
+    # Gamma-Poisson mixture with the same mean and variance
+    rng = np.random.default_rng(0)
+    shape = mean ** 2 / (std ** 2 - mean)
+    draws = rng.poisson(rng.gamma(shape, mean / shape, 400_000))
+    assert draws.std() == pytest.approx(std, rel=0.01)
+    simulated = [(draws > line).mean(), (draws < line).mean(), (draws == line).mean()]
+    np.testing.assert_allclose([p_over, p_under, p_push], simulated, atol=0.003)
+
+
+def test_negbin_falls_back_to_poisson_without_overdispersion():
+    line, mean = np.array([4.5, 5.0]), np.array([5.3, 5.3])
+    np.testing.assert_allclose(
+        prob_over_under(line, mean, np.sqrt(mean) * 0.9, dist='negbin'),
+        prob_over_under(line, mean, dist='poisson'),
+    )
+
+
+def test_normal_prices_broadcast_and_never_push():
+    p_over, p_under, p_push = prob_over_under([[4.5], [6.5]], [5.0, 6.0, 7.0], 2.0)
+    assert p_over.shape == (2, 3)
+    np.testing.assert_allclose(p_over + p_under, 1.0)
+    assert not p_push.any()
+    assert p_over[0, 0] == pytest.approx(stats.norm.sf(4.5, 5.0, 2.0))
+
+
+@pytest.mark.parametrize("std", [0.0, -1.0, np.nan, [1.5, 0.0]])
+def test_normal_needs_a_positive_std(std):
+    with pytest.raises(ValueError, match="std > 0"):
+        prob_over_under([4.5, 5.5], [5.0, 5.0], std)
+
+
+@pytest.mark.parametrize("dist", ['normal', 'negbin'])
+def test_missing_std_is_an_error(dist):
+    with pytest.raises(ValueError, match="needs std"):
+        prob_over_under(4.5, 5.0, None, dist)
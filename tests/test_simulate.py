@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from betslips.simulate import same_game_hit_fn, simulate_hit_distribution, simulate_hit_distributions
+from betslips.slips import candidate_slips, hit_distribution, legs_from_slate
+
+
+def _legs(games):
+    priced = pd.DataFrame({
+        'player': [f"Pitcher {i}" for i in range(len(games))],
+        'k_line': 5.5,
+        'p_over': [0.6, 0.55, 0.4, 0.65],
+        'p_under': [0.4, 0.45, 0.6, 0.35],
+        'match_id': games,
+    })
+    return legs_from_slate(priced)
+
+
+def test_legs_carry_their_game():
+    games = _legs([101, 101, 102, None]).set_index('player')['game']
+    assert list(games.loc[['Pitcher 0', 'Pitcher 1', 'Pitcher 2']]) == [101, 101, 102]
+    assert pd.isna(games['Pitcher 3'])
+    assert 'game' not in legs_from_slate(pd.DataFrame({
+        'player': ["A"], 'k_line': [5.5], 'p_over': [0.6], 'p_under': [0.4],
+    })).columns
+
+
+def test_only_slips_sharing_a_game_are_simulated():
+    legs = _legs([101, 101, 102, None])
+    pos = dict(zip(legs['player'], range(len(legs))))
+    idx = np.array([[pos['Pitcher 0'], pos['Pitcher 1']], [pos['Pitcher 2'], pos['Pitcher 3']]])
+    p_win = legs['p_win'].to_numpy()
+
+    dist = same_game_hit_fn(legs, {2: idx}, n_sims=50_000, game_corr=0.5)(idx)
+    np.testing.assert_array_equal(dist[1], hit_distribution(p_win[idx[1:]])[0])
+    np.testing.assert_array_equal(dist[0], simulate_hit_distribution(legs, idx[:1], 50_000, game_corr=0.5)[0])
+    # Positively correlated legs win together more often than independent ones
+    assert dist[0, 2] > hit_distribution(p_win[idx[:1]])[0, 2] + 0.02
+
+    # Slates with no shared games are scored exactly
+    exact = same_game_hit_fn(_legs([101, 102, 103, 104]), {2: idx})(idx)
+    np.testing.assert_array_equal(exact, hit_distribution(p_win[idx]))
+
+
+def test_every_size_is_scored_from_the_same_draws():
+    legs = _legs([101, 101, 102, 102])
+    candidates = candidate_slips(legs, sizes=(2, 3, 4))
+    together = simulate_hit_distributions(legs, candidates, n_sims=40_000, seed=3, game_corr=0.3)
+    # A tight memory budget only changes how slips are sliced
+    sliced = simulate_hit_distributions(legs, candidates, n_sims=40_000, seed=3, game_corr=0.3, memory_mb=0)
+    for n_legs, idx in candidates.items():
+        alone = simulate_hit_distribution(legs, idx, n_sims=40_000, seed=3, game_corr=0.3)
+        np.testing.assert_array_equal(together[n_legs], alone)
+        np.testing.assert_array_equal(sliced[n_legs], alone)
+        np.testing.assert_allclose(alone.sum(axis=1), 1.0)
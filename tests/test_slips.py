@@ -0,0 +1,57 @@
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bankroll.kelly import kelly_fraction
+from betslips.slips import candidate_slips, hit_distribution, payout_table, score_slips
+
+
+def _enumerate(p):
+    """Distribution of the number of wins by summing over every win/loss outcome."""
+    dist = np.zeros(len(p) + 1)
+    for outcome in product([0, 1], repeat=len(p)):
+        dist[sum(outcome)] += np.prod([pi if won else 1 - pi for pi, won in zip(p, outcome)])
+    return dist
+
+
+@pytest.mark.parametrize("n_legs", [1, 2, 3, 5, 6])
+def test_hit_distribution_matches_enumeration(n_legs):
+    p = np.random.default_rng(n_legs).uniform(0.05, 0.95, (8, n_legs))
+    dist = hit_distribution(p)
+    assert dist.shape == (8, n_legs + 1)
+    for row, expected in zip(p, dist):
+        np.testing.assert_allclose(expected, _enumerate(row), atol=1e-12)
+
+
+@pytest.mark.parametrize("p_win, payout", [(0.6, 2.0), (0.3, 4.5), (0.55, 1.9)])
+def test_kelly_matches_the_two_outcome_formula(p_win, payout):
+    # f* = p - (1 - p) / b with net odds b = payout - 1
+    b = payout - 1
+    f = kelly_fraction([[p_win, 1 - p_win]], [[payout, 0.0]])[0]
+    assert f == pytest.approx(p_win - (1 - p_win) / b, abs=1e-9)
+
+
+def test_kelly_is_zero_without_an_edge_and_maximizes_growth_otherwise():
+    assert kelly_fraction([[0.4, 0.6]], [[2.0, 0.0]])[0] == 0.0
+
+    # A flex entry: full win, partial win or loss
+    probs, returns = np.array([[0.3, 0.4, 0.3]]), np.array([[3.0, 1.2, 0.0]])
+    f = kelly_fraction(probs, returns)[0]
+    grid = np.linspace(0, 0.999, 100_000)
+    growth = (probs[0] * np.log1p(grid[:, None] * (returns[0] - 1))).sum(axis=1)
+    assert f == pytest.approx(grid[growth.argmax()], abs=1e-4)
+
+
+def test_score_slips_prices_from_the_hit_distribution():
+    legs = pd.DataFrame({'p_win': [0.62, 0.58, 0.55, 0.6], 'multiplier': [1.0, 1.0, 0.9, 1.1]})
+    slips = score_slips(legs, candidate_slips(legs, sizes=(3,)), entry='flex', min_ev=-1.0)
+    assert len(slips) == 4
+
+    for row in slips.itertuples():
+        idx = list(row.legs)
+        dist = _enumerate(legs['p_win'].to_numpy()[idx])
+        payout = payout_table(3, 'flex') * legs['multiplier'].to_numpy()[idx].prod()
+        assert row.ev == pytest.approx((dist * payout).sum() - 1)
+        assert row.p_all == pytest.approx(dist[-1])
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from models.tuning import successive_halving, trial_key
+
+SPACE = {'max_depth': [2, 3], 'learning_rate': [0.1, 0.3]}
+
+
+def _data(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.random((n, 4)).astype(np.float32)
+    y = rng.poisson(1 + 4 * X[:, 0]).astype(np.float32)
+    dates = pd.date_range("2025-04-01", periods=n // 10).repeat(10)
+    return X, y, dates
+
+
+def test_trial_key_covers_every_training_setting():
+    base = dict(params={'max_depth': 3}, rounds=50, folds=[(10, 20)], metric='mae', early_stopping_rounds=30,
+                seed=0, feature_version='v1', data_key='d1')
+    key = trial_key(**base)
+    changes = [{'early_stopping_rounds': 10}, {'seed': 1}, {'params': {'max_depth': 4}}, {'rounds': 150},
+               {'folds': [(10, 25)]}, {'metric': 'rmse'}, {'feature_version': 'v2'}, {'data_key': 'd2'}]
+    assert len({trial_key(**{**base, **change}) for change in changes} | {key}) == len(changes) + 1
+    # A parameter spelled out at its default value is the same trial
+    assert trial_key(**{**base, 'params': {'max_depth': 3, 'objective': 'count:poisson'}}) == key
+
+
+def test_cached_trials_are_reused_only_for_the_same_settings(tmp_path):
+    X, y, dates = _data()
+    run = dict(space=SPACE, n_candidates=4, min_rounds=5, max_rounds=5, n_folds=2, n_jobs=1,
+               cache_path=str(tmp_path))
+
+    first = successive_halving(X, y, dates, early_stopping_rounds=3, **run)
+    assert not first['cached'].any()
+    assert successive_halving(X, y, dates, early_stopping_rounds=3, **run)['cached'].all()
+    assert not successive_halving(X, y, dates, early_stopping_rounds=2, **run)['cached'].any()
+    assert not successive_halving(X, y, dates, early_stopping_rounds=3, seed=1, **run)['cached'].any()
@@ -0,0 +1,112 @@
+import copy
+import json
+import os
+
+import pandas as pd
+import pytest
+
+import ingest.ud_lines as ud
+from ingest.ud_lines import (
+    LINE_COLUMNS, fetch_lines_json, lines_as_of, load_line_history, parse_strikeout_frame, poll_lines,
+    record_snapshot,
+)
+
+# An Underdog strikeouts payload: three starters and a reliever (who is not a starter line)
+PAYLOAD = os.path.join(os.path.dirname(__file__), "fixtures", "ud_strikeouts.json")
+
+
+@pytest.fixture
+def payload():
+    with open(PAYLOAD, "rb") as f:
+        return f.read()
+
+
+class Response:
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            from requests import HTTPError
+            raise HTTPError(f"{self.status_code}")
+
+
+class Session:
+    """Replays canned responses and records the headers of every request."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.sent.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+def test_parse_keeps_starters_with_numeric_lines_and_prices(payload):
+    lines = parse_strikeout_frame(payload)
+    assert list(lines.columns) == LINE_COLUMNS + ['match_id']
+    assert list(lines['match_id']) == [101, 102, 103]
+    assert list(lines['player']) == ["Tarik Skubal", "Zack Wheeler", "José Berríos"]
+    assert list(lines['k_line']) == [7.5, 6.5, 5.0]
+    assert lines.loc[1, 'over_american_price'] == 100
+    assert lines.loc[1, 'under_payout_multiplier'] == 0.95
+    # str, bytes and decoded payloads parse the same
+    pd.testing.assert_frame_equal(parse_strikeout_frame(json.loads(payload)), lines)
+
+
+def test_history_records_only_changes(payload, tmp_path):
+    path = str(tmp_path)
+    board = json.loads(payload)
+    first = record_snapshot(parse_strikeout_frame(board), "2025-05-01 16:00Z", path)
+    assert len(first) == 3
+
+    assert record_snapshot(parse_strikeout_frame(board), "2025-05-01 16:05Z", path).empty
+
+    moved = copy.deepcopy(board)
+    moved['over_under_lines'][0]['stat_value'] = "8.5"
+    del moved['over_under_lines'][2]
+    changes = record_snapshot(parse_strikeout_frame(moved), "2025-05-01 16:10Z", path)
+    assert sorted(zip(changes['line_id'], changes['status'])) == [('l1', 'active'), ('l3', 'removed')]
+
+    history = load_line_history(path)
+    assert len(history) == 5
+    before = lines_as_of(history, pd.Timestamp("2025-05-01 16:06Z"))
+    after = lines_as_of(history, pd.Timestamp("2025-05-01 16:11Z"))
+    assert sorted(before['line_id']) == ['l1', 'l2', 'l3']
+    assert dict(zip(after['line_id'], after['k_line'])) == {'l1': 8.5, 'l2': 6.5}
+
+
+def test_conditional_requests_send_validators_and_handle_304(payload):
+    session = Session([
+        Response(200, payload, {'ETag': '"v1"', 'Last-Modified': 'Thu, 01 May 2025 16:00:00 GMT'}),
+        Response(304),
+    ])
+    body, validators = fetch_lines_json(session)
+    assert body == payload
+    assert validators == {'etag': '"v1"', 'last_modified': 'Thu, 01 May 2025 16:00:00 GMT'}
+
+    body, again = fetch_lines_json(session, validators=validators)
+    assert body is None and again == validators
+    assert session.sent == [{}, {'If-None-Match': '"v1"', 'If-Modified-Since': 'Thu, 01 May 2025 16:00:00 GMT'}]
+
+
+def test_poll_survives_bad_payloads(payload, tmp_path, monkeypatch):
+    monkeypatch.setattr(ud.time, "sleep", lambda seconds: None)
+    session = Session([
+        Response(200, payload, {'ETag': '"v1"'}),
+        Response(304),
+        Response(200, payload[:len(payload) // 2], {'ETag': '"v2"'}),
+        Response(502),
+        Response(200, payload.replace(b'"7.5"', b'"8.5"'), {'ETag': '"v3"'}),
+    ])
+    boards = []
+    poll_lines(interval=0, iterations=5, path=str(tmp_path), session=session, on_change=boards.append)
+
+    # The truncated body's ETag is never sent back, so the board is refetched in full
+    assert [h.get('If-None-Match') for h in session.sent] == [None, '"v1"', '"v1"', '"v1"', '"v1"']
+    assert len(boards) == 2
+    assert boards[-1].set_index('line_id').loc['l1', 'k_line'] == 8.5
+    assert len(load_line_history(str(tmp_path))) == 4